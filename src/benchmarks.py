@@ -0,0 +1,792 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+from camera import Camera
+from config import FONT_SPECS, HEIGHT, THREAT_TYPES, WIDTH
+from engine import (
+    INTERCEPTOR_SPEED,
+    KILL_RADIUS,
+    DefenseEngine,
+    spread_bases,
+    swept_box,
+)
+from events import (
+    ENGAGED,
+    FUEL_EXHAUSTED,
+    IMPACTED,
+    INTERCEPTED,
+    OUT_OF_BOUNDS,
+    SPAWNED,
+)
+from export import FrameExporter
+from fastforward import FastForward
+from fonts import FONTS
+from game_objects import DefenseBase, EnhancedMissile
+from physics import GRAVITY, INTERCEPTOR_CLIMB_SPEED, QUANTITIES, PhysicsEngine
+from raids import (
+    RaidScheduler,
+    RaidSpawn,
+    expand_salvos,
+    read_scenario,
+    write_scenario,
+)
+from sensors import SweepRadar
+from spatial import overlapping_pairs
+from simthread import STEP_MS, TRACK_DTYPE, WorldSnapshot
+from tracking import TrackFilter, measure
+from ui import (
+    Button,
+    MetricGauge,
+    Panel,
+    StatusLine,
+    draw_enhanced_button,
+    draw_enhanced_panel,
+    draw_metric_display,
+)
+from utils import (
+    classify_threat,
+    classify_threats,
+    intercept_times,
+    time_of_impact,
+)
+from wta import MAX_SALVO, allocate_interceptors, solve_assignment
+
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_base_assignment(bases=48, threats=400, theatre=20000, repeat=50):
+    """Per-step cost of picking a launch site for every threat in a theatre"""
+    rng = random.Random(1)
+    positions = [
+        (rng.uniform(0, theatre), rng.uniform(0, theatre)) for _ in range(bases)
+    ]
+    engine = DefenseEngine(events_enabled=False, base_positions=positions)
+    for base in engine.bases:
+        base.radar_range = theatre / 4
+        base.magazine = threats
+    engine.index_bases()
+
+    hostiles = []
+    for _ in range(threats):
+        missile = EnhancedMissile(
+            rng.uniform(0, theatre),
+            rng.uniform(0, theatre),
+            rng.uniform(0, theatre),
+            rng.uniform(0, theatre),
+        )
+        hostiles.append(missile)
+
+    def brute_force():
+        matrix = np.full((threats, bases), np.inf)
+        for row, missile in enumerate(hostiles):
+            dx = missile.x - engine.base_xs
+            dy = missile.y - engine.base_ys
+            times = intercept_times(dx, dy, missile.vx, missile.vy, INTERCEPTOR_SPEED)
+            reachable = np.hypot(dx, dy) <= engine.base_ranges
+            matrix[row, reachable] = times[reachable]
+        return matrix
+
+    assert np.array_equal(
+        engine.intercept_time_matrix(hostiles), brute_force()
+    ), "grid disagrees"
+    indexed_time = _timed(lambda: engine.intercept_time_matrix(hostiles), repeat)
+    brute_time = _timed(brute_force, repeat)
+    print(
+        f"intercept times ({bases} bases x {threats} threats): "
+        f"grid {indexed_time * 1000:.3f} ms/step "
+        f"({indexed_time / threats * 1e6:.2f} us/threat), "
+        f"per-threat scan {brute_time * 1000:.3f} ms/step"
+    )
+
+
+def _brute_force_assignment(cost):
+    best = None
+    for cols in itertools.permutations(range(cost.shape[1]), cost.shape[0]):
+        total = cost[np.arange(cost.shape[0]), cols].sum()
+        if best is None or total < best:
+            best = total
+    return best
+
+
+def bench_weapon_target_assignment(
+    bases=25, threats=200, theatre=6000, steps=30, arrivals=4, budget_ms=100.0
+):
+    """Interceptor allocation for a 200-round x 200-threat raid, then per step"""
+    rng = random.Random(1)
+
+    # Solver optimality against exhaustive search on small problems
+    for _ in range(200):
+        rows = rng.randint(1, 5)
+        cols = rng.randint(rows, 6)
+        cost = np.array(
+            [[rng.uniform(-10, 10) for _ in range(cols)] for _ in range(rows)]
+        )
+        col4row = solve_assignment(cost)
+        assert len(set(col4row.tolist())) == rows, "solver reused a column"
+        total = cost[np.arange(rows), col4row].sum()
+        assert np.isclose(total, _brute_force_assignment(cost)), "solver not optimal"
+
+    positions = [
+        (rng.uniform(0, theatre), rng.uniform(0, theatre)) for _ in range(bases)
+    ]
+    engine = DefenseEngine(events_enabled=False, base_positions=positions)
+    for base in engine.bases:
+        base.radar_range = theatre
+    engine.index_bases()
+
+    def spawn(count):
+        for _ in range(count):
+            missile = EnhancedMissile(
+                *(rng.uniform(0, theatre) for _ in range(4)),
+                threat_type=rng.choice(THREAT_TYPES),
+            )
+            engine.missiles.append(missile)
+
+    spawn(threats)
+    stock = [base.magazine for base in engine.bases]
+
+    def allocate():
+        return allocate_interceptors(
+            engine.intercept_time_matrix(engine.missiles),
+            [missile.threat_type for missile in engine.missiles],
+            stock,
+        )
+
+    def engage(assignment):
+        for base_index in assignment[assignment >= 0].tolist():
+            stock[base_index] -= 1
+        engine.missiles = [
+            missile
+            for missile, base_index in zip(engine.missiles, assignment.tolist())
+            if base_index < 0
+        ]
+
+    raid = [_timed(allocate, 1) for _ in range(5)]
+    engage(allocate())
+
+    # Steady state: engaged threats leave the problem, the held ones close
+    # in and a few new ones arrive every step
+    elapsed = []
+    for _ in range(steps):
+        for missile in engine.missiles:
+            missile.x += missile.vx
+            missile.y += missile.vy
+        spawn(arrivals)
+        start = time.perf_counter()
+        assignment = allocate()
+        elapsed.append(time.perf_counter() - start)
+        engage(assignment)
+
+    print(
+        f"interceptor allocation ({bases * MAX_SALVO} rounds x {threats} threats): "
+        f"raid {sum(raid) / len(raid) * 1000:.2f} ms "
+        f"(worst {max(raid) * 1000:.2f} ms, budget {budget_ms:.1f} ms "
+        f"{'OK' if max(raid) * 1000 <= budget_ms else 'OVER'}), "
+        f"then {sum(elapsed) / steps * 1000:.3f} ms/step"
+    )
+
+
+def bench_threat_classification(tracks=100000, repeat=5):
+    """Classifying a large ingest batch: per-track rules vs the batch classifier"""
+    rng = np.random.default_rng(1)
+    velocity = rng.uniform(50, 4000, tracks)
+    altitude = rng.uniform(50, 15000, tracks)
+    velocity_list = velocity.tolist()
+    altitude_list = altitude.tolist()
+
+    def scalar():
+        return [classify_threat(v, a) for v, a in zip(velocity_list, altitude_list)]
+
+    codes = classify_threats(velocity, altitude)
+    assert [THREAT_TYPES[code] for code in codes.tolist()] == scalar(), "mismatch"
+    scalar_time = _timed(scalar, repeat)
+    batch_time = _timed(lambda: classify_threats(velocity, altitude), repeat)
+    print(
+        f"threat classification ({tracks} tracks): "
+        f"batch {batch_time * 1000:.2f} ms, per-track {scalar_time * 1000:.2f} ms "
+        f"({scalar_time / batch_time:.0f}x)"
+    )
+
+
+def bench_kalman_tracker(tracks=1000, steps=200):
+    """Per-step cost and accuracy of filtering noisy tracks in one batch"""
+    rng = np.random.default_rng(1)
+    position = rng.uniform(0, 1400, (tracks, 2))
+    velocity = rng.uniform(-3, 3, (tracks, 2))
+    acceleration = rng.uniform(-0.02, 0.02, (tracks, 2))
+    track_ids = list(range(tracks))
+    tracker = TrackFilter()
+
+    elapsed = 0.0
+    for _ in range(steps):
+        velocity += acceleration
+        position += velocity
+        xs, ys = measure(position[:, 0], position[:, 1], tracker.noise, rng)
+        start = time.perf_counter()
+        tracker.update(track_ids, xs, ys)
+        filtered, speed, _ = tracker.estimates(track_ids)
+        elapsed += time.perf_counter() - start
+
+    raw_error = np.hypot(xs - position[:, 0], ys - position[:, 1])
+    position_error = np.hypot(*(filtered - position).T)
+    velocity_error = np.hypot(*(speed - velocity).T)
+    print(
+        f"kalman tracker ({tracks} tracks): {elapsed / steps * 1000:.3f} ms/step, "
+        f"position error {np.sqrt(np.mean(raw_error**2)):.2f} px raw, "
+        f"{np.sqrt(np.mean(position_error**2)):.2f} px filtered, "
+        f"velocity error {np.sqrt(np.mean(velocity_error**2)):.3f} px/frame"
+    )
+
+
+def bench_sweep_radar(tracks=20000, steps=90):
+    """One turn of the search beam: sector index vs checking every track"""
+    rng = random.Random(1)
+    base = DefenseBase(0, 0, radar_range=1000)
+    targets = [
+        SimpleNamespace(
+            track_id=i, active=True, x=rng.uniform(-900, 900), y=rng.uniform(-900, 900)
+        )
+        for i in range(tracks)
+    ]
+    radar = SweepRadar(base)
+    for target in targets:
+        radar.add(target)
+
+    def scan_all(start):
+        return [
+            target
+            for target in targets
+            if (radar.bearing(target.x, target.y) - start) % 360 < radar.rate
+            and math.hypot(target.x, target.y) <= base.radar_range
+        ]
+
+    indexed = scanned = 0.0
+    for _ in range(steps):
+        start_angle = radar.angle
+        start = time.perf_counter()
+        detected = radar.sweep()
+        indexed += time.perf_counter() - start
+        start = time.perf_counter()
+        expected = scan_all(start_angle)
+        scanned += time.perf_counter() - start
+        assert {t.track_id for t in detected} == {t.track_id for t in expected}
+    print(
+        f"sweep radar ({tracks} tracks): sector index {indexed / steps * 1000:.3f} "
+        f"ms/step, scanning all {scanned / steps * 1000:.3f} ms/step "
+        f"({scanned / indexed:.0f}x)"
+    )
+
+
+def bench_raid_scheduler(salvos=5000, duration=600000, frame=16):
+    """Launching a long raid plan: event heap vs polling every pending spawn"""
+    rng = random.Random(1)
+    plan = [
+        {
+            "time": rng.uniform(0, duration),
+            "origin": [rng.uniform(100, 1000), 100],
+            "count": 10,
+            "spacing": 50,
+        }
+        for _ in range(salvos)
+    ]
+    spawns = expand_salvos(plan, seed=1)
+
+    start = time.perf_counter()
+    scheduler = RaidScheduler()
+    scheduler.load(spawns)
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    popped = [scheduler.due(now) for now in range(0, duration + 1000, frame)]
+    heap_time = time.perf_counter() - start
+
+    def poll(now, pending):
+        # The alternative: check every outstanding spawn each step
+        due = [spawn for spawn in pending if spawn.time <= now]
+        return due, [spawn for spawn in pending if spawn.time > now]
+
+    # Polling is only timed over the first tenth of the plan; it is too slow
+    pending = spawns
+    poll_steps = range(0, duration // 10, frame)
+    start = time.perf_counter()
+    for now in poll_steps:
+        _, pending = poll(now, pending)
+    poll_time = time.perf_counter() - start
+
+    steps = len(popped)
+    assert sum(len(due) for due in popped) == len(spawns)
+    print(
+        f"raid scheduler ({len(spawns)} spawns, {steps} steps): load "
+        f"{load_time * 1000:.1f} ms, heap {heap_time / steps * 1000:.4f} ms/step, "
+        f"polling {poll_time / len(poll_steps) * 1000:.3f} ms/step"
+    )
+
+
+def bench_scenario_stream(spawns=200000, frame=16):
+    """Streaming a long scenario file through the raid schedule per format"""
+    rng = random.Random(1)
+    scenario = [
+        RaidSpawn(i * 2.5, rng.uniform(0, 1400), rng.uniform(0, 200), "missile")
+        for i in range(spawns)
+    ]
+    duration = int(scenario[-1].time) + frame
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt, name in [
+            ("binary", "raid.bin"),
+            ("csv", "raid.csv"),
+            ("jsonl", "raid.jsonl"),
+        ]:
+            path = os.path.join(directory, name)
+            write_scenario(path, scenario)
+            scheduler = RaidScheduler()
+            start = time.perf_counter()
+            scheduler.stream(read_scenario(path))
+            launched = peak = 0
+            for now in range(0, duration, frame):
+                launched += len(scheduler.due(now))
+                peak = max(peak, len(scheduler))
+            elapsed = time.perf_counter() - start
+            assert launched == spawns
+            print(
+                f"scenario stream ({spawns} spawns, {fmt}): "
+                f"{spawns / elapsed / 1000:.0f}k spawns/s, "
+                f"at most {peak} spawns held"
+            )
+
+
+def bench_viewport_culling(tracks=5000, world=20000, repeat=3):
+    """Drawing a theatre-scale frame: every track vs those the camera culls to"""
+    rng = random.Random(1)
+    missiles = [
+        EnhancedMissile(
+            rng.uniform(0, world),
+            rng.uniform(0, world),
+            rng.uniform(0, world),
+            rng.uniform(0, world),
+            True,
+            rng.choice(THREAT_TYPES),
+        )
+        for _ in range(tracks)
+    ]
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    camera = Camera(world, world)
+    camera.pan(world / 2, world / 2)
+
+    def draw_all():
+        for missile in missiles:
+            missile.draw(surface, camera)
+
+    def draw_culled():
+        for missile in camera.cull(missiles):
+            missile.draw(surface, camera)
+
+    visible = len(camera.cull(missiles))
+    all_time = _timed(draw_all, repeat)
+    culled_time = _timed(draw_culled, repeat)
+    print(
+        f"viewport culling ({tracks} tracks, {visible} in view): "
+        f"culled {culled_time * 1000:.2f} ms/frame, "
+        f"drawing all {all_time * 1000:.2f} ms/frame"
+    )
+
+
+def bench_snapshot_capture(tracks=1000, steps=100, world=20000):
+    """Copying a step's world state for the renderer: whole world vs one window"""
+    random.seed(1)
+    engine = DefenseEngine(world_size=(world, world))
+    engine.auto_mode = False
+    for _ in range(tracks):
+        engine.spawn_threat(
+            random.uniform(0, world), 0, None, None, random.choice(THREAT_TYPES)
+        )
+    snapshot = WorldSnapshot()
+    view = (world / 2, 0, world / 2 + WIDTH, HEIGHT)
+
+    step_time = full_time = view_time = 0.0
+    for step in range(steps):
+        start = time.perf_counter()
+        engine.step(step * 16)
+        stepped = time.perf_counter()
+        snapshot.capture(engine)
+        captured = time.perf_counter()
+        snapshot.capture(engine, view=view)
+        view_time += time.perf_counter() - captured
+        full_time += captured - stepped
+        step_time += stepped - start
+    print(
+        f"snapshot capture ({snapshot.track_count} tracks): "
+        f"window {view_time / steps * 1000:.2f} ms/step, "
+        f"whole world {full_time / steps * 1000:.2f} ms/step, "
+        f"engine step {step_time / steps * 1000:.2f} ms/step"
+    )
+
+
+def bench_frame_export(frames=120):
+    """PNG export throughput: one encoder thread vs the worker pool"""
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    rng = random.Random(1)
+    for _ in range(400):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        position = (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+        pygame.draw.circle(surface, color, position, rng.uniform(2, 40))
+
+    results = []
+    for workers in (1, None):
+        with tempfile.TemporaryDirectory() as path:
+            exporter = FrameExporter(path, (WIDTH, HEIGHT), workers=workers)
+            start = time.perf_counter()
+            for _ in range(frames):
+                exporter.submit(surface)
+            exporter.close()
+            results.append(frames / (time.perf_counter() - start))
+    print(
+        f"frame export ({frames} frames of {WIDTH}x{HEIGHT}): "
+        f"{results[1]:.1f} frames/s pooled ({len(exporter.threads)} threads), "
+        f"{results[0]:.1f} frames/s on one thread"
+    )
+
+
+def bench_hud_widgets(frames=300):
+    """Left panel per frame: immediate-mode drawing vs retained widgets
+
+    Values change every 30 frames, about as often as SystemMetrics updates.
+    """
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    panel = pygame.Rect(20, 20, 420, HEIGHT - 40)
+    gauges = [(380 + i * 55, f"Gauge {i}") for i in range(6)]
+    buttons = [(20 + i * 135, f"BUTTON {i}") for i in range(3)]
+    lines = [710 + i * 22 for i in range(6)]
+
+    def immediate(frame):
+        value = frame // 30
+        draw_enhanced_panel(surface, *panel, "PANEL", "Subtitle")
+        for y, title in gauges:
+            draw_metric_display(surface, 35, y, 390, 45, title, value, 100, "%")
+        for x, text in buttons:
+            draw_enhanced_button(surface, x, 710, 120, 35, text, value % 2 == 0)
+        for y in lines:
+            text = FONTS["small"].render(f"Status: {value}", True, (255, 255, 255))
+            surface.blit(text, (35, y))
+
+    panel_widget = Panel(panel, "PANEL", "Subtitle")
+    gauge_widgets = [MetricGauge((35, y, 390, 45), title, "%") for y, title in gauges]
+    button_widgets = [Button((x, 710, 120, 35), text) for x, text in buttons]
+    line_widgets = [StatusLine((35, y)) for y in lines]
+
+    def retained(frame):
+        value = frame // 30
+        panel_widget.draw(surface)
+        for gauge in gauge_widgets:
+            gauge.draw(surface, value, 100)
+        for button in button_widgets:
+            button.draw(surface, value % 2 == 0)
+        for line in line_widgets:
+            line.draw(surface, f"Status: {value}", (255, 255, 255))
+
+    results = []
+    for draw in (immediate, retained):
+        draw(0)  # Load fonts
+        start = time.perf_counter()
+        for frame in range(frames):
+            draw(frame)
+        results.append((time.perf_counter() - start) / frames * 1000)
+    renders = sum(widget.renders for widget in gauge_widgets + line_widgets)
+    print(
+        f"hud widgets: immediate {results[0]:.3f} ms/frame, retained "
+        f"{results[1]:.3f} ms/frame ({renders} re-renders in {frames} frames)"
+    )
+
+
+def bench_physics_batch(tracks=1000, repeat=50):
+    """Physics panel equations for every hostile: NumPy batch vs per-track math"""
+    rng = np.random.default_rng(1)
+    records = np.zeros(tracks, TRACK_DTYPE)
+    records["hostile"] = records["active"] = True
+    records["mass"] = rng.integers(50, 20000, tracks)
+    records["velocity"] = rng.integers(100, 3500, tracks)
+    records["altitude"] = rng.integers(100, 15000, tracks)
+    records["vx"] = rng.uniform(-5, 5, tracks)
+    records["vy"] = rng.uniform(0.5, 8, tracks)
+    physics = PhysicsEngine()
+
+    def per_track():
+        results = []
+        for track in records.tolist():
+            mass, velocity, altitude = track[9], track[10], track[11]
+            angle = math.atan2(abs(track[7]), abs(track[6]))
+            reach = INTERCEPTOR_CLIMB_SPEED**2 - 2 * GRAVITY * altitude
+            results.append(
+                (
+                    0.5 * mass * velocity * velocity,
+                    mass * velocity,
+                    (
+                        (INTERCEPTOR_CLIMB_SPEED - math.sqrt(reach)) / GRAVITY
+                        if reach >= 0
+                        else math.nan
+                    ),
+                    velocity * velocity * math.sin(2 * angle) / GRAVITY,
+                    (velocity * math.sin(angle)) ** 2 / (2 * GRAVITY),
+                )
+            )
+        return results
+
+    batch_time = _timed(lambda: physics.solve(records), repeat)
+    loop_time = _timed(per_track, repeat)
+    print(
+        f"physics batch ({tracks} tracks x {len(QUANTITIES)} equations): "
+        f"{batch_time * 1000:.3f} ms/step batched, {loop_time * 1000:.3f} ms/step "
+        f"per track, {physics.rate / 1e6:.1f} M solutions/s"
+    )
+
+
+def bench_swept_collisions(hostiles=500, interceptors=100, world=4000, repeat=20):
+    """Interceptor hits per step: end-position pair loop vs swept broad + narrow phase"""
+    rng = np.random.default_rng(1)
+
+    def tracks(count, speed):
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(*speed, count)
+        x = rng.uniform(0, world, count)
+        y = rng.uniform(0, world, count)
+        return x, y, np.cos(angle) * speed, np.sin(angle) * speed
+
+    hx, hy, hvx, hvy = tracks(hostiles, (2, 40))
+    ix, iy, ivx, ivy = tracks(interceptors, (4, 200))
+
+    def end_positions():
+        # The engine's former test: distance between positions after the step
+        hits = 0
+        for x, y, vx, vy in zip(*(v.tolist() for v in (ix, iy, ivx, ivy))):
+            for mx, my, mvx, mvy in zip(*(v.tolist() for v in (hx, hy, hvx, hvy))):
+                if math.hypot(mx + mvx - x - vx, my + mvy - y - vy) < KILL_RADIUS:
+                    hits += 1
+        return hits
+
+    def swept():
+        boxes = [swept_box(ix, iy, ivx, ivy), swept_box(hx, hy, hvx, hvy)]
+        a, b = overlapping_pairs(*boxes, 8 * KILL_RADIUS)
+        times = time_of_impact(
+            ix[a], iy[a], ivx[a], ivy[a], hx[b], hy[b], hvx[b], hvy[b], KILL_RADIUS
+        )
+        return len(a), int((~np.isnan(times)).sum())
+
+    loop_time = _timed(end_positions, max(1, repeat // 10))
+    swept_time = _timed(swept, repeat)
+    candidates, hits = swept()
+    print(
+        f"swept collisions ({interceptors} x {hostiles} tracks): "
+        f"{swept_time * 1000:.2f} ms swept ({candidates} candidate pairs, "
+        f"{hits} hits), {loop_time * 1000:.2f} ms end-position loop "
+        f"({end_positions()} hits)"
+    )
+
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import game_objects, physics, ui
+from fonts import FONTS
+imported = time.perf_counter()
+FONTS["small"]
+first = time.perf_counter()
+FONTS.warm(background=False)
+print(imported - start, first - imported, time.perf_counter() - first)
+"""
+
+
+def bench_font_startup(repeat=3):
+    """Fresh-interpreter startup: importing the drawing modules, then their fonts"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        timings.append([float(value) for value in output.split()[-3:]])
+    imported, first, rest = np.median(timings, axis=0) * 1000
+    print(
+        f"font startup: imports {imported:.1f} ms, first font {first:.1f} ms, "
+        f"remaining {len(FONT_SPECS) - 1} fonts {rest:.1f} ms"
+    )
+
+
+FIRST_FRAME_SCRIPT = """
+import sys, tempfile, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+with tempfile.TemporaryDirectory() as path:
+    try:
+        main.main(main.parse_args(["--export", path, "--duration", "0"]))
+    except SystemExit:
+        pass
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def import_times(module, top=10):
+    """Per-module import cost of a fresh `python -X importtime -c "import module"`
+
+    Returns the total in ms and the top modules as (cumulative ms, self ms,
+    name), heaviest first.
+    """
+    report = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stderr
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            rows.append((int(cumulative) / 1000, int(own) / 1000, name.strip()))
+    total = max(row[0] for row in rows)
+    return total, sorted(rows, reverse=True)[:top]
+
+
+def bench_startup(repeat=3, top=12):
+    """Import-time report for main, then time to the first headless frame"""
+    total, rows = import_times("main", top)
+    print(f"import main: {total:.1f} ms")
+    for cumulative, own, name in rows:
+        print(f"  {cumulative:8.1f} ms cumulative {own:7.1f} ms self  {name}")
+
+    env = dict(os.environ)
+    env.pop("SDL_VIDEODRIVER", None)  # Headless runs must not need one
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", FIRST_FRAME_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        timings.append([float(value) for value in output.split()[-2:]])
+    imported, first = np.median(timings, axis=0) * 1000
+    print(
+        f"startup: imports {imported:.1f} ms, first headless frame "
+        f"{first:.1f} ms later, {imported + first:.1f} ms total"
+    )
+
+
+def bench_fast_forward(salvos=40, bases=3, steps=5000, seeds=6):
+    """Outcome of a raid: stepping every frame vs jumping between events
+
+    Both run the same raid over fixed seeds. The kernel's random draws
+    differ from the engine's, so its totals of each outcome must agree with
+    the stepped ones to within three standard deviations of Poisson noise on
+    their difference, 3 sqrt(event-driven + stepped).
+    """
+    plan = [
+        {
+            "time": 500 + i * 1500,
+            "origin": [200 + i * 137 % 1000, 80],
+            "count": 6,
+            "spacing": 300,
+            "spread": 150,
+            "mix": {"missile": 2, "drone": 1, "aircraft": 1},
+        }
+        for i in range(salvos)
+    ]
+    spawns = expand_salvos(plan, seed=1)
+    kinds = [SPAWNED, ENGAGED, INTERCEPTED, IMPACTED, FUEL_EXHAUSTED, OUT_OF_BOUNDS]
+
+    stepped, kernel = Counter(), Counter()
+    stepped_time = kernel_time = 0.0
+    for seed in range(seeds):
+        random.seed(seed)
+        np.random.seed(seed)
+        engine = DefenseEngine(base_positions=spread_bases(bases))
+        engine.auto_mode = False
+        engine.raids.load(spawns)
+        for kind in kinds:
+            engine.events.subscribe(
+                kind, lambda events, kind=kind: stepped.update({kind: len(events)})
+            )
+        start = time.perf_counter()
+        for step in range(1, steps + 1):
+            engine.step(step * STEP_MS)
+        stepped_time += time.perf_counter() - start
+
+        random.seed(seed)
+        np.random.seed(seed)
+        raids = RaidScheduler()
+        raids.load(spawns)
+        start = time.perf_counter()
+        kernel.update(
+            FastForward(spread_bases(bases)).run(raids, until=steps * STEP_MS)
+        )
+        kernel_time += time.perf_counter() - start
+
+    print(
+        f"fast-forward ({len(spawns)} hostiles, {steps} steps, {seeds} seeds): "
+        f"{kernel_time * 1000 / seeds:.0f} ms event-driven, "
+        f"{stepped_time * 1000 / seeds:.0f} ms stepped per run "
+        f"({stepped_time / kernel_time:.0f}x)"
+    )
+    for kind in kinds:
+        tolerance = 3 * math.sqrt(kernel[kind] + stepped[kind])
+        print(
+            f"  {kind:>14}: {kernel[kind]:5d} event-driven, {stepped[kind]:5d} "
+            f"stepped (tolerance {tolerance:.0f})"
+        )
+        assert abs(kernel[kind] - stepped[kind]) <= tolerance, f"{kind} disagrees"
+
+
+BENCHMARKS = {
+    "bases": bench_base_assignment,
+    "wta": bench_weapon_target_assignment,
+    "classify": bench_threat_classification,
+    "tracker": bench_kalman_tracker,
+    "sweep": bench_sweep_radar,
+    "raids": bench_raid_scheduler,
+    "scenario": bench_scenario_stream,
+    "culling": bench_viewport_culling,
+    "snapshot": bench_snapshot_capture,
+    "export": bench_frame_export,
+    "fonts": bench_font_startup,
+    "startup": bench_startup,
+    "hud": bench_hud_widgets,
+    "physics": bench_physics_batch,
+    "collisions": bench_swept_collisions,
+    "fastforward": bench_fast_forward,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SUCCEDRA performance benchmarks")
+    parser.add_argument("names", nargs="*", help=f"any of {', '.join(BENCHMARKS)}")
+    args = parser.parse_args()
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import argparse
+import asyncio
+import struct
+import threading
+
+import numpy as np
+
+from config import THREAT_TYPES
+from serving import shutdown_loop
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7800
+
+KEYFRAME = 1
+DELTA = 2
+
+# Per-entity record of a keyframe (and of tracks added in a delta)
+ENTITY_DTYPE = np.dtype(
+    [
+        ("track_id", "<u4"),
+        ("threat", "u1"),
+        ("hostile", "u1"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("vx", "<f4"),
+        ("vy", "<f4"),
+        ("fuel", "<f4"),
+    ]
+)
+# Fields that deltas send only when changed, in bitmask order
+DELTA_FIELDS = ["x", "y", "vx", "vy", "fuel"]
+EXPLOSION_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("radius", "<f4")])
+
+# frame type, step, total threats, intercepted, evaded
+HEADER = struct.Struct("<BIIII")
+COUNT = struct.Struct("<I")
+
+
+def snapshot_entities(missiles):
+    """Copy the broadcast fields of missiles into an array sorted by track id"""
+    entities = np.empty(len(missiles), dtype=ENTITY_DTYPE)
+    entities["track_id"] = [m.track_id for m in missiles]
+    entities["threat"] = [THREAT_TYPES.index(m.threat_type) for m in missiles]
+    entities["hostile"] = [m.is_hostile for m in missiles]
+    entities["x"] = [m.x for m in missiles]
+    entities["y"] = [m.y for m in missiles]
+    entities["vx"] = [m.vx for m in missiles]
+    entities["vy"] = [m.vy for m in missiles]
+    entities["fuel"] = [m.fuel for m in missiles]
+    entities.sort(order="track_id")
+    return entities
+
+
+def snapshot_explosions(explosions):
+    records = np.empty(len(explosions), dtype=EXPLOSION_DTYPE)
+    records["x"] = [e.x for e in explosions]
+    records["y"] = [e.y for e in explosions]
+    records["radius"] = [e.radius for e in explosions]
+    return records
+
+
+def _pack_array(array):
+    return COUNT.pack(len(array)) + array.tobytes()
+
+
+def encode_keyframe(header, entities, explosions):
+    body = HEADER.pack(KEYFRAME, *header) + _pack_array(entities)
+    body += _pack_array(explosions)
+    return COUNT.pack(len(body)) + body
+
+
+def encode_delta(header, previous, entities, explosions):
+    """Encode the changes from previous to entities
+
+    Tracks present in both snapshots are sent as an id, a bitmask of the
+    DELTA_FIELDS that changed, and then one column of values per field
+    holding only the tracks whose bit is set.
+    """
+    common, prev_idx, cur_idx = np.intersect1d(
+        previous["track_id"], entities["track_id"], True, return_indices=True
+    )
+    removed = np.setdiff1d(previous["track_id"], common, True)
+    added = np.delete(entities, cur_idx)
+
+    old = previous[prev_idx]
+    new = entities[cur_idx]
+    masks = np.zeros(len(common), dtype=np.uint8)
+    changed = [old[field] != new[field] for field in DELTA_FIELDS]
+    for bit, field_changed in enumerate(changed):
+        masks |= field_changed.astype(np.uint8) << bit
+
+    rows = masks != 0
+    parts = [
+        HEADER.pack(DELTA, *header),
+        _pack_array(removed.astype("<u4")),
+        _pack_array(added),
+        _pack_array(common[rows].astype("<u4")),
+        masks[rows].tobytes(),
+    ]
+    for field, field_changed in zip(DELTA_FIELDS, changed):
+        parts.append(new[field][field_changed].tobytes())
+    parts.append(_pack_array(explosions))
+
+    body = b"".join(parts)
+    return COUNT.pack(len(body)) + body
+
+
+class WorldDecoder:
+    """Rebuild the world state on a console from keyframes and deltas"""
+
+    def __init__(self):
+        self.entities = None
+        self.explosions = np.empty(0, dtype=EXPLOSION_DTYPE)
+        self.step = 0
+        self.metrics = (0, 0, 0)
+
+    def apply(self, body):
+        frame_type, self.step, *metrics = HEADER.unpack_from(body)
+        self.metrics = tuple(metrics)
+        offset = HEADER.size
+
+        if frame_type == KEYFRAME:
+            self.entities, offset = _read_array(body, offset, ENTITY_DTYPE)
+        else:
+            if self.entities is None:
+                return False  # Wait for the first keyframe
+            removed, offset = _read_array(body, offset, np.dtype("<u4"))
+            added, offset = _read_array(body, offset, ENTITY_DTYPE)
+            ids, offset = _read_array(body, offset, np.dtype("<u4"))
+            masks = np.frombuffer(body, np.uint8, len(ids), offset)
+            offset += len(ids)
+
+            entities = self.entities[~np.isin(self.entities["track_id"], removed)]
+            rows = np.searchsorted(entities["track_id"], ids)
+            for bit, field in enumerate(DELTA_FIELDS):
+                field_rows = rows[(masks >> bit) & 1 == 1]
+                values = np.frombuffer(body, "<f4", len(field_rows), offset)
+                offset += values.nbytes
+                entities[field][field_rows] = values
+
+            entities = np.concatenate([entities, added])
+            entities.sort(order="track_id")
+            self.entities = entities
+
+        self.explosions, offset = _read_array(body, offset, EXPLOSION_DTYPE)
+        return True
+
+
+def _read_array(body, offset, dtype):
+    (count,) = COUNT.unpack_from(body, offset)
+    offset += COUNT.size
+    array = np.frombuffer(body, dtype, count, offset).copy()
+    return array, offset + array.nbytes
+
+
+class _Client:
+    def __init__(self, writer):
+        self.writer = writer
+        self.in_sync = False
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+
+class StateBroadcastServer:
+    """Publish the engine's world state to any number of TCP consoles
+
+    publish() is called from the simulation loop. It encodes each step once,
+    as a delta against the previous step plus a keyframe every
+    keyframe_interval steps, and hands the bytes to the asyncio thread. A
+    client whose socket buffer is above high_water is skipped instead of
+    awaited, and is resynchronised with the next keyframe once it drains, so
+    a slow console never stalls the simulation.
+    """
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        keyframe_interval=120,
+        high_water=256 * 1024,
+    ):
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+        self.high_water = high_water
+        self.clients = []
+        self.previous = None
+        self.keyframe_wanted = True
+        self.bytes_sent = 0
+        self.loop = None
+        self.thread = None
+        self.error = None
+
+    def start(self):
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run, args=(ready,), name="state-broadcast", daemon=True
+        )
+        self.thread.start()
+        ready.wait()
+        if self.error:
+            raise self.error
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    def publish(self, step, missiles, explosions, metrics):
+        """Encode this step's world state and queue it for every client"""
+        if not self.clients:
+            self.previous = None
+            return
+
+        entities = snapshot_entities(missiles)
+        explosion_records = snapshot_explosions(explosions)
+        header = (
+            step,
+            metrics.total_threats,
+            metrics.missiles_intercepted,
+            metrics.missiles_evaded,
+        )
+
+        keyframe = None
+        if (
+            self.previous is None
+            or self.keyframe_wanted
+            or step % self.keyframe_interval == 0
+        ):
+            self.keyframe_wanted = False
+            keyframe = encode_keyframe(header, entities, explosion_records)
+        delta = None
+        if self.previous is not None:
+            delta = encode_delta(header, self.previous, entities, explosion_records)
+        self.previous = entities
+
+        self.loop.call_soon_threadsafe(self._send, keyframe, delta)
+
+    def _send(self, keyframe, delta):
+        for client in self.clients:
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.high_water:
+                client.in_sync = False
+                client.frames_skipped += 1
+                continue
+
+            if keyframe is not None:
+                frame = keyframe
+            elif client.in_sync:
+                frame = delta
+            else:
+                # Behind or new: ask for a keyframe on the next publish
+                self.keyframe_wanted = True
+                client.frames_skipped += 1
+                continue
+
+            client.writer.write(frame)
+            client.in_sync = True
+            client.frames_sent += 1
+            self.bytes_sent += len(frame)
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+        except OSError as exc:
+            self.error = exc
+            ready.set()
+            return
+        ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            writers = [client.writer for client in self.clients]
+            shutdown_loop(self.loop, [self.server], writers)
+
+    async def _handle_client(self, reader, writer):
+        client = _Client(writer)
+        self.clients.append(client)
+        self.keyframe_wanted = True
+        try:
+            # Consoles only listen; wait until they disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.remove(client)
+            writer.close()
+
+
+async def monitor(host, port):
+    """Print a one-line summary of the broadcast world state per second"""
+    reader, _ = await asyncio.open_connection(host, port)
+    decoder = WorldDecoder()
+    received = 0
+    loop = asyncio.get_running_loop()
+    last_report = loop.time()
+    while True:
+        try:
+            (length,) = COUNT.unpack(await reader.readexactly(COUNT.size))
+            body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            break
+        received += COUNT.size + length
+        decoder.apply(body)
+
+        now = loop.time()
+        if now - last_report >= 1 and decoder.entities is not None:
+            hostile = int(decoder.entities["hostile"].sum())
+            total, intercepted, evaded = decoder.metrics
+            print(
+                f"step {decoder.step}: {hostile} hostile, "
+                f"{len(decoder.entities) - hostile} interceptors, "
+                f"{len(decoder.explosions)} explosions | threats {total} "
+                f"intercepted {intercepted} evaded {evaded} | "
+                f"{received / (now - last_report) / 1024:.1f} KiB/s"
+            )
+            received = 0
+            last_report = now
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a SUCCEDRA state broadcast")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    asyncio.run(monitor(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import numpy as np
+
+from config import HEIGHT, WIDTH, WORLD_HEIGHT, WORLD_WIDTH
+
+MAX_ZOOM = 8.0  # screen pixels per world unit when fully zoomed in
+CULL_MARGIN = 120  # px beyond the screen edge still drawn, for trails and labels
+
+
+class Camera:
+    """Viewport that pans and zooms world coordinates onto the screen
+
+    The view fills the part of the screen at (view_x, view_y) of size
+    view_width x view_height. (x, y) is the world point shown at its
+    top-left and zoom is screen pixels per world unit, so a new camera draws
+    the world 1:1. The view is kept inside the world and can zoom out until
+    the whole world fits in it.
+    """
+
+    def __init__(
+        self,
+        world_width=WORLD_WIDTH,
+        world_height=WORLD_HEIGHT,
+        view_width=WIDTH,
+        view_height=HEIGHT,
+        view_x=0,
+        view_y=0,
+    ):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.view_x = view_x
+        self.view_y = view_y
+        self.min_zoom = min(1.0, view_width / world_width, view_height / world_height)
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = 1.0
+
+    def to_screen(self, x, y):
+        return (
+            (x - self.x) * self.zoom + self.view_x,
+            (y - self.y) * self.zoom + self.view_y,
+        )
+
+    def to_world(self, screen_x, screen_y):
+        return (
+            (screen_x - self.view_x) / self.zoom + self.x,
+            (screen_y - self.view_y) / self.zoom + self.y,
+        )
+
+    def view_rect(self, margin=0, screen_rect=None):
+        """World (left, top, right, bottom) on screen, grown by margin px
+
+        screen_rect narrows the view to part of the screen, such as the
+        playfield left uncovered by the HUD panels.
+        """
+        if screen_rect is None:
+            screen_rect = (self.view_x, self.view_y, self.view_width, self.view_height)
+        x, y, width, height = screen_rect
+        left, top = self.to_world(x - margin, y - margin)
+        right, bottom = self.to_world(x + width + margin, y + height + margin)
+        return left, top, right, bottom
+
+    def visible(self, x, y, margin=0, screen_rect=None):
+        left, top, right, bottom = self.view_rect(margin, screen_rect)
+        return left <= x <= right and top <= y <= bottom
+
+    def cull(self, items, margin=CULL_MARGIN, screen_rect=None):
+        """Items with x/y attributes inside the view
+
+        Every track moves every frame, so rather than rebuilding a spatial
+        index per frame the positions are gathered once and tested against
+        the view rectangle in one vectorized pass.
+        """
+        if not items:
+            return []
+        xs = np.fromiter((item.x for item in items), float, len(items))
+        ys = np.fromiter((item.y for item in items), float, len(items))
+        inside = self.inside(xs, ys, margin, screen_rect)
+        return [items[i] for i in np.flatnonzero(inside).tolist()]
+
+    def inside(self, xs, ys, margin=CULL_MARGIN, screen_rect=None):
+        """Mask of the world positions in xs, ys that are in view"""
+        left, top, right, bottom = self.view_rect(margin, screen_rect)
+        return (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+
+    def pan(self, dx, dy):
+        """Move the view by a screen-pixel offset"""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, screen_x, screen_y):
+        """Zoom by factor, keeping the world point under (screen_x, screen_y)"""
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        self.zoom = min(MAX_ZOOM, max(self.min_zoom, self.zoom * factor))
+        self.x = world_x - (screen_x - self.view_x) / self.zoom
+        self.y = world_y - (screen_y - self.view_y) / self.zoom
+        self.clamp()
+
+    def fit(self):
+        """Zoom out to show the whole world"""
+        self.zoom = self.min_zoom
+        self.clamp()
+
+    def clamp(self):
+        # Centre the world along any axis it no longer fills
+        span_x = self.view_width / self.zoom
+        span_y = self.view_height / self.zoom
+        if span_x >= self.world_width:
+            self.x = (self.world_width - span_x) / 2
+        else:
+            self.x = min(max(self.x, 0.0), self.world_width - span_x)
+        if span_y >= self.world_height:
+            self.y = (self.world_height - span_y) / 2
+        else:
+            self.y = min(max(self.y, 0.0), self.world_height - span_y)
+
+
+# Draws world coordinates 1:1 on screen; entities use it when given no camera
+DEFAULT_CAMERA = Camera()
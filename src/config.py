@@ -1,5 +1,8 @@
 WIDTH, HEIGHT = 1400, 900
 
+# Default battlespace in world units; the camera maps it onto the window
+WORLD_WIDTH, WORLD_HEIGHT = WIDTH, HEIGHT
+
 
 # Enhanced Color Palette
 COLORS = {
@@ -24,82 +27,77 @@ COLORS = {
     "terrain": (30, 120, 60),
 }
 
+# Font roles: (family, size, bold)
+FONT_SPECS = {
+    "title": ("Arial", 32, True),
+    "header": ("Arial", 22, True),
+    "main": ("Arial", 18, False),
+    "equation": ("Consolas", 16, False),
+    "small": ("Arial", 14, False),
+    "tiny": ("Arial", 12, False),
+}
+
+
+# Threat classes in type-code order (radar, counters and telemetry use the index)
+THREAT_TYPES = ["missile", "drone", "aircraft"]
+
+# Classification rules checked in order, first match wins. Each rule bounds
+# track fields (velocity in m/s, altitude in m) strictly between (above, below),
+# None leaving a side open; rules may name any field the caller provides.
+THREAT_RULES = [
+    ("missile", {"velocity": (2500, None)}),  # Hypersonic
+    ("drone", {"altitude": (None, 1000), "velocity": (None, 300)}),
+]
+THREAT_FALLBACK = "aircraft"
 
-# Enhanced Equation Templates with Real Physics
+# Relative value of defeating each threat class, used to allocate interceptors
+THREAT_VALUES = {"missile": 10.0, "drone": 1.0, "aircraft": 4.0}
+
+# Radar display
+RADAR_BLIP_CAPACITY = 64
+RADAR_BLIP_LIFE = 200  # Frames a blip stays on screen after its last update
+
+
+# Equations the physics engine solves for every live hostile each step; a
+# panel's bar shows the largest result against scale
 PHYSICS_EQUATIONS = [
-    {
-        "eq": "F = ma",
-        "context": "Force calculation",
-        "vars": {"m": "2500kg", "a": "45m/s²"},
-        "solution": "F = 112,500 N",
-    },
-    {
-        "eq": "v² = u² + 2as",
-        "context": "Kinematic motion",
-        "vars": {"u": "0m/s", "a": "9.8m/s²", "s": "1200m"},
-        "solution": "v = 153.3 m/s",
-    },
-    {
-        "eq": "x = x₀ + v₀t + ½at²",
-        "context": "Position tracking",
-        "vars": {"x₀": "0m", "v₀": "850m/s", "a": "-9.8m/s²"},
-        "solution": "x = 850t - 4.9t²",
-    },
     {
         "eq": "E = ½mv²",
         "context": "Kinetic energy",
-        "vars": {"m": "1800kg", "v": "3400m/s"},
-        "solution": "E = 10.404 GJ",
+        "quantity": "energy",
+        "unit": "J",
+        "scale": 2e10,
     },
     {
         "eq": "p = mv",
-        "context": "Momentum calculation",
-        "vars": {"m": "2200kg", "v": "2800m/s"},
-        "solution": "p = 6.16e6 kg·m/s",
-    },
-    {
-        "eq": "Δx = v₀t + ½at²",
-        "context": "Trajectory computation",
-        "vars": {"v₀": "450m/s", "a": "32m/s²"},
-        "solution": "Δx = 450t + 16t²",
-    },
-    {
-        "eq": "θ = arctan(y/x)",
-        "context": "Angle determination",
-        "vars": {"y": "1250m", "x": "2100m"},
-        "solution": "θ = 30.76°",
+        "context": "Momentum",
+        "quantity": "momentum",
+        "unit": "kg·m/s",
+        "scale": 1e7,
     },
     {
-        "eq": "t = (v - u)/a",
+        "eq": "t = (u - √(u² - 2gh))/g",
         "context": "Time to intercept",
-        "vars": {"v": "3200m/s", "u": "0m/s", "a": "85m/s²"},
-        "solution": "t = 37.65 s",
+        "quantity": "intercept_time",
+        "unit": "s",
+        "scale": 30,
     },
     {
         "eq": "R = v²sin(2θ)/g",
         "context": "Range calculation",
-        "vars": {"v": "2800m/s", "θ": "45°", "g": "9.8m/s²"},
-        "solution": "R = 800 km",
+        "quantity": "range",
+        "unit": "m",
+        "scale": 1.5e6,
     },
     {
         "eq": "h = v²sin²(θ)/2g",
         "context": "Max height",
-        "vars": {"v": "1900m/s", "θ": "60°", "g": "9.8m/s²"},
-        "solution": "h = 147.2 km",
+        "quantity": "max_height",
+        "unit": "m",
+        "scale": 6e5,
     },
 ]
 
-COMPUTATION_STAGES = [
-    "Initializing parameters",
-    "Parsing equation structure",
-    "Variable substitution",
-    "Mathematical transformation",
-    "Numerical computation",
-    "Solution verification",
-    "Result validation",
-    "Output generation",
-]
-
 # Object pools for performance
 PARTICLE_POOL = []
 MISSILE_POOL = []
@@ -0,0 +1,511 @@
+import itertools
+import math
+import random
+
+import numpy as np
+
+from config import THREAT_TYPES, THREAT_VALUES, WORLD_HEIGHT, WORLD_WIDTH
+from events import DETECTED, ENGAGED, INTERCEPTED, SPAWNED, EventBus
+from game_objects import FUEL_BURN, DefenseBase, get_missile, recycle_missile
+from priority import ThreatQueue
+from raids import RaidScheduler
+from sensors import SweepRadar
+from spatial import GridIndex, overlapping_pairs
+from tracking import TrackEstimate, TrackFilter, measure
+from utils import (
+    calculate_intercept_point,
+    classify_threat,
+    classify_threats,
+    impact_frames,
+    intercept_times,
+    time_of_impact,
+)
+from wta import MAX_SALVO, allocate_interceptors, engageable
+
+MISSILE_INTERVALS = [4000, 2000, 1000]  # ms for Low, Medium, High
+INTERCEPTOR_SPEED = 4.0  # Launch speed used to predict intercepts
+BASE_CELL_SIZE = 400  # Minimum; larger theatres size cells to the base spread
+IMPACT_TOLERANCE = 1.0  # frames a prediction may drift before it is requeued
+KILL_RADIUS = 30  # an interceptor passing closer than this destroys a hostile
+
+
+def spread_bases(count, world_size=(WORLD_WIDTH, WORLD_HEIGHT), margin=220):
+    """Base positions evenly spaced along the bottom of the battlespace"""
+    width, height = world_size
+    y = height - 150
+    if count == 1:
+        return [(margin, y)]
+    spacing = (width - 2 * margin) / (count - 1)
+    return [(int(margin + i * spacing), y) for i in range(count)]
+
+
+def base_cell_size(bases):
+    """Grid cell size giving roughly one base per cell"""
+    xs = [base.x for base in bases]
+    ys = [base.y for base in bases]
+    span = max(max(xs) - min(xs), max(ys) - min(ys))
+    return max(BASE_CELL_SIZE, span / math.ceil(math.sqrt(len(bases))))
+
+
+class DefenseEngine:
+    """Simulation state and the per-step update of the defense scenario
+
+    Outcomes are reported through self.events rather than handled inline, so
+    metrics, effects and logging hook in as subscribers. Pass
+    events_enabled=False for headless runs that only need the final state.
+    """
+
+    def __init__(
+        self,
+        events_enabled=True,
+        base_positions=None,
+        world_size=(WORLD_WIDTH, WORLD_HEIGHT),
+    ):
+        # Tracks leaving the world are lost; the screen is only a view onto it
+        self.world_width, self.world_height = world_size
+
+        # Defense sites; the first one anchors the HUD radar and tracking lines
+        self.bases = [
+            DefenseBase(x, y) for x, y in base_positions or spread_bases(1, world_size)
+        ]
+        self.base = self.bases[0]
+        self.missiles = []
+        self.index_bases()
+        self.interceptors = []
+        self.explosions = []
+        self.events = EventBus(events_enabled)
+
+        # Hostiles keyed by the step they are predicted to reach their target
+        self.threat_queue = ThreatQueue()
+
+        # Interceptors aim at filtered estimates built from noisy measurements
+        self.tracker = TrackFilter()
+
+        # Track ids a search radar has seen; only these can be engaged
+        self.detected = set()
+
+        # Game state
+        self.auto_mode = True
+        self.threat_level = 1
+        self.last_missile_time = 0
+        self.step_count = 0
+
+        # Scripted raid spawns, popped as they fall due
+        self.raids = RaidScheduler()
+
+        # External feed id -> (missile, track id it was launched with)
+        self.external_tracks = {}
+
+    def index_bases(self):
+        """Rebuild the base lookup after sites are added, moved or re-ranged"""
+        self.base_index = GridIndex(base_cell_size(self.bases), self.bases)
+        self.max_radar_range = max(base.radar_range for base in self.bases)
+        self.base_xs = np.array([base.x for base in self.bases], dtype=float)
+        self.base_ys = np.array([base.y for base in self.bases], dtype=float)
+        self.base_ranges = np.array([base.radar_range for base in self.bases])
+        self._cell_candidates = {}
+
+        # Each site runs a search radar; refile the hostiles already airborne
+        self.radars = [SweepRadar(base) for base in self.bases]
+        for missile in self.missiles:
+            if missile.active and missile.is_hostile:
+                for radar in self.radars:
+                    radar.add(missile)
+
+    def spawn_threat(self, start_x, start_y, velocity, altitude, threat_type=None):
+        """Launch a hostile at a base, classified from its characteristics"""
+        if threat_type is None:
+            threat_type = classify_threat(velocity, altitude)
+        target = self.base if len(self.bases) == 1 else random.choice(self.bases)
+        missile = get_missile(start_x, start_y, target.x, target.y, True, threat_type)
+        self.missiles.append(missile)
+        for radar in self.radars:
+            radar.add(missile)
+        self.events.emit(SPAWNED, missile)
+        return missile
+
+    def spawn_random_threat(self, max_start_y=250):
+        start_x = random.randint(100, self.world_width - 400)
+        start_y = random.randint(50, max_start_y)
+        velocity = random.randint(500, 3500)
+        altitude = random.randint(500, 15000)
+        return self.spawn_threat(start_x, start_y, velocity, altitude)
+
+    def ingest(self, messages):
+        """Create or update hostile tracks from a batch of external track messages"""
+        external_tracks = self.external_tracks
+
+        def tracking(feed_id):
+            # Pooled missiles get a new track id on relaunch, so a changed id
+            # means the feed track ended and a message for it starts a new one
+            entry = external_tracks.get(feed_id)
+            return entry and entry[0].active and entry[0].track_id == entry[1]
+
+        # Classify every track this batch starts in one pass
+        starts = {}
+        for message in messages:
+            if message.id not in starts and not tracking(message.id):
+                starts[message.id] = message
+        codes = classify_threats(
+            [message.velocity for message in starts.values()],
+            [message.altitude for message in starts.values()],
+        )
+        start_types = dict(zip(starts, (THREAT_TYPES[code] for code in codes.tolist())))
+
+        for message in messages:
+            if tracking(message.id):
+                missile = external_tracks[message.id][0]
+                missile.x = message.x
+                missile.y = message.y
+            else:
+                missile = self.spawn_threat(
+                    message.x,
+                    message.y,
+                    message.velocity,
+                    message.altitude,
+                    start_types[message.id],
+                )
+                external_tracks[message.id] = (missile, missile.track_id)
+            if message.vx is not None and message.vy is not None:
+                missile.vx = message.vx
+                missile.vy = message.vy
+
+        # Forget feed ids whose tracks have ended
+        if len(external_tracks) > 2 * len(self.missiles) + 1024:
+            self.external_tracks = {
+                feed_id: entry
+                for feed_id, entry in external_tracks.items()
+                if entry[0].active and entry[0].track_id == entry[1]
+            }
+
+    def step(self, current_time):
+        self.step_count += 1
+        self.events.time = current_time
+
+        # Auto missile launch
+        if (
+            self.auto_mode
+            and current_time - self.last_missile_time
+            > MISSILE_INTERVALS[self.threat_level]
+        ):
+            self.last_missile_time = current_time
+
+            # Launch primary missile, then additional ones based on threat level
+            self.spawn_random_threat()
+            for _ in range(self.threat_level):
+                if random.random() < 0.4:
+                    self.spawn_random_threat()
+
+        # Scripted raids fire on their scheduled times, however many are due
+        for spawn in self.raids.due(current_time):
+            self.spawn_threat(spawn.x, spawn.y, None, None, spawn.threat_type)
+
+        self.sweep_radars()
+        self.track_threats()
+        self.prioritize_threats()
+        self.launch_interceptors()
+        for base in self.bases:
+            base.update(current_time)
+        self.update_missiles()
+        self.update_interceptors()
+
+        # Update explosions
+        for explosion in self.explosions[:]:
+            if explosion.update():
+                self.explosions.remove(explosion)
+
+        self.events.flush()
+
+    def sweep_radars(self):
+        """Turn every search beam one step and report the hostiles it passed"""
+        for radar in self.radars:
+            for missile in radar.sweep():
+                self.detected.add(missile.track_id)
+                self.events.emit(DETECTED, missile)
+
+    def detected_hostiles(self):
+        return [
+            missile
+            for missile in self.missiles
+            if missile.active
+            and missile.is_hostile
+            and missile.track_id in self.detected
+        ]
+
+    def track_threats(self):
+        """Feed this step's measurements of detected hostiles to the tracker
+
+        Once a search radar has seen a hostile it is measured every step, as
+        a fire-control radar would; undetected hostiles are unknown.
+        """
+        hostiles = self.detected_hostiles()
+        xs, ys = measure(
+            [missile.x for missile in hostiles],
+            [missile.y for missile in hostiles],
+            self.tracker.noise,
+        )
+        self.tracker.update([missile.track_id for missile in hostiles], xs, ys)
+
+    def prioritize_threats(self):
+        """Requeue detected hostiles whose predicted impact step has moved"""
+        hostiles = self.detected_hostiles()
+        if not hostiles:
+            return
+
+        frames = impact_frames(
+            np.array([missile.target_x - missile.x for missile in hostiles]),
+            np.array([missile.target_y - missile.y for missile in hostiles]),
+            np.array([missile.vx for missile in hostiles]),
+            np.array([missile.vy for missile in hostiles]),
+            np.array([missile.gravity for missile in hostiles]),
+            np.array([missile.acceleration for missile in hostiles]),
+            np.array([missile.fuel / FUEL_BURN for missile in hostiles]),
+        )
+        queue = self.threat_queue
+        for missile, frames_left in zip(hostiles, frames.tolist()):
+            key = self.step_count + frames_left
+            old_key = queue.key(missile.track_id)
+            if old_key is None:
+                queue.push(missile.track_id, missile, key)
+            elif abs(key - old_key) > IMPACT_TOLERANCE:
+                queue.update(missile.track_id, key)
+
+    def intercept_time_matrix(self, missiles):
+        """Predicted intercept time of each missile from each base
+
+        Threats are bucketed by base-grid cell and only paired with the bases
+        whose radar can reach that cell, then all pairs are timed in one
+        vectorized pass. Returns a (missiles, bases) array with inf wherever
+        a base cannot engage.
+        """
+        count = len(missiles)
+        matrix = np.full((count, len(self.bases)), np.inf)
+        if count == 0:
+            return matrix
+
+        xs = np.array([missile.x for missile in missiles])
+        ys = np.array([missile.y for missile in missiles])
+        vxs = np.array([missile.vx for missile in missiles])
+        vys = np.array([missile.vy for missile in missiles])
+
+        # Candidate bases per occupied cell, padded into one table
+        size = self.base_index.cell_size
+        cell_xs = (xs // size).astype(np.int64)
+        cell_ys = (ys // size).astype(np.int64)
+        cell_keys = cell_xs << 32 | (cell_ys & 0xFFFFFFFF)
+        _, first, inverse = np.unique(cell_keys, return_index=True, return_inverse=True)
+        candidate_lists = [
+            self.cell_candidates(cell)
+            for cell in zip(cell_xs[first].tolist(), cell_ys[first].tolist())
+        ]
+        width = max(len(candidates) for candidates in candidate_lists)
+        if width == 0:
+            return matrix
+        table = np.full((len(first), width), -1, dtype=np.intp)
+        for i, candidates in enumerate(candidate_lists):
+            table[i, : len(candidates)] = candidates
+
+        # Time every threat against its candidate bases
+        cols = table[inverse.ravel()]
+        valid = cols >= 0
+        cols = np.where(valid, cols, 0)
+        dx = xs[:, None] - self.base_xs[cols]
+        dy = ys[:, None] - self.base_ys[cols]
+        times = intercept_times(dx, dy, vxs[:, None], vys[:, None], INTERCEPTOR_SPEED)
+        valid &= np.hypot(dx, dy) <= self.base_ranges[cols]
+        rows = np.broadcast_to(np.arange(count)[:, None], cols.shape)
+        matrix[rows[valid], cols[valid]] = times[valid]
+        return matrix
+
+    def cell_candidates(self, cell):
+        """Indices of bases whose radar reaches some point of a grid cell"""
+        candidates = self._cell_candidates.get(cell)
+        if candidates is None:
+            size = self.base_index.cell_size
+            left = cell[0] * size
+            top = cell[1] * size
+            reach = self.max_radar_range
+            candidates = []
+            for base in self.base_index.query_rect(
+                left - reach, top - reach, left + size + reach, top + size + reach
+            ):
+                # Distance from the base to the nearest point of the cell
+                dx = max(left - base.x, 0, base.x - left - size)
+                dy = max(top - base.y, 0, base.y - top - size)
+                if math.hypot(dx, dy) <= base.radar_range:
+                    candidates.append(self.bases.index(base))
+            candidates = np.array(sorted(candidates), dtype=np.intp)
+            self._cell_candidates[cell] = candidates
+        return candidates
+
+    def launch_interceptors(self):
+        # Engagements are committed once launched, so each step only
+        # allocates against hostiles no interceptor is already chasing, once
+        # the tracker has a firm velocity. Each base fires at most a salvo
+        # this step, so the queue is walked in impact order only until every
+        # base has found that many hostiles it would spend a round on
+        engaged = {interceptor.target_track_id for interceptor in self.interceptors}
+        stock = [base.magazine for base in self.bases]
+        salvo = np.minimum(stock, MAX_SALVO)
+        found = np.zeros(len(self.bases), dtype=int)
+        candidates = (
+            missile
+            for _, missile in self.threat_queue.ordered()
+            if missile.track_id not in engaged
+            and THREAT_VALUES[missile.threat_type] > 0
+            and missile.track_id in self.tracker
+        )
+        targets = []
+        estimates = []
+        times = [np.empty((0, len(self.bases)))]
+        while (found < salvo).any():
+            wanted = int(np.maximum(salvo - found, 0).sum())
+            batch = list(itertools.islice(candidates, wanted))
+            if not batch:
+                break
+            positions, velocities, settled = self.tracker.estimates(
+                [missile.track_id for missile in batch]
+            )
+            batch_estimates = [
+                TrackEstimate(*position, *velocity)
+                for position, velocity in zip(positions.tolist(), velocities.tolist())
+            ]
+            batch_times = self.intercept_time_matrix(batch_estimates)
+            batch_types = [missile.threat_type for missile in batch]
+            pairs = engageable(batch_times, batch_types, stock) & settled[:, None]
+            found += pairs.sum(axis=0)
+            keep = pairs.any(axis=1)
+            for i in np.flatnonzero(keep).tolist():
+                targets.append(batch[i])
+                estimates.append(batch_estimates[i])
+            times.append(batch_times[keep])
+
+        assignment = allocate_interceptors(
+            np.concatenate(times),
+            [missile.threat_type for missile in targets],
+            stock,
+        )
+
+        for missile, estimate, base_index in zip(
+            targets, estimates, assignment.tolist()
+        ):
+            if base_index < 0:
+                continue
+            base = self.bases[base_index]
+            base.magazine -= 1
+
+            # Calculate intercept point from the filtered track
+            intercept_x, intercept_y = calculate_intercept_point(
+                base.x, base.y, estimate, INTERCEPTOR_SPEED
+            )
+            interceptor = get_missile(base.x, base.y, intercept_x, intercept_y, False)
+            interceptor.target_track_id = missile.track_id
+            self.interceptors.append(interceptor)
+            self.events.emit(SPAWNED, interceptor)
+            self.events.emit(ENGAGED, missile)
+
+    def forget(self, missile):
+        """Drop a finished track from detection, tracking and the threat queue"""
+        self.detected.discard(missile.track_id)
+        self.tracker.drop(missile.track_id)
+        self.threat_queue.remove(missile.track_id)
+
+    def update_missiles(self):
+        for missile in self.missiles[:]:
+            outcome = missile.update(
+                self.world_width, self.world_height, self.events.time
+            )
+            if outcome:
+                self.missiles.remove(missile)
+                self.forget(missile)
+                self.events.emit(outcome, missile)
+                recycle_missile(missile)
+
+    def update_interceptors(self):
+        """Advance interceptors, then resolve their hits on hostile tracks"""
+        for interceptor in self.interceptors[:]:
+            outcome = interceptor.update(
+                self.world_width, self.world_height, self.events.time
+            )
+            if outcome:
+                self.events.emit(outcome, interceptor)
+                self.interceptors.remove(interceptor)
+                recycle_missile(interceptor)
+        self.resolve_intercepts()
+
+    def resolve_intercepts(self):
+        """Destroy hostiles that an interceptor passed within KILL_RADIUS of
+
+        Tracks move in straight lines within a step, so each was at
+        (x - vx, y - vy) as it began. Fast movers can cross the kill radius
+        between two frames, so rather than comparing end positions every
+        candidate pair from a grid over the swept boxes is tested at its
+        closest approach during the step. Hits are resolved earliest first,
+        each track taking part in at most one.
+        """
+        hostiles = [m for m in self.missiles if m.active and m.is_hostile]
+        interceptors = list(self.interceptors)
+        if not hostiles or not interceptors:
+            return
+
+        # (x, y, vx, vy) rows at the start of the step
+        hostile_motion = np.array(
+            [(m.x - m.vx, m.y - m.vy, m.vx, m.vy) for m in hostiles]
+        ).T
+        interceptor_motion = np.array(
+            [(i.x - i.vx, i.y - i.vy, i.vx, i.vy) for i in interceptors]
+        ).T
+        boxes = [
+            swept_box(*motion[:2], *motion[2:])
+            for motion in (interceptor_motion, hostile_motion)
+        ]
+        extent = np.concatenate(
+            [box[2] - box[0] for box in boxes] + [box[3] - box[1] for box in boxes]
+        )
+        cell_size = max(4 * KILL_RADIUS, float(np.percentile(extent, 90)))
+        a, b = overlapping_pairs(*boxes, cell_size)
+        if not len(a):
+            return
+        times = time_of_impact(
+            *interceptor_motion[:, a], *hostile_motion[:, b], KILL_RADIUS
+        )
+        hits = np.flatnonzero(~np.isnan(times))
+
+        spent = set()
+        for pair in hits[np.argsort(times[hits], kind="stable")].tolist():
+            interceptor = interceptors[a[pair]]
+            missile = hostiles[b[pair]]
+            if interceptor in spent or missile in spent:
+                continue
+            spent.update((interceptor, missile))
+
+            # Blast where the two met during the step
+            t = times[pair] - 1
+            explosion_x = (
+                missile.x + interceptor.x + t * (missile.vx + interceptor.vx)
+            ) / 2
+            explosion_y = (
+                missile.y + interceptor.y + t * (missile.vy + interceptor.vy)
+            ) / 2
+            self.events.emit(INTERCEPTED, missile, explosion_x, explosion_y)
+
+            missile.active = False
+            interceptor.active = False
+            self.missiles.remove(missile)
+            self.forget(missile)
+            self.interceptors.remove(interceptor)
+            recycle_missile(missile)
+            recycle_missile(interceptor)
+
+
+def swept_box(x, y, vx, vy, margin=KILL_RADIUS / 2):
+    """(left, top, right, bottom) around each track's path through a step
+
+    Grown by margin, so paths passing within 2 * margin have overlapping boxes
+    """
+    return (
+        np.minimum(x, x + vx) - margin,
+        np.minimum(y, y + vy) - margin,
+        np.maximum(x, x + vx) + margin,
+        np.maximum(y, y + vy) + margin,
+    )
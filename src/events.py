@@ -0,0 +1,83 @@
+from collections import namedtuple
+
+# Entity lifecycle event types
+SPAWNED = "spawned"
+DETECTED = "detected"
+ENGAGED = "engaged"
+INTERCEPTED = "intercepted"
+IMPACTED = "impacted"
+FUEL_EXHAUSTED = "fuel_exhausted"
+OUT_OF_BOUNDS = "out_of_bounds"
+
+EVENT_TYPES = [
+    SPAWNED,
+    DETECTED,
+    ENGAGED,
+    INTERCEPTED,
+    IMPACTED,
+    FUEL_EXHAUSTED,
+    OUT_OF_BOUNDS,
+]
+
+# Events copy what subscribers need from the entity, because pooled missiles
+# are recycled (and may be relaunched) before the batch is delivered
+Event = namedtuple(
+    "Event", ["type", "time", "track_id", "threat_type", "is_hostile", "x", "y"]
+)
+
+
+class EventBus:
+    """Publish/subscribe bus that delivers events in one batch per step
+
+    Subscribers receive a list of all events of their type emitted during the
+    step. When the bus is disabled, emit() is swapped for a no-op so the
+    engine's call sites cost a single function call and nothing is recorded.
+    """
+
+    def __init__(self, enabled=True):
+        self.handlers = {event_type: [] for event_type in EVENT_TYPES}
+        self.pending = []
+        self.time = 0
+        self.set_enabled(enabled)
+
+    def subscribe(self, event_type, handler):
+        self.handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type, handler):
+        self.handlers[event_type].remove(handler)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.emit = self._record if enabled else self._discard
+        if not enabled:
+            self.pending = []
+
+    def _record(self, event_type, entity, x=None, y=None):
+        self.pending.append(
+            Event(
+                event_type,
+                self.time,
+                entity.track_id,
+                entity.threat_type,
+                entity.is_hostile,
+                entity.x if x is None else x,
+                entity.y if y is None else y,
+            )
+        )
+
+    def _discard(self, event_type, entity, x=None, y=None):
+        pass
+
+    def flush(self):
+        """Deliver the events emitted this step to subscribers, grouped by type"""
+        if not self.pending:
+            return
+
+        batches = {}
+        for event in self.pending:
+            batches.setdefault(event.type, []).append(event)
+        self.pending = []
+
+        for event_type, events in batches.items():
+            for handler in self.handlers[event_type]:
+                handler(events)
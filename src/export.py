@@ -0,0 +1,140 @@
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import zlib
+
+import numpy as np
+import pygame
+
+VIDEO_EXTENSIONS = {".mp4", ".mkv", ".mov", ".webm"}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind, data):
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def encode_png(pixels, width, height, level=1):
+    """Encode packed RGB bytes as a PNG
+
+    Written with zlib directly, which releases the GIL while it compresses,
+    so encoder threads run in parallel with each other and with rendering.
+    """
+    rows = np.frombuffer(pixels, np.uint8).reshape(height, width * 3)
+    filtered = np.zeros((height, width * 3 + 1), np.uint8)  # filter byte 0: none
+    filtered[:, 1:] = rows
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", zlib.compress(filtered.tobytes(), level)),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+class FrameExporter:
+    """Write rendered frames to a PNG sequence or a local video encoder
+
+    A path with a video extension is encoded by ffmpeg, if it is installed,
+    from raw frames piped to it; any other path is a directory of numbered
+    PNGs encoded by a pool of worker threads. Either way submit() only copies
+    the surface's pixels and queues them. The queue holds at most backlog
+    frames, so rendering runs ahead of the disk until it fills.
+    """
+
+    def __init__(self, path, size, fps=30, workers=None, backlog=32):
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.frames = 0
+        self.pending = queue.Queue(maxsize=backlog)
+        self.error = None
+        self.encoder = None
+
+        if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise RuntimeError(f"ffmpeg is needed to write {path}")
+            width, height = size
+            self.encoder = subprocess.Popen(
+                [
+                    ffmpeg,
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgb24",
+                    "-s",
+                    f"{width}x{height}",
+                    "-r",
+                    str(fps),
+                    "-i",
+                    "-",
+                    "-pix_fmt",
+                    "yuv420p",
+                    path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+            workers = 1  # Frames must reach the pipe in order
+        else:
+            os.makedirs(path, exist_ok=True)
+            workers = workers or min(8, os.cpu_count() or 1)
+
+        self.threads = [
+            threading.Thread(target=self._run, name=f"frame-export-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def frame_time(self, frame=None):
+        """Time in ms from the start of the video at which a frame is shown"""
+        return 1000 * (self.frames if frame is None else frame) / self.fps
+
+    def submit(self, surface):
+        """Queue a copy of the surface's pixels as the next frame"""
+        if self.error:
+            raise self.error
+        pixels = pygame.image.tobytes(surface, "RGB")
+        self.pending.put((self.frames, pixels))
+        self.frames += 1
+
+    def close(self):
+        """Wait for every queued frame to be written"""
+        for _ in self.threads:
+            self.pending.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.encoder:
+            self.encoder.stdin.close()
+            self.encoder.wait()
+        if self.error:
+            raise self.error
+
+    def _run(self):
+        width, height = self.size
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            if self.error:
+                continue  # Keep draining so the renderer never blocks
+            frame, pixels = item
+            try:
+                if self.encoder:
+                    self.encoder.stdin.write(pixels)
+                else:
+                    name = os.path.join(self.path, f"frame_{frame:06d}.png")
+                    with open(name, "wb") as f:
+                        f.write(encode_png(pixels, width, height))
+            except OSError as exc:
+                self.error = exc
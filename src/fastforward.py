@@ -0,0 +1,461 @@
+import bisect
+import heapq
+import itertools
+import math
+import random
+from collections import Counter
+
+import numpy as np
+
+from config import THREAT_VALUES, WORLD_HEIGHT, WORLD_WIDTH
+from engine import INTERCEPTOR_SPEED, KILL_RADIUS, spread_bases
+from events import (
+    DETECTED,
+    ENGAGED,
+    FUEL_EXHAUSTED,
+    IMPACTED,
+    INTERCEPTED,
+    OUT_OF_BOUNDS,
+    SPAWNED,
+)
+from game_objects import FUEL_BURN, DefenseBase, EnhancedMissile
+from sensors import SWEEP_RATE, SWEEP_SECTORS
+from simthread import STEP_MS
+from tracking import TRANSITION, TrackEstimate, TrackFilter, measure
+from utils import calculate_intercept_point, intercept_times, time_of_impact
+from wta import allocate_interceptors
+
+MAX_FLIGHT_FRAMES = 4000  # frames an interceptor's path is worked out for
+ENGAGE_RETRY = 4  # frames before an engagement the allocator held is retried
+IMPACT_REACH = 8  # px from its aim point at which a track impacts
+
+# Event phases, in the order a stepped frame runs them
+SPAWN, DETECT, LAUNCH, HOSTILE_END, INTERCEPTOR_END, HIT = range(6)
+
+
+def flight_path(x, y, vx, vy, gravity, acceleration, frames):
+    """(frames + 1, 2) positions of a track after 0..frames steps
+
+    Closed form of EnhancedMissile.update: each frame gravity is added to vy,
+    the velocity is scaled by r = 1 + acceleration and the track moves by it,
+    so after k frames vx is r^k vx0 and vy is r^k vy0 + g S(k), where
+    S(k) = r (r^k - 1) / acceleration, and positions are the running sums.
+    """
+    k = np.arange(frames + 1, dtype=float)
+    r = 1 + acceleration
+    s = r * (r**k - 1) / acceleration
+    path = np.empty((frames + 1, 2))
+    path[:, 0] = x + vx * s
+    path[:, 1] = y + vy * s + gravity * r / acceleration * (s - k)
+    return path
+
+
+def fuel_frames(fuel=100.0):
+    """Frame on which a hostile launched with fuel runs dry, as stepped"""
+    frames = 0
+    while fuel > 0:
+        fuel = max(0, fuel - FUEL_BURN)
+        frames += 1
+    return frames
+
+
+class Flight:
+    """A track's whole flight, worked out when it is launched
+
+    Frame numbers are engine steps. The track makes its first move on frame
+    start and ends on frame end, taking no further part in collisions.
+    """
+
+    def __init__(self, missile, start, path, end, outcome):
+        self.missile = missile
+        self.start = start
+        self.path = path  # positions at the end of frames start - 1 .. end - 1
+        self.end = end
+        self.outcome = outcome  # event it ends with on frame end
+        self.alive = True
+        self.version = 0  # bumped whenever the flight's pending hit is replaced
+        self.next_hit = None  # (frame, fraction, hostile) it will hit first
+        self.target = None  # hostile an interceptor was launched at
+        self.engaged = False  # hostile has an interceptor chasing it
+        self.estimate = None  # track filter state once a hostile is detected
+        self.detected = 0  # path index of the position first measured
+        self.measured = 0  # path index of the next position to measure
+        low = path.min(axis=0) - KILL_RADIUS
+        high = path.max(axis=0) + KILL_RADIUS
+        self.bounds = (*low, *high)
+
+
+class FastForward:
+    """Event-driven kernel for headless runs that only need the outcome
+
+    Instead of integrating every entity every frame, each track's flight is
+    solved in closed form when it is launched, which gives the frames of its
+    detection, its arrival, fuel exhaustion or exit from the world, and its
+    first swept hit with an opposing track. These events sit on a priority
+    queue and time jumps straight from one to the next. Engagements follow
+    the stepped engine: detection by the sweeping search radars, a launch
+    once the track filter has settled, aimed from its estimate of noisy
+    measurements, the weapon-target allocator choosing the base, and
+    magazines reloading over time. Random draws differ from a
+    stepped run, so outcomes match it statistically rather than exactly.
+    """
+
+    def __init__(
+        self, base_positions=None, world_size=(WORLD_WIDTH, WORLD_HEIGHT), rng=random
+    ):
+        self.world_width, self.world_height = world_size
+        self.bases = [
+            DefenseBase(x, y) for x, y in base_positions or spread_bases(1, world_size)
+        ]
+        self.base_xs = np.array([base.x for base in self.bases], dtype=float)
+        self.base_ys = np.array([base.y for base in self.bases], dtype=float)
+        self.base_ranges = np.array([base.radar_range for base in self.bases])
+        self.reloaded = [0] * len(self.bases)  # frame each magazine last changed
+        self.reload_frames = [
+            next(n for n in itertools.count(1) if n * STEP_MS > base.reload_time)
+            for base in self.bases
+        ]
+        self.rng = rng
+        self.fuel_frames = fuel_frames()
+        self.tracker = TrackFilter(capacity=1)
+        self.gains = []  # (transition, gain) of each successive filter update
+        self.settle_frames = self._settle_frames()
+
+        # Phases of the beam's turn in which it looks at each radar sector
+        self.sweep_period = round(360 / SWEEP_RATE)
+        self.sector_width = 360 / SWEEP_SECTORS
+        self.inspections = [[] for _ in range(SWEEP_SECTORS)]
+        for phase in range(self.sweep_period):
+            start = SWEEP_RATE * phase % 360
+            first = int(start // self.sector_width)
+            last = int((start + SWEEP_RATE) // self.sector_width)
+            for sector in range(first, last + 1):
+                self.inspections[sector % SWEEP_SECTORS].append(phase)
+
+        self.queue = []  # (frame, phase, fraction, order, kind, flight, data)
+        self.order = itertools.count()
+        self.hostiles = []
+        self.interceptors = []
+        self.outcomes = Counter()
+        self.raids = None
+        self.frame = 0
+
+    def _settle_frames(self):
+        for frames in itertools.count(1):
+            self.filter_gain(frames - 1)
+            if self.tracker.estimates([0])[2][0]:
+                return frames
+
+    def filter_gain(self, update):
+        """Transition and gain of a track filter's update-th measurement
+
+        The filter's covariance does not depend on the measurements, so every
+        track settles after the same number of them and has the same gains,
+        which are read off a filter fed dummy measurements. An update moves a
+        track's state to transition @ state + gain * measurement.
+        """
+        while len(self.gains) <= update:
+            self.tracker.update([0], [0.0], [0.0])
+            gain = self.tracker.covariance[0, :, 0] / self.tracker.noise**2
+            transition = (np.eye(3) - np.outer(gain, [1.0, 0.0, 0.0])) @ TRANSITION
+            self.gains.append((transition, gain[:, None]))
+        return self.gains[update]
+
+    def push(self, frame, phase, kind, flight=None, data=None, fraction=0.0):
+        heapq.heappush(
+            self.queue,
+            (frame, phase, fraction, next(self.order), kind, flight, data),
+        )
+
+    def run(self, raids, until=None):
+        """Play out a RaidScheduler's spawns and return outcome counts
+
+        Spawns are taken from raids a frame at a time as they fall due, as
+        the stepped engine does, so a streamed scenario is never held whole.
+        Stops at the last event, or once until ms of simulated time have
+        passed. Events are counted as the stepped engine emits them, except
+        that DETECTED counts hostiles detected rather than beam passes.
+        """
+        self.raids = raids
+        self.schedule_spawns()
+        last = math.inf if until is None else until / STEP_MS
+        while self.queue and self.queue[0][0] <= last:
+            frame, _, _, _, kind, flight, data = heapq.heappop(self.queue)
+            self.frame = frame
+            kind(flight, data)
+        return self.outcomes
+
+    def schedule_spawns(self):
+        """Queue the first frame the raid's next spawn is due on, if any"""
+        time = self.raids.next_time()
+        if time is None:
+            return
+        # The step whose clock first reaches time, computed as the engine's is
+        frame = max(1, math.ceil(time / STEP_MS))
+        while frame > 1 and (frame - 1) * STEP_MS >= time:
+            frame -= 1
+        while frame * STEP_MS < time:
+            frame += 1
+        self.push(frame, SPAWN, self.spawn_due)
+
+    def spawn_due(self, *_):
+        for spawn in self.raids.due(self.frame * STEP_MS):
+            self.spawn(spawn)
+        self.schedule_spawns()
+
+    def fly(self, missile, start):
+        """Work out a freshly launched track's flight from frame start"""
+        frames = self.fuel_frames - 1 if missile.is_hostile else MAX_FLIGHT_FRAMES
+        path = flight_path(
+            missile.x,
+            missile.y,
+            missile.vx,
+            missile.vy,
+            missile.gravity,
+            missile.acceleration,
+            frames,
+        )
+        xs, ys = path[1:, 0], path[1:, 1]
+        arrived = np.hypot(xs - missile.target_x, ys - missile.target_y) < IMPACT_REACH
+        left = (xs < 0) | (xs > self.world_width) | (ys < 0) | (ys > self.world_height)
+        ended = np.flatnonzero(arrived | left)
+        if len(ended):
+            k = int(ended[0])
+            outcome = IMPACTED if arrived[k] else OUT_OF_BOUNDS
+            k += 1
+        elif missile.is_hostile:
+            k, outcome = self.fuel_frames, FUEL_EXHAUSTED
+        else:
+            # Interceptors speed up every frame, so one still in the world
+            # at the end of its path is taken to have left it
+            k, outcome = frames + 1, OUT_OF_BOUNDS
+        return Flight(missile, start, path[:k], start + k - 1, outcome)
+
+    def spawn(self, spawn):
+        target = self.bases[0] if len(self.bases) == 1 else self.rng.choice(self.bases)
+        missile = EnhancedMissile(
+            spawn.x, spawn.y, target.x, target.y, True, spawn.threat_type
+        )
+        hostile = self.fly(missile, self.frame)
+        self.hostiles.append(hostile)
+        self.outcomes[SPAWNED] += 1
+        self.push(hostile.end, HOSTILE_END, self.end_hostile, hostile)
+
+        detected = self.detection_frame(hostile)
+        if detected is not None:
+            self.push(detected, DETECT, self.detect, hostile)
+
+        # Interceptors already up may fly into it
+        for interceptor in self.interceptors:
+            self.plan_hit(interceptor, [hostile])
+
+    def detection_frame(self, hostile):
+        """First frame a search beam passes the hostile within range, if any"""
+        frames = [self.radar_detection(hostile, i) for i in range(len(self.bases))]
+        frames = [frame for frame in frames if frame is not None]
+        return min(frames) if frames else None
+
+    def radar_detection(self, hostile, index):
+        """First frame the radar at a base reports the hostile, if any
+
+        As in SweepRadar, the track is only looked at when the beam passes
+        the sector it was filed in, and is refiled then if its bearing has
+        moved on; beams sweep before tracks move, so see the last position.
+        """
+        dx = hostile.path[:, 0] - self.base_xs[index]
+        dy = hostile.path[:, 1] - self.base_ys[index]
+        bearings = np.degrees(np.arctan2(dy, dx)) % 360
+        sectors = (bearings // self.sector_width).astype(int) % len(self.inspections)
+        in_range = np.hypot(dx, dy) <= self.base_ranges[index]
+
+        sector = sectors[0]
+        frame = hostile.start
+        while True:
+            # Next frame whose beam passes the sector the track is filed in
+            inspected = self.inspections[sector]
+            phase = (frame - 1) % self.sweep_period
+            i = bisect.bisect_left(inspected, phase)
+            if i < len(inspected):
+                frame += inspected[i] - phase
+            else:
+                frame += self.sweep_period - phase + inspected[0]
+            if frame > hostile.end:
+                return None
+            k = frame - hostile.start
+            beam = SWEEP_RATE * (frame - 1) % 360
+            if (bearings[k] - beam) % 360 < SWEEP_RATE and in_range[k]:
+                return frame
+            sector = sectors[k]
+            frame += 1
+
+    def detect(self, hostile, _):
+        if not hostile.alive:
+            return
+        self.outcomes[DETECTED] += 1
+        hostile.estimate = np.zeros((3, 2))
+        hostile.detected = hostile.measured = self.frame - hostile.start
+        if THREAT_VALUES[hostile.missile.threat_type] > 0:
+            self.push(self.frame + self.settle_frames - 1, LAUNCH, self.launch, hostile)
+
+    def track(self, hostile):
+        """Filtered estimate of a detected hostile after this frame's measurement
+
+        As in the engine, the hostile is measured with sensor noise on every
+        frame from its detection on, and interceptors aim from the estimate.
+        """
+        k = self.frame - hostile.start
+        xs, ys = measure(
+            hostile.path[hostile.measured : k + 1, 0],
+            hostile.path[hostile.measured : k + 1, 1],
+            self.tracker.noise,
+        )
+        state = hostile.estimate
+        first = hostile.measured - hostile.detected
+        for update, measured in enumerate(np.column_stack([xs, ys]), first):
+            transition, gain = self.filter_gain(update)
+            state = transition @ state + gain * measured
+        hostile.estimate = state
+        hostile.measured = k + 1
+        return TrackEstimate(*state[0].tolist(), *state[1].tolist())
+
+    def magazine(self, index):
+        """Rounds at a base as the launch phase of the current frame begins"""
+        base = self.bases[index]
+        last_update = self.frame - 1  # Bases reload after launches each frame
+        if base.magazine >= base.magazine_capacity:
+            self.reloaded[index] = last_update
+            return base.magazine
+        rounds = (last_update - self.reloaded[index]) // self.reload_frames[index]
+        if base.magazine + rounds >= base.magazine_capacity:
+            base.magazine = base.magazine_capacity
+            self.reloaded[index] = last_update
+        else:
+            base.magazine += rounds
+            self.reloaded[index] += rounds * self.reload_frames[index]
+        return base.magazine
+
+    def launch(self, hostile, _):
+        if not hostile.alive or hostile.engaged or self.frame > hostile.end:
+            return
+        estimate = self.track(hostile)
+        x, y, vx, vy = estimate
+
+        dx = x - self.base_xs
+        dy = y - self.base_ys
+        times = intercept_times(dx, dy, vx, vy, INTERCEPTOR_SPEED)
+        times = np.where(np.hypot(dx, dy) <= self.base_ranges, times, np.inf)
+        stock = [self.magazine(i) for i in range(len(self.bases))]
+        choice = allocate_interceptors(
+            times[None, :], [hostile.missile.threat_type], stock
+        )[0]
+        if choice < 0:
+            self.push(self.frame + ENGAGE_RETRY, LAUNCH, self.launch, hostile)
+            return
+
+        base = self.bases[choice]
+        base.magazine -= 1
+        aim_x, aim_y = calculate_intercept_point(
+            base.x, base.y, estimate, INTERCEPTOR_SPEED
+        )
+        missile = EnhancedMissile(base.x, base.y, aim_x, aim_y, False)
+        interceptor = self.fly(missile, self.frame)
+        interceptor.target = hostile
+        hostile.engaged = True
+        self.interceptors.append(interceptor)
+        self.outcomes[SPAWNED] += 1
+        self.outcomes[ENGAGED] += 1
+        self.push(interceptor.end, INTERCEPTOR_END, self.end_interceptor, interceptor)
+        self.plan_hit(interceptor, self.hostiles)
+
+    def plan_hit(self, interceptor, hostiles):
+        """Queue the interceptor's first hit among hostiles if it comes sooner"""
+        best = interceptor.next_hit
+        left, top, right, bottom = interceptor.bounds
+        for hostile in hostiles:
+            if not hostile.alive or best and hostile is best[2]:
+                continue
+            h_left, h_top, h_right, h_bottom = hostile.bounds
+            if h_left > right or h_right < left or h_top > bottom or h_bottom < top:
+                continue
+            first = max(interceptor.start, hostile.start, self.frame)
+            last = min(interceptor.end, hostile.end) - 1
+            if best:
+                last = min(last, best[0])
+            if first > last:
+                continue
+            a = interceptor.path[
+                first - interceptor.start : last - interceptor.start + 2
+            ]
+            b = hostile.path[first - hostile.start : last - hostile.start + 2]
+            times = time_of_impact(
+                a[:-1, 0],
+                a[:-1, 1],
+                a[1:, 0] - a[:-1, 0],
+                a[1:, 1] - a[:-1, 1],
+                b[:-1, 0],
+                b[:-1, 1],
+                b[1:, 0] - b[:-1, 0],
+                b[1:, 1] - b[:-1, 1],
+                KILL_RADIUS,
+            )
+            hits = np.flatnonzero(~np.isnan(times))
+            if len(hits):
+                hit = (first + int(hits[0]), float(times[hits[0]]), hostile)
+                if best is None or hit[:2] < best[:2]:
+                    best = hit
+        if best is not interceptor.next_hit:
+            interceptor.next_hit = best
+            interceptor.version += 1
+            # Hits within a frame resolve earliest first, as in the engine
+            self.push(
+                best[0],
+                HIT,
+                self.hit,
+                interceptor,
+                (best[2], interceptor.version),
+                best[1],
+            )
+
+    def replan(self, hostile):
+        """Find new hits for interceptors that were going to hit hostile"""
+        for interceptor in self.interceptors:
+            if interceptor.next_hit and interceptor.next_hit[2] is hostile:
+                interceptor.next_hit = None
+                interceptor.version += 1
+                self.plan_hit(interceptor, self.hostiles)
+
+    def end_hostile(self, hostile, _):
+        if not hostile.alive:
+            return
+        self.outcomes[hostile.outcome] += 1
+        self.remove_hostile(hostile)
+
+    def end_interceptor(self, interceptor, _):
+        if not interceptor.alive:
+            return
+        self.outcomes[interceptor.outcome] += 1
+        self.remove_interceptor(interceptor)
+
+    def hit(self, interceptor, data):
+        hostile, version = data
+        if not (interceptor.alive and hostile.alive) or version != interceptor.version:
+            return
+        self.outcomes[INTERCEPTED] += 1
+        self.remove_interceptor(interceptor)
+        self.remove_hostile(hostile)
+
+    def remove_hostile(self, hostile):
+        hostile.alive = False
+        self.hostiles.remove(hostile)
+        self.replan(hostile)
+
+    def remove_interceptor(self, interceptor):
+        interceptor.alive = False
+        self.interceptors.remove(interceptor)
+        # Its target is engaged again from the next frame if it survived
+        target = interceptor.target
+        if target.alive and not any(
+            other.target is target for other in self.interceptors
+        ):
+            target.engaged = False
+            self.push(self.frame + 1, LAUNCH, self.launch, target)
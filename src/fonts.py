@@ -0,0 +1,58 @@
+import threading
+
+import pygame
+
+from config import FONT_SPECS
+
+
+class FontRegistry:
+    """Fonts by role, loaded on first use and shared by every module
+
+    pygame.font.SysFont scans the system's fonts the first time it is called
+    and is slow, so nothing is loaded until a font is first drawn with; runs
+    that never draw text never pay for it. warm() loads the rest ahead of
+    time on a background thread while the window opens.
+    """
+
+    def __init__(self, specs=FONT_SPECS):
+        self.specs = specs
+        self.fonts = {}
+        self.lock = threading.Lock()
+        self.warmer = None
+
+    def __getitem__(self, role):
+        font = self.fonts.get(role)
+        if font is None:
+            font = self.load(role)
+        return font
+
+    def __contains__(self, role):
+        return role in self.specs
+
+    def load(self, role):
+        """Load a font if no other thread has, and return it"""
+        with self.lock:
+            font = self.fonts.get(role)
+            if font is None:
+                family, size, bold = self.specs[role]
+                if not pygame.font.get_init():
+                    pygame.font.init()
+                font = pygame.font.SysFont(family, size, bold=bold)
+                self.fonts[role] = font
+        return font
+
+    def warm(self, background=True):
+        """Load every font now, or on a daemon thread if background"""
+        if not background:
+            for role in self.specs:
+                self[role]
+            return
+        if self.warmer is None:
+            self.warmer = threading.Thread(
+                target=self.warm, args=(False,), name="font-warmup", daemon=True
+            )
+            self.warmer.start()
+
+
+# Process-wide registry shared by everything that draws text
+FONTS = FontRegistry()
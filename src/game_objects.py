@@ -1,19 +1,30 @@
+import itertools
 import random
 import math
+import numpy as np
 import pygame
 from pygame import gfxdraw
 
-from config import COLORS, HEIGHT, MISSILE_POOL, PARTICLE_POOL, WIDTH
-pygame.init()
-pygame.font.init()
-FONTS = {
-    "title": pygame.font.SysFont("Arial", 32, bold=True),
-    "header": pygame.font.SysFont("Arial", 22, bold=True),
-    "main": pygame.font.SysFont("Arial", 18),
-    "equation": pygame.font.SysFont("Consolas", 16),
-    "small": pygame.font.SysFont("Arial", 14),
-    "tiny": pygame.font.SysFont("Arial", 12),
-}
+from camera import DEFAULT_CAMERA
+from config import (
+    COLORS,
+    MISSILE_POOL,
+    PARTICLE_POOL,
+    RADAR_BLIP_CAPACITY,
+    RADAR_BLIP_LIFE,
+    THREAT_TYPES,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from events import FUEL_EXHAUSTED, IMPACTED, OUT_OF_BOUNDS
+from fonts import FONTS
+from registry import REGISTRY
+from timing import ticks
+
+# Track ids are never reused, so pooled missiles get a fresh id on every launch
+_TRACK_IDS = itertools.count(1)
+FUEL_BURN = 0.1  # Fuel used per frame
+TRAIL_LENGTH = 80  # Positions kept for a track's fading trail
 
 
 class EnhancedParticle:
@@ -52,18 +63,14 @@ class EnhancedParticle:
         self.size = max(0, self.size - 0.03)
         return self.life <= 0
 
-    def draw(self, surface):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            color = (*self.color[:3], min(255, alpha))
+    def draw(self, surface, camera=DEFAULT_CAMERA):
+        if self.life > 0 and self.size > 0:
+            x, y = camera.to_screen(self.x, self.y)
+            draw_particle(surface, x, y, self.size, self.color, self.alpha)
 
-            if self.size > 0:
-                try:
-                    gfxdraw.filled_circle(
-                        surface, int(self.x), int(self.y), int(self.size), color
-                    )
-                except (ValueError, OverflowError):
-                    pass
+    @property
+    def alpha(self):
+        return min(255, int(255 * (self.life / self.max_life)))
 
 
 class EnhancedMissile:
@@ -76,17 +83,21 @@ class EnhancedMissile:
         is_hostile=True,
         threat_type="missile",
     ):
+        self.track_id = next(_TRACK_IDS)
         self.x = start_x
         self.y = start_y
         self.start_x = start_x
         self.start_y = start_y
         self.target_x = target_x
         self.target_y = target_y
+        self.target_track_id = None  # Track an interceptor was launched at
         self.is_hostile = is_hostile
         self.threat_type = threat_type
-        self.active = True
+        self._active = True
+        self.registered = False
         self.particles = []
         self.trail = []
+        self.on_screen = True  # Cleared by the renderer while outside the view
         self.fuel = 100.0
         self.gravity = 0.1 if threat_type == "missile" else 0.05
         self.acceleration = 0.05 if not is_hostile else 0.02
@@ -94,26 +105,21 @@ class EnhancedMissile:
         self.velocity_y = 0
 
         # Enhanced missile properties based on threat type
+        self.color, self.size = track_style(threat_type, is_hostile)
         if threat_type == "missile":
             self.speed = (
                 random.uniform(2.0, 3.5) if is_hostile else random.uniform(3.0, 4.5)
             )
-            self.color = COLORS["hostile"] if is_hostile else COLORS["interceptor"]
-            self.size = 6
             self.mass = random.randint(800, 2500)  # kg
             self.velocity = random.randint(800, 3500)  # m/s
             self.altitude = random.randint(1000, 15000)  # m
         elif threat_type == "drone":
             self.speed = random.uniform(1.0, 2.0)
-            self.color = COLORS["drone"]
-            self.size = 4
             self.mass = random.randint(50, 200)  # kg
             self.velocity = random.randint(100, 300)  # m/s
             self.altitude = random.randint(100, 1000)  # m
         else:  # aircraft
             self.speed = random.uniform(0.5, 1.5)
-            self.color = COLORS["aircraft"]
-            self.size = 8
             self.mass = random.randint(5000, 20000)  # kg
             self.velocity = random.randint(200, 800)  # m/s
             self.altitude = random.randint(5000, 12000)  # m
@@ -128,12 +134,29 @@ class EnhancedMissile:
         else:
             self.vx = self.vy = 0
 
-        self.launch_time = pygame.time.get_ticks()
+        self.launch_time = ticks()
         self.last_particle_time = 0
 
-    def update(self):
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        # Keep the registry counts in step with every state change
+        if self.registered and value != self._active:
+            REGISTRY.set_active(self, value)
+        self._active = value
+
+    def update(
+        self, world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT, current_time=None
+    ):
+        """Advance one frame; returns the lifecycle event type if the track ended
+
+        current_time is the simulation time in ms, the wall clock if not given.
+        """
         if not self.active:
-            return False
+            return None
 
         # Apply gravity
         self.vy += self.gravity
@@ -143,10 +166,10 @@ class EnhancedMissile:
         self.vy *= 1 + self.acceleration
 
         # Consume fuel
-        self.fuel = max(0, self.fuel - 0.1)
+        self.fuel = max(0, self.fuel - FUEL_BURN)
         if self.fuel <= 0 and self.is_hostile:
             self.active = False
-            return False
+            return FUEL_EXHAUSTED
 
         # Update position
         self.x += self.vx
@@ -154,12 +177,17 @@ class EnhancedMissile:
 
         # Add to trail
         self.trail.append((self.x, self.y))
-        if len(self.trail) > 80:
+        if len(self.trail) > TRAIL_LENGTH:
             self.trail.pop(0)
 
-        # Create engine particles
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_particle_time > 50 and self.fuel > 0:
+        # Create engine particles; off-screen tracks skip the cosmetic exhaust
+        if current_time is None:
+            current_time = ticks()
+        if (
+            self.on_screen
+            and current_time - self.last_particle_time > 50
+            and self.fuel > 0
+        ):
             self.last_particle_time = current_time
             particle_color = (255, 120, 30) if self.is_hostile else (80, 180, 255)
             px = self.x - self.vx * 8 + random.uniform(-3, 3)
@@ -178,103 +206,124 @@ class EnhancedMissile:
         )
         if dist_to_target < 8:
             self.active = False
-            return True
+            return IMPACTED
 
         # Check bounds
-        if self.x < 0 or self.x > WIDTH or self.y < 0 or self.y > HEIGHT:
+        if self.x < 0 or self.x > world_width or self.y < 0 or self.y > world_height:
             self.active = False
+            return OUT_OF_BOUNDS
 
-        return False
+        return None
 
-    def draw(self, surface):
+    def draw(self, surface, camera=DEFAULT_CAMERA):
         if not self.active:
             return
+        draw_trail(surface, self.trail, self.color, camera)
+        for particle in self.particles:
+            particle.draw(surface, camera)
+        x, y = camera.to_screen(self.x, self.y)
+        draw_track(
+            surface,
+            x,
+            y,
+            self.vx,
+            self.vy,
+            self.threat_type,
+            self.color,
+            self.size,
+            None if self.is_hostile else self.fuel,
+        )
 
-        # Draw trail with fade effect
-        for i, (trail_x, trail_y) in enumerate(self.trail):
-            alpha = int(255 * (i / len(self.trail)) * 0.7)
-            trail_color = (*self.color[:3], alpha)
-            size = max(1, int(3 * (i / len(self.trail))))
 
-            try:
-                gfxdraw.filled_circle(
-                    surface, int(trail_x), int(trail_y), size, trail_color
-                )
-            except (ValueError, OverflowError):
-                pass
+def track_style(threat_type, is_hostile):
+    """Color and marker size a track is drawn with"""
+    if threat_type == "missile":
+        return (COLORS["hostile"] if is_hostile else COLORS["interceptor"]), 6
+    if threat_type == "drone":
+        return COLORS["drone"], 4
+    return COLORS["aircraft"], 8
 
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(surface)
 
-        # Draw missile body with shape based on threat type
-        if self.threat_type == "missile":
-            gfxdraw.filled_circle(
-                surface, int(self.x), int(self.y), self.size, self.color
-            )
+def draw_particle(surface, x, y, size, color, alpha):
+    """Draw a particle at screen position (x, y)"""
+    try:
+        gfxdraw.filled_circle(surface, int(x), int(y), int(size), (*color[:3], alpha))
+    except (ValueError, OverflowError):
+        pass
 
-            # Draw directional indicator
-            angle = math.atan2(self.vy, self.vx)
-            tip_x = self.x + 15 * math.cos(angle)
-            tip_y = self.y + 15 * math.sin(angle)
-            pygame.draw.line(surface, self.color, (self.x, self.y), (tip_x, tip_y), 3)
-        elif self.threat_type == "drone":
-            # Draw drone as a diamond shape
-            points = [
-                (self.x, self.y - self.size * 1.5),
-                (self.x + self.size, self.y),
-                (self.x, self.y + self.size * 1.5),
-                (self.x - self.size, self.y),
-            ]
-            pygame.draw.polygon(surface, self.color, points)
-        else:  # aircraft
-            # Draw aircraft as a winged shape
-            pygame.draw.ellipse(
-                surface,
-                self.color,
-                (
-                    self.x - self.size * 1.5,
-                    self.y - self.size // 2,
-                    self.size * 3,
-                    self.size,
-                ),
-            )
-            pygame.draw.polygon(
-                surface,
-                self.color,
-                [
-                    (self.x + self.size * 1.5, self.y),
-                    (self.x + self.size * 3, self.y),
-                    (self.x + self.size * 1.5, self.y + self.size),
-                ],
-            )
-            pygame.draw.polygon(
-                surface,
-                self.color,
-                [
-                    (self.x + self.size * 1.5, self.y),
-                    (self.x + self.size * 3, self.y),
-                    (self.x + self.size * 1.5, self.y - self.size),
-                ],
-            )
 
-        # Draw glow effect
-        glow_color = (*self.color[:3], 50)
+def draw_trail(surface, trail, color, camera=DEFAULT_CAMERA):
+    """Draw a track's trail of world positions, fading towards the oldest"""
+    for i, (trail_x, trail_y) in enumerate(trail):
+        alpha = int(255 * (i / len(trail)) * 0.7)
+        trail_color = (*color[:3], alpha)
+        size = max(1, int(3 * (i / len(trail))))
+        trail_x, trail_y = camera.to_screen(trail_x, trail_y)
+
         try:
             gfxdraw.filled_circle(
-                surface, int(self.x), int(self.y), self.size + 4, glow_color
+                surface, int(trail_x), int(trail_y), size, trail_color
             )
         except (ValueError, OverflowError):
             pass
 
-        # Draw fuel gauge
-        if self.fuel < 50 and not self.is_hostile:
-            pygame.draw.rect(surface, (40, 40, 50), (self.x - 10, self.y - 15, 20, 4))
-            pygame.draw.rect(
-                surface,
-                COLORS["warning"] if self.fuel < 20 else COLORS["success"],
-                (self.x - 10, self.y - 15, 20 * (self.fuel / 100), 4),
-            )
+
+def draw_track(surface, x, y, vx, vy, threat_type, color, size, fuel=None):
+    """Draw a track's marker at screen position (x, y)
+
+    fuel, if given, is shown as a gauge once it runs below half.
+    """
+    # Draw missile body with shape based on threat type
+    if threat_type == "missile":
+        gfxdraw.filled_circle(surface, int(x), int(y), size, color)
+
+        # Draw directional indicator
+        angle = math.atan2(vy, vx)
+        tip_x = x + 15 * math.cos(angle)
+        tip_y = y + 15 * math.sin(angle)
+        pygame.draw.line(surface, color, (x, y), (tip_x, tip_y), 3)
+    elif threat_type == "drone":
+        # Draw drone as a diamond shape
+        points = [
+            (x, y - size * 1.5),
+            (x + size, y),
+            (x, y + size * 1.5),
+            (x - size, y),
+        ]
+        pygame.draw.polygon(surface, color, points)
+    else:  # aircraft
+        # Draw aircraft as a winged shape
+        pygame.draw.ellipse(
+            surface,
+            color,
+            (x - size * 1.5, y - size // 2, size * 3, size),
+        )
+        pygame.draw.polygon(
+            surface,
+            color,
+            [(x + size * 1.5, y), (x + size * 3, y), (x + size * 1.5, y + size)],
+        )
+        pygame.draw.polygon(
+            surface,
+            color,
+            [(x + size * 1.5, y), (x + size * 3, y), (x + size * 1.5, y - size)],
+        )
+
+    # Draw glow effect
+    glow_color = (*color[:3], 50)
+    try:
+        gfxdraw.filled_circle(surface, int(x), int(y), size + 4, glow_color)
+    except (ValueError, OverflowError):
+        pass
+
+    # Draw fuel gauge
+    if fuel is not None and fuel < 50:
+        pygame.draw.rect(surface, (40, 40, 50), (x - 10, y - 15, 20, 4))
+        pygame.draw.rect(
+            surface,
+            COLORS["warning"] if fuel < 20 else COLORS["success"],
+            (x - 10, y - 15, 20 * (fuel / 100), 4),
+        )
 
 
 def get_particle(x, y, color, particle_type="default"):
@@ -298,14 +347,17 @@ def get_missile(
     if MISSILE_POOL:
         missile = MISSILE_POOL.pop()
         missile.__init__(start_x, start_y, target_x, target_y, is_hostile, threat_type)
-        return missile
-    return EnhancedMissile(
-        start_x, start_y, target_x, target_y, is_hostile, threat_type
-    )
+    else:
+        missile = EnhancedMissile(
+            start_x, start_y, target_x, target_y, is_hostile, threat_type
+        )
+    REGISTRY.register(missile)
+    return missile
 
 
 def recycle_missile(missile):
     """Return missile to pool"""
+    REGISTRY.unregister(missile)
     missile.active = False
     missile.particles = []
     missile.trail = []
@@ -342,28 +394,30 @@ class EnhancedExplosion:
 
         return not self.active
 
-    def draw(self, surface):
+    def draw(self, surface, camera=DEFAULT_CAMERA):
         # Draw particles
         for particle in self.particles:
-            particle.draw(surface)
-
-        # Draw shockwave
-        if self.radius < self.max_radius:
-            for i in range(3):
-                ring_radius = self.radius - i * 8
-                if ring_radius > 0:
-                    alpha = max(0, 100 - i * 30)
-                    color = (255, 200, 100, alpha)
-                    try:
-                        gfxdraw.aacircle(
-                            surface, int(self.x), int(self.y), int(ring_radius), color
-                        )
-                    except (ValueError, OverflowError):
-                        pass
+            particle.draw(surface, camera)
+        x, y = camera.to_screen(self.x, self.y)
+        draw_shockwave(surface, x, y, self.radius, self.max_radius)
+
+
+def draw_shockwave(surface, x, y, radius, max_radius):
+    """Draw an explosion's expanding rings at screen position (x, y)"""
+    if radius < max_radius:
+        for i in range(3):
+            ring_radius = radius - i * 8
+            if ring_radius > 0:
+                alpha = max(0, 100 - i * 30)
+                color = (255, 200, 100, alpha)
+                try:
+                    gfxdraw.aacircle(surface, int(x), int(y), int(ring_radius), color)
+                except (ValueError, OverflowError):
+                    pass
 
 
 class DefenseBase:
-    def __init__(self, x, y):
+    def __init__(self, x, y, magazine_capacity=24, reload_time=250, radar_range=1800):
         self.x = x
         self.y = y
         self.radius = 25
@@ -372,8 +426,25 @@ class DefenseBase:
         self.activity_level = 0
         self.last_radar_time = 0
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
+        # Interceptor magazine, reloaded one round every reload_time ms
+        self.magazine_capacity = magazine_capacity
+        self.magazine = magazine_capacity
+        self.reload_time = reload_time
+        self.last_reload_time = 0
+
+        # Threats further away than this are invisible to this site
+        self.radar_range = radar_range
+
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = ticks()
+
+        # Reload magazine
+        if self.magazine >= self.magazine_capacity:
+            self.last_reload_time = current_time
+        elif current_time - self.last_reload_time > self.reload_time:
+            self.magazine += 1
+            self.last_reload_time = current_time
 
         # Update radar at a slower rate
         if current_time - self.last_radar_time > 50:
@@ -392,68 +463,123 @@ class DefenseBase:
                 self.particles.remove(particle)
                 recycle_particle(particle)
 
-    def draw(self, surface):
-        # Draw base structure
-        pygame.draw.circle(surface, (20, 60, 40), (self.x, self.y + 10), 25)
-        pygame.draw.rect(surface, COLORS["base"], (self.x - 20, self.y + 15, 40, 20))
-
-        # Draw radar dish
-        pygame.draw.circle(surface, COLORS["base"], (self.x, self.y), self.radius, 3)
-        pygame.draw.circle(surface, (40, 120, 80), (self.x, self.y), self.radius - 10)
-
-        # Draw radar sweep
-        end_x = self.x + (self.radius + 15) * math.cos(math.radians(self.radar_angle))
-        end_y = self.y + (self.radius + 15) * math.sin(math.radians(self.radar_angle))
-        pygame.draw.line(
-            surface, COLORS["success"], (self.x, self.y), (end_x, end_y), 2
+    def draw(self, surface, camera=DEFAULT_CAMERA):
+        x, y = camera.to_screen(self.x, self.y)
+        draw_base(
+            surface,
+            x,
+            y,
+            self.radius,
+            self.radar_angle,
+            self.magazine,
+            self.magazine_capacity,
         )
 
         # Draw particles
         for particle in self.particles:
-            particle.draw(surface)
+            particle.draw(surface, camera)
 
-        # Draw base label
-        label_text = FONTS["tiny"].render(
-            "DEFENSE BASE", True, COLORS["text_secondary"]
-        )
-        surface.blit(label_text, (self.x - 35, self.y + 40))
+
+def draw_base(surface, x, y, radius, radar_angle, magazine, magazine_capacity):
+    """Draw a defense site at screen position (x, y)"""
+    # Draw base structure
+    pygame.draw.circle(surface, (20, 60, 40), (x, y + 10), 25)
+    pygame.draw.rect(surface, COLORS["base"], (x - 20, y + 15, 40, 20))
+
+    # Draw radar dish
+    pygame.draw.circle(surface, COLORS["base"], (x, y), radius, 3)
+    pygame.draw.circle(surface, (40, 120, 80), (x, y), radius - 10)
+
+    # Draw radar sweep
+    end_x = x + (radius + 15) * math.cos(math.radians(radar_angle))
+    end_y = y + (radius + 15) * math.sin(math.radians(radar_angle))
+    pygame.draw.line(surface, COLORS["success"], (x, y), (end_x, end_y), 2)
+
+    # Draw base label
+    label_text = FONTS["tiny"].render(
+        f"DEFENSE BASE {magazine}/{magazine_capacity}",
+        True,
+        COLORS["text_secondary"] if magazine else COLORS["danger"],
+    )
+    surface.blit(label_text, (x - label_text.get_width() // 2, y + 40))
 
 
 class ThreatRadar:
-    def __init__(self, x, y, radius):
+    # Different symbols for different threats, indexed by threat type code
+    SYMBOLS = ["▲", "◇", "○"]
+    SYMBOL_COLORS = [COLORS["hostile"], COLORS["drone"], COLORS["aircraft"]]
+
+    def __init__(self, x, y, radius, capacity=RADAR_BLIP_CAPACITY):
         self.x = x
         self.y = y
         self.radius = radius
-        self.blips = []
         self.radar_sweep_angle = 0
-        self.last_sweep_time = 0
-
-    def add_blip(self, threat_type, angle, distance):
-        # Different symbols for different threats
-        symbols = {"missile": "▲", "drone": "◇", "aircraft": "○"}
-        self.blips.append(
-            {
-                "symbol": symbols[threat_type],
-                "type": threat_type,
-                "angle": angle,
-                "distance": distance,
-                "life": 200,  # Frames to display the blip
-            }
-        )
 
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_sweep_time > 30:
-            self.radar_sweep_angle = (self.radar_sweep_angle + 4) % 360
-            self.last_sweep_time = current_time
+        # Fixed-capacity blip store, one slot per track id
+        self.capacity = capacity
+        self.blip_angle = np.zeros(capacity)  # degrees
+        self.blip_distance = np.zeros(capacity)  # fraction of radius
+        self.blip_life = np.zeros(capacity, dtype=np.int32)
+        self.blip_type = np.zeros(capacity, dtype=np.int8)
+        self.blip_used = np.zeros(capacity, dtype=bool)
+        self.blip_slots = {}  # track id -> slot
+        self.slot_tracks = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.symbol_surfaces = {}
+
+    def add_blip(self, track_id, threat_type, angle, distance):
+        """Add a blip for a track, or refresh it in place if already shown"""
+        slot = self.blip_slots.get(track_id)
+        if slot is None:
+            if self.free_slots:
+                slot = self.free_slots.pop()
+            else:
+                # Store is full: evict the blip closest to fading out
+                slot = int(np.argmin(self.blip_life))
+                del self.blip_slots[self.slot_tracks[slot]]
+            self.blip_slots[track_id] = slot
+            self.slot_tracks[slot] = track_id
+            self.blip_used[slot] = True
+
+        self.blip_type[slot] = THREAT_TYPES.index(threat_type)
+        self.blip_angle[slot] = angle
+        self.blip_distance[slot] = distance
+        self.blip_life[slot] = RADAR_BLIP_LIFE
+
+    def update(self, sweep_angle):
+        # The beam shown is the search radar's, so blips appear as it passes
+        self.radar_sweep_angle = sweep_angle
 
         # Update blip lifetimes
-        for blip in self.blips[:]:
-            blip["life"] -= 1
-            if blip["life"] <= 0:
-                self.blips.remove(blip)
+        self.blip_life[self.blip_used] -= 1
+        for slot in np.flatnonzero(self.blip_used & (self.blip_life <= 0)):
+            del self.blip_slots[self.slot_tracks[slot]]
+            self.slot_tracks[slot] = None
+            self.blip_used[slot] = False
+            self.free_slots.append(int(slot))
+
+    def get_symbol_surface(self, type_code):
+        """Render a threat symbol once and reuse it for every blip of that type"""
+        surface = self.symbol_surfaces.get(type_code)
+        if surface is None:
+            surface = FONTS["small"].render(
+                self.SYMBOLS[type_code], True, self.SYMBOL_COLORS[type_code]
+            )
+            self.symbol_surfaces[type_code] = surface
+        return surface
+
+    def blips(self):
+        """Threat type codes, angles and distances of the live blips"""
+        slots = np.flatnonzero(self.blip_used)
+        return self.blip_type[slots], self.blip_angle[slots], self.blip_distance[slots]
+
+    def draw(self, surface, sweep_angle=None, blips=None):
+        """Draw the scope, by default with this radar's own beam and blips"""
+        if sweep_angle is None:
+            sweep_angle = self.radar_sweep_angle
+        if blips is None:
+            blips = self.blips()
 
-    def draw(self, surface):
         # Draw radar background
         pygame.draw.circle(surface, (20, 30, 60), (self.x, self.y), self.radius)
         pygame.draw.circle(
@@ -467,8 +593,8 @@ class ThreatRadar:
             )
 
         # Draw radar sweep
-        sweep_x = self.x + self.radius * math.cos(math.radians(self.radar_sweep_angle))
-        sweep_y = self.y + self.radius * math.sin(math.radians(self.radar_sweep_angle))
+        sweep_x = self.x + self.radius * math.cos(math.radians(sweep_angle))
+        sweep_y = self.y + self.radius * math.sin(math.radians(sweep_angle))
         pygame.draw.line(
             surface, COLORS["success"], (self.x, self.y), (sweep_x, sweep_y), 2
         )
@@ -483,20 +609,16 @@ class ThreatRadar:
             y = self.y + (self.radius + 15) * math.sin(rad) - text.get_height() // 2
             surface.blit(text, (x, y))
 
-        # Draw blips
-        for blip in self.blips:
-            rad = math.radians(blip["angle"])
-            dist = blip["distance"] * self.radius
-            x = self.x + dist * math.cos(rad)
-            y = self.y + dist * math.sin(rad)
-
-            # Determine color by threat type
-            if blip["type"] == "missile":
-                color = COLORS["hostile"]
-            elif blip["type"] == "drone":
-                color = COLORS["drone"]
-            else:
-                color = COLORS["aircraft"]
+        # Project all live blips to screen coordinates in one pass
+        types, angles, distances = blips
+        if len(types) == 0:
+            return
+        rad = np.radians(angles)
+        dist = distances * self.radius
+        xs = self.x + dist * np.cos(rad)
+        ys = self.y + dist * np.sin(rad)
 
-            text = FONTS["small"].render(blip["symbol"], True, color)
+        # Draw blips
+        for type_code, x, y in zip(types.tolist(), xs.tolist(), ys.tolist()):
+            text = self.get_symbol_surface(type_code)
             surface.blit(text, (x - text.get_width() // 2, y - text.get_height() // 2))
@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+from collections import deque, namedtuple
+
+from config import HEIGHT, WIDTH
+from serving import shutdown_loop
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7700
+
+# velocity (m/s) and altitude (m) feed classify_threat; vx/vy are an optional
+# screen-space velocity, given together, otherwise the track heads for the base
+TrackMessage = namedtuple(
+    "TrackMessage", ["id", "x", "y", "vx", "vy", "velocity", "altitude"]
+)
+
+
+def parse_track_message(line):
+    """Decode one JSON track message, raising ValueError if it is malformed"""
+    try:
+        data = json.loads(line)
+        vx = data.get("vx")
+        vy = data.get("vy")
+        if (vx is None) != (vy is None):
+            raise ValueError(f"Track message has only one of vx, vy: {line!r}")
+        return TrackMessage(
+            str(data["id"]),
+            float(data["x"]),
+            float(data["y"]),
+            None if vx is None else float(vx),
+            None if vy is None else float(vy),
+            float(data["velocity"]),
+            float(data["altitude"]),
+        )
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Malformed track message: {line!r}") from exc
+
+
+class TrackFeedServer:
+    """Accept newline-delimited JSON track messages over UDP and TCP
+
+    The asyncio servers run on their own thread and append parsed messages to
+    a deque, whose append/popleft are atomic in CPython, so the simulation
+    thread drains a step's batch without taking a lock. When more than
+    max_pending messages are waiting, the oldest are discarded and counted.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_pending=100000):
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.pending = deque(maxlen=max_pending)
+        self.messages_received = 0
+        self.messages_dropped = 0
+        self.messages_malformed = 0
+        self.loop = None
+        self.thread = None
+        self.error = None
+        self.writers = set()  # connected TCP clients
+
+    def start(self):
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run, args=(ready,), name="track-feed", daemon=True
+        )
+        self.thread.start()
+        ready.wait()
+        if self.error:
+            raise self.error
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    def drain(self, limit=None):
+        """Pop up to limit queued messages for this simulation step"""
+        pending = self.pending
+        count = len(pending) if limit is None else min(limit, len(pending))
+        return [pending.popleft() for _ in range(count)]
+
+    def feed_line(self, line):
+        try:
+            message = parse_track_message(line)
+        except ValueError:
+            self.messages_malformed += 1
+            return
+        if len(self.pending) == self.max_pending:
+            self.messages_dropped += 1
+        self.pending.append(message)
+        self.messages_received += 1
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        except OSError as exc:
+            self.error = exc
+            ready.set()
+            return
+        ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            shutdown_loop(
+                self.loop, [self.udp_transport, self.tcp_server], self.writers
+            )
+
+    async def _serve(self):
+        self.udp_transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: _FeedDatagramProtocol(self), local_addr=(self.host, self.port)
+        )
+        self.tcp_server = await asyncio.start_server(
+            self._handle_tcp, self.host, self.port
+        )
+
+    async def _handle_tcp(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.feed_line(line)
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+
+class _FeedDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        for line in data.splitlines():
+            self.server.feed_line(line)
+
+
+def synthesize_feed(tracks=100, updates=1000, seed=None):
+    """Generate a recorded-style feed of tracks flying towards the lower left"""
+    rng = random.Random(seed)
+    states = []
+    for i in range(tracks):
+        states.append(
+            {
+                "id": f"T{i}",
+                "x": rng.uniform(100, WIDTH - 400),
+                "y": rng.uniform(50, 250),
+                "vx": rng.uniform(-2.0, 0.5),
+                "vy": rng.uniform(0.5, 2.0),
+                "velocity": rng.randint(500, 3500),
+                "altitude": rng.randint(500, 15000),
+            }
+        )
+
+    for _ in range(updates):
+        for state in states:
+            state["x"] = (state["x"] + state["vx"]) % WIDTH
+            state["y"] = (state["y"] + state["vy"]) % HEIGHT
+            yield json.dumps(state)
+
+
+async def replay_feed(lines, host, port, rate, tcp=False, lines_per_datagram=32):
+    """Send feed lines to a TrackFeedServer at a fixed rate (messages/second)"""
+    loop = asyncio.get_running_loop()
+    if tcp:
+        _, writer = await asyncio.open_connection(host, port)
+    else:
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(host, port)
+        )
+
+    # Send in small bursts and sleep until the schedule catches up, so high
+    # rates are not limited by the event loop's timer resolution
+    burst = max(1, min(lines_per_datagram, int(rate / 100)))
+    start = loop.time()
+    sent = 0
+    lines = iter(lines)
+    while True:
+        chunk = list(itertools.islice(lines, burst))
+        if not chunk:
+            break
+        payload = ("\n".join(chunk) + "\n").encode()
+        if tcp:
+            writer.write(payload)
+            await writer.drain()
+        else:
+            transport.sendto(payload)
+        sent += len(chunk)
+
+        delay = start + sent / rate - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    if tcp:
+        writer.close()
+        await writer.wait_closed()
+    else:
+        transport.close()
+    return sent, loop.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded track feed into the simulator"
+    )
+    parser.add_argument(
+        "feed", nargs="?", help="JSON-lines feed to replay (default: synthetic)"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tcp", action="store_true", help="send over TCP")
+    parser.add_argument("--rate", type=float, default=1000, help="messages per second")
+    parser.add_argument("--loop", action="store_true", help="repeat the feed")
+    parser.add_argument(
+        "--tracks", type=int, default=100, help="synthetic feed track count"
+    )
+    args = parser.parse_args()
+
+    if args.feed:
+        with open(args.feed) as f:
+            recorded = [line.rstrip("\n") for line in f if line.strip()]
+        lines = itertools.cycle(recorded) if args.loop else recorded
+    else:
+        updates = None if args.loop else 1000
+        lines = synthesize_feed(args.tracks, updates or 10**9)
+
+    sent, elapsed = asyncio.run(
+        replay_feed(lines, args.host, args.port, args.rate, args.tcp)
+    )
+    print(f"Sent {sent} messages in {elapsed:.2f}s ({sent / elapsed:.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
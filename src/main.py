@@ -1,62 +1,389 @@
+import argparse
 import pygame
 import math
-import random
 import sys
+from broadcast import StateBroadcastServer
+from camera import CULL_MARGIN, Camera
 from config import (
     WIDTH,
     HEIGHT,
     COLORS,
+    PHYSICS_EQUATIONS,
+    THREAT_TYPES,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
 )
+from engine import DefenseEngine, spread_bases
+from events import (
+    DETECTED,
+    ENGAGED,
+    FUEL_EXHAUSTED,
+    IMPACTED,
+    INTERCEPTED,
+    OUT_OF_BOUNDS,
+    SPAWNED,
+)
+from export import FrameExporter
+from fastforward import FastForward
+from fonts import FONTS
 from game_objects import (
-    FONTS,
-    DefenseBase,
     EnhancedExplosion,
     ThreatRadar,
-    get_missile,
-    recycle_missile,
+    draw_base,
+    draw_particle,
+    draw_shockwave,
+    draw_track,
+    draw_trail,
+    track_style,
 )
-from physics import PhysicsEquation
+from ingest import DEFAULT_HOST, TrackFeedServer
+from physics import PhysicsEngine, PhysicsEquation
+from raids import SCENARIO_FORMATS, RaidScheduler, load_raid_plan, read_scenario
+from registry import FRIENDLY, HOSTILE
+from simthread import STEP_MS, Simulation
+from telemetry import TELEMETRY_FORMATS, TelemetrySink
+from timing import ticks
 from ui import (
+    Button,
+    MetricGauge,
+    Panel,
+    StatusLine,
     SystemMetrics,
-    draw_enhanced_button,
-    draw_enhanced_panel,
-    draw_metric_display,
     generate_terrain,
+    playfield_rect,
 )
-from utils import calculate_intercept_point, classify_threat
-
-
-pygame.init()
-pygame.font.init()
-
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("SUCCEDRA: Advanced Algorithmic Missile Defense System")
 
+PAN_SPEED = 12  # screen px per frame while an arrow key is held
+ZOOM_STEP = 1.25  # zoom factor per mouse wheel notch
+
+# HUD panels; world entities are only drawn in the playfield between them
+LEFT_PANEL = pygame.Rect(20, 20, 420, HEIGHT - 40)
+RIGHT_PANEL = pygame.Rect(WIDTH - 520, 20, 500, HEIGHT - 40)
+
+
+def world_size(text):
+    """Parse a WIDTHxHEIGHT world size argument"""
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < 640 or height < 400:
+        raise argparse.ArgumentTypeError("the world must be at least 640x400")
+    return width, height
+
+
+def bootstrap(headless=False):
+    """Start the SDL subsystems a run needs and return the surface to draw on
+
+    A window needs only the display: fonts start themselves on first use and
+    audio is never started. Headless runs start nothing and draw offscreen.
+    """
+    if headless:
+        return pygame.Surface((WIDTH, HEIGHT))
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("SUCCEDRA: Advanced Algorithmic Missile Defense System")
+    return screen
+
+
+def toggle_auto_mode(engine):
+    engine.auto_mode = not engine.auto_mode
+
+
+def manual_launch(engine):
+    if not engine.auto_mode:
+        engine.spawn_random_threat(max_start_y=200)
+
+
+def set_threat_level(level):
+    """Command switching the engine to a threat level"""
+
+    def command(engine):
+        engine.threat_level = level
+
+    return command
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="SUCCEDRA: Advanced Algorithmic Missile Defense System"
+    )
+    parser.add_argument("--bases", type=int, default=1, help="number of defense sites")
+    parser.add_argument(
+        "--world",
+        type=world_size,
+        default=(WORLD_WIDTH, WORLD_HEIGHT),
+        metavar="WIDTHxHEIGHT",
+        help="battlespace size in world units (default: the window)",
+    )
+    parser.add_argument(
+        "--telemetry", metavar="PATH", help="log every track's state to PATH"
+    )
+    parser.add_argument(
+        "--telemetry-format", choices=TELEMETRY_FORMATS, default="jsonl"
+    )
+    parser.add_argument(
+        "--telemetry-compress", action="store_true", help="gzip telemetry files"
+    )
+    parser.add_argument(
+        "--ingest-port",
+        type=int,
+        metavar="PORT",
+        help="drive threats from a UDP/TCP track feed on PORT instead of random",
+    )
+    parser.add_argument("--ingest-host", default=DEFAULT_HOST)
+    parser.add_argument(
+        "--broadcast-port",
+        type=int,
+        metavar="PORT",
+        help="publish the world state to TCP consoles on PORT",
+    )
+    parser.add_argument("--broadcast-host", default=DEFAULT_HOST)
+    parser.add_argument(
+        "--raid",
+        metavar="PATH",
+        help="launch the timed salvos of a JSON raid plan instead of random",
+    )
+    parser.add_argument(
+        "--scenario",
+        metavar="PATH",
+        help="stream spawns from a .jsonl, .csv or .bin scenario (optionally .gz)",
+    )
+    parser.add_argument("--scenario-format", choices=SCENARIO_FORMATS)
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="render offscreen to a PNG directory, or a video file if ffmpeg is found",
+    )
+    parser.add_argument(
+        "--export-fps", type=float, default=30, help="frames per second of video"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30,
+        metavar="SECONDS",
+        help="simulated time to export",
+    )
+    parser.add_argument(
+        "--lockstep",
+        action="store_true",
+        help="step the simulation once per frame instead of on its own thread",
+    )
+    parser.add_argument(
+        "--fast-forward",
+        action="store_true",
+        help="play a raid or scenario out headless and print only its outcome",
+    )
+    args = parser.parse_args(argv)
+    if args.fast_forward and not (args.raid or args.scenario):
+        parser.error("--fast-forward needs a --raid plan or a --scenario")
+    return args
+
+
+def fast_forward(args):
+    """Run the raid or scenario through the event-driven kernel, no display"""
+    raids = RaidScheduler()
+    if args.raid:
+        raids.load(load_raid_plan(args.raid))
+    if args.scenario:
+        raids.stream(
+            read_scenario(args.scenario, args.scenario_format, world_size=args.world)
+        )
+    kernel = FastForward(spread_bases(args.bases, args.world), world_size=args.world)
+    outcomes = kernel.run(raids)
+    hostiles = outcomes[SPAWNED] - outcomes[ENGAGED]
+    print(f"{hostiles} hostiles played out to {kernel.frame * STEP_MS / 1000:.1f} s")
+    for kind in (
+        SPAWNED,
+        DETECTED,
+        ENGAGED,
+        INTERCEPTED,
+        IMPACTED,
+        FUEL_EXHAUSTED,
+        OUT_OF_BOUNDS,
+    ):
+        print(f"  {kind}: {outcomes[kind]}")
+
+
+def main(args=None):
+    if args is None:
+        args = parse_args()
+    if args.fast_forward:
+        fast_forward(args)
+        return
 
-def main():
     clock = pygame.time.Clock()
     running = True
 
+    # Exports are drawn offscreen as fast as they can be encoded
+    exporter = None
+    screen = bootstrap(headless=bool(args.export))
+    if args.export:
+        exporter = FrameExporter(args.export, (WIDTH, HEIGHT), args.export_fps)
+        export_frames = round(args.duration * args.export_fps)
+    else:
+        FONTS.warm()  # Fonts load while the rest of the world is set up
+
     # Initialize game objects
-    base = DefenseBase(220, HEIGHT - 150)
-    missiles = []
-    interceptors = []
-    explosions = []
-    equations = []
+    engine = DefenseEngine(
+        base_positions=spread_bases(args.bases, args.world), world_size=args.world
+    )
+    world_width, world_height = args.world
+    # The world is shown in the playfield between the HUD panels
+    playfield = playfield_rect(screen.get_rect(), [LEFT_PANEL, RIGHT_PANEL])
+    camera = Camera(world_width, world_height, *playfield.size, *playfield.topleft)
+    camera.fit()
+    base = engine.base
+    explosions = engine.explosions
     metrics = SystemMetrics()
     radar = ThreatRadar(130, 150, 80)
+    terrain = generate_terrain(world_width, world_height, world_height - 100)
+
+    # Subscribe HUD and effects to engine outcomes
+    metrics.subscribe(engine.events)
+
+    def on_detected(events):
+        # Add radar blips
+        for event in events:
+            angle = math.degrees(math.atan2(event.y - base.y, event.x - base.x))
+            distance = (
+                math.sqrt((event.x - base.x) ** 2 + (event.y - base.y) ** 2) / 600
+            )
+            radar.add_blip(
+                event.track_id, event.threat_type, angle, min(0.95, distance)
+            )
+
+    def on_intercepted(events):
+        for event in events:
+            explosions.append(EnhancedExplosion(event.x, event.y, 1.0))
+
+    def on_impacted(events):
+        for event in events:
+            if event.is_hostile:
+                explosions.append(EnhancedExplosion(event.x, event.y, 1.5))
 
-    # Game state
-    auto_mode = True
-    threat_level = 1
-    last_missile_time = 0
-    missile_intervals = [4000, 2000, 1000]  # ms for Low, Medium, High
-    terrain = generate_terrain(WIDTH, HEIGHT, HEIGHT - 100)
+    engine.events.subscribe(DETECTED, on_detected)
+    engine.events.subscribe(INTERCEPTED, on_intercepted)
+    engine.events.subscribe(IMPACTED, on_impacted)
+
+    telemetry = None
+    if args.telemetry:
+        telemetry = TelemetrySink(
+            args.telemetry, args.telemetry_format, compress=args.telemetry_compress
+        )
 
-    # Initialize equations
-    for i in range(5):
-        equations.append(PhysicsEquation(WIDTH // 2 + 50, 100 + i * 130))
+    feed = None
+    if args.ingest_port:
+        feed = TrackFeedServer(args.ingest_host, args.ingest_port)
+        feed.start()
+        engine.auto_mode = False
+
+    if args.raid:
+        engine.raids.load(load_raid_plan(args.raid), start=ticks())
+        engine.auto_mode = False
+    if args.scenario:
+        engine.raids.stream(
+            read_scenario(args.scenario, args.scenario_format, world_size=args.world),
+            start=ticks(),
+        )
+        engine.auto_mode = False
+
+    broadcast = None
+    if args.broadcast_port:
+        broadcast = StateBroadcastServer(args.broadcast_host, args.broadcast_port)
+        broadcast.start()
+
+    # Only the simulation touches the engine; the loop below draws snapshots
+    simulation = Simulation(engine, radar, metrics, PhysicsEngine())
+    if feed:
+        simulation.before_step.append(lambda now: engine.ingest(feed.drain()))
+    if telemetry or broadcast:
+
+        def record(now):
+            tracks = engine.missiles + engine.interceptors
+            if telemetry:
+                telemetry.record(engine.step_count, now, tracks)
+            if broadcast:
+                broadcast.publish(engine.step_count, tracks, explosions, metrics)
+
+        simulation.after_step.append(record)
+    next_step = ticks()
+    simulation.tick(next_step)
+    export_start = next_step
+    if not (args.lockstep or exporter):
+        simulation.start()
+
+    # Retained HUD widgets, laid out once and re-rendered only on change
+    left_panel = Panel(
+        LEFT_PANEL, "SUCCEDRA DEFENSE SYSTEM", "Advanced Algorithmic Missile Defense"
+    )
+    right_panel = Panel(
+        RIGHT_PANEL, "COMPUTATIONAL PHYSICS ENGINE", "Real-time Trajectory Analysis"
+    )
+
+    # One slot per equation the physics engine solves each step
+    right_x, right_y, right_width, _ = right_panel.area
+    equations = [
+        PhysicsEquation(right_x, right_y + 15 + i * 130, equation_data, right_width)
+        for i, equation_data in enumerate(PHYSICS_EQUATIONS)
+    ]
+    throughput_line = StatusLine((right_x + 15, right_y + 665))
+    solved_step = 0
+    left_x, _, left_width, _ = left_panel.area
+    threat_summary = StatusLine((left_x, 250), "header")
+    threat_counts = [StatusLine((left_x + 25, 290 + i * 25)) for i in range(3)]
+    queue_x = left_x + 190
+    queue_title = StatusLine((queue_x, 270))
+    queue_rows = [StatusLine((queue_x, 292 + i * 14), "tiny") for i in range(5)]
+
+    metrics_start_y = 380
+    half_width = left_width // 2 - 5
+    targets_gauge = MetricGauge(
+        (left_x, metrics_start_y, left_width, 45), "Active Targets", "", (5, 15)
+    )
+    cpu_gauge = MetricGauge(
+        (left_x, metrics_start_y + 55, left_width, 45), "CPU Usage", "%", (60, 80)
+    )
+    gpu_gauge = MetricGauge(
+        (left_x, metrics_start_y + 110, left_width, 45), "GPU Processing", "%", (60, 80)
+    )
+    solved_gauge = MetricGauge(
+        (left_x, metrics_start_y + 165, left_width, 45), "Equations Solved"
+    )
+    speed_gauge = MetricGauge(
+        (left_x, metrics_start_y + 220, left_width, 45),
+        "Processing Speed",
+        "%",
+        (40, 70),
+    )
+    intercepted_gauge = MetricGauge(
+        (left_x, metrics_start_y + 275, half_width, 45), "Intercepted"
+    )
+    evaded_gauge = MetricGauge(
+        (left_x + left_width // 2 + 5, metrics_start_y + 275, half_width, 45),
+        "Evaded",
+        "",
+        (5, 10),
+    )
+
+    # Control buttons: AUTO, then LOW and MED beside it and HIGH below
+    button_y = metrics_start_y + 330
+    button_width = left_width // 3 - 10
+    auto_button = Button((left_x, button_y, button_width, 35), "AUTO")
+    threat_buttons = [
+        Button((left_x + button_width + 15, button_y, button_width, 35), "LOW"),
+        Button((left_x + 2 * button_width + 25, button_y, button_width, 35), "MED"),
+        Button((left_x, button_y + 45, button_width, 35), "HIGH"),
+    ]
+    status_lines = [StatusLine((left_x, button_y + 90 + i * 22)) for i in range(6)]
+
+    fps_line = StatusLine((WIDTH - 100, HEIGHT - 30))
+    culled_line = StatusLine((WIDTH - 230, HEIGHT - 30))
+    instruction_lines = [
+        StatusLine((20, HEIGHT - 156 + i * 16), "small" if i == 0 else "tiny")
+        for i in range(6)
+    ]
 
     # Performance tracking
     frame_count = 0
@@ -64,165 +391,73 @@ def main():
     last_terrain_update = 0
 
     while running:
-        current_time = pygame.time.get_ticks()
-
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and not auto_mode:
-                    # Manual missile launch
-                    start_x = random.randint(100, WIDTH - 400)
-                    start_y = random.randint(50, 200)
-                    velocity = random.randint(500, 3500)
-                    altitude = random.randint(500, 15000)
-                    threat_type = classify_threat(velocity, altitude)
-                    missiles.append(
-                        get_missile(start_x, start_y, base.x, base.y, True, threat_type)
-                    )
-                    metrics.total_threats += 1
-                elif event.key == pygame.K_a:
-                    auto_mode = not auto_mode
-                elif event.key == pygame.K_1:
-                    threat_level = 0
-                elif event.key == pygame.K_2:
-                    threat_level = 1
-                elif event.key == pygame.K_3:
-                    threat_level = 2
-                elif event.key == pygame.K_ESCAPE:
+        if exporter:
+            # Frames sample simulated time, whatever the step rate
+            current_time = export_start + round(exporter.frame_time())
+        else:
+            current_time = ticks()
+
+        # Handle input; headless runs have no window to take it from
+        if not exporter:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     running = False
-
-        # Auto missile launch
-        if (
-            auto_mode
-            and current_time - last_missile_time > missile_intervals[threat_level]
-        ):
-            last_missile_time = current_time
-
-            # Launch primary missile
-            start_x = random.randint(100, WIDTH - 400)
-            start_y = random.randint(50, 250)
-            velocity = random.randint(500, 3500)
-            altitude = random.randint(500, 15000)
-            threat_type = classify_threat(velocity, altitude)
-            missiles.append(
-                get_missile(start_x, start_y, base.x, base.y, True, threat_type)
-            )
-            metrics.total_threats += 1
-
-            # Launch additional missiles based on threat level
-            additional_missiles = threat_level
-            for _ in range(additional_missiles):
-                if random.random() < 0.4:
-                    start_x = random.randint(100, WIDTH - 400)
-                    start_y = random.randint(50, 250)
-                    velocity = random.randint(500, 3500)
-                    altitude = random.randint(500, 15000)
-                    threat_type = classify_threat(velocity, altitude)
-                    missiles.append(
-                        get_missile(start_x, start_y, base.x, base.y, True, threat_type)
-                    )
-                    metrics.total_threats += 1
-
-        # Launch interceptors
-        for missile in missiles[:]:
-            if missile.active and missile.is_hostile:
-                # Check if interceptor already exists for this missile
-                has_interceptor = any(
-                    not interceptor.is_hostile
-                    and abs(interceptor.target_x - missile.x) < 50
-                    and abs(interceptor.target_y - missile.y) < 50
-                    for interceptor in interceptors
-                )
-
-                if not has_interceptor and missile.threat_type == "missile":
-                    # Calculate intercept point
-                    intercept_x, intercept_y = calculate_intercept_point(
-                        base.x, base.y, missile, 4.0
-                    )
-                    interceptors.append(
-                        get_missile(base.x, base.y, intercept_x, intercept_y, False)
-                    )
-
-                    # Add radar blip
-                    angle = math.degrees(
-                        math.atan2(missile.y - base.y, missile.x - base.x)
-                    )
-                    distance = (
-                        math.sqrt((missile.x - base.x) ** 2 + (missile.y - base.y) ** 2)
-                        / 600
-                    )
-                    radar.add_blip(missile.threat_type, angle, min(0.95, distance))
-
-        # Update game objects
-        base.update()
-        radar.update()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        # Manual missile launch
+                        simulation.submit(manual_launch)
+                    elif event.key == pygame.K_a:
+                        simulation.submit(toggle_auto_mode)
+                    elif event.key == pygame.K_1:
+                        simulation.submit(set_threat_level(0))
+                    elif event.key == pygame.K_2:
+                        simulation.submit(set_threat_level(1))
+                    elif event.key == pygame.K_3:
+                        simulation.submit(set_threat_level(2))
+                    elif event.key == pygame.K_HOME:
+                        camera.fit()
+                    elif event.key == pygame.K_ESCAPE:
+                        running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    # Click the HUD buttons
+                    if auto_button.hit(event.pos):
+                        simulation.submit(toggle_auto_mode)
+                    for level, button in enumerate(threat_buttons):
+                        if button.hit(event.pos):
+                            simulation.submit(set_threat_level(level))
+                elif event.type == pygame.MOUSEWHEEL:
+                    camera.zoom_at(ZOOM_STEP**event.y, *pygame.mouse.get_pos())
+
+            # Pan while arrow keys are held
+            keys = pygame.key.get_pressed()
+            pan_x = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+            pan_y = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+            if pan_x or pan_y:
+                camera.pan(pan_x * PAN_SPEED, pan_y * PAN_SPEED)
+
+        # Advance the simulation, or pick up the newest step it has published
+        simulation.view = camera.view_rect(CULL_MARGIN, playfield)
+        if exporter:
+            while next_step + STEP_MS <= current_time:
+                next_step += STEP_MS
+                simulation.tick(next_step)
+        elif args.lockstep:
+            simulation.tick(current_time)
+        snapshot = simulation.latest()
 
         # Update terrain occasionally
         if current_time - last_terrain_update > 5000:
-            terrain = generate_terrain(WIDTH, HEIGHT, HEIGHT - 100)
+            terrain = generate_terrain(world_width, world_height, world_height - 100)
             last_terrain_update = current_time
 
-        # Update missiles
-        for missile in missiles[:]:
-            if missile.update():
-                missiles.remove(missile)
-                explosions.append(EnhancedExplosion(base.x, base.y, 1.5))
-                metrics.missiles_evaded += 1
-                recycle_missile(missile)
-
-        # Update interceptors and check collisions
-        for interceptor in interceptors[:]:
-            interceptor.update()
-
-            # Check missile collisions
-            for missile in missiles[:]:
-                if missile.active and missile.is_hostile and interceptor.active:
-                    dist = math.sqrt(
-                        (missile.x - interceptor.x) ** 2
-                        + (missile.y - interceptor.y) ** 2
-                    )
-                    if dist < 30:
-                        explosion_x = (missile.x + interceptor.x) / 2
-                        explosion_y = (missile.y + interceptor.y) / 2
-                        explosions.append(
-                            EnhancedExplosion(explosion_x, explosion_y, 1.0)
-                        )
-
-                        missile.active = False
-                        interceptor.active = False
-                        metrics.missiles_intercepted += 1
-
-                        # Remove missiles
-                        missiles.remove(missile)
-                        interceptors.remove(interceptor)
-                        recycle_missile(missile)
-                        recycle_missile(interceptor)
-                        break
-
-            if not interceptor.active and interceptor in interceptors:
-                interceptors.remove(interceptor)
-                recycle_missile(interceptor)
-
-        # Update explosions
-        for explosion in explosions[:]:
-            if explosion.update():
-                explosions.remove(explosion)
-
-        # Update equations
-        equations_solved_this_frame = 0
-        for equation in equations[:]:
-            equation.update()
-            if equation.solved:
-                equations_solved_this_frame += 1
-                equations.remove(equation)
-                # Add new equation
-                new_y = 100 + len(equations) * 130
-                equations.append(PhysicsEquation(WIDTH // 2 + 50, new_y))
+        # Every step solves each equation for the whole batch of hostiles
+        equations_solved_this_frame = len(equations) * (snapshot.step - solved_step)
+        solved_step = snapshot.step
 
         # Update metrics
-        metrics.update(len(missiles), len(equations), equations_solved_this_frame)
+        metrics.update(
+            snapshot.hostile_count, len(equations), equations_solved_this_frame
+        )
 
         # Clear screen with enhanced background
         screen.fill(COLORS["background"])
@@ -237,282 +472,198 @@ def main():
             pygame.draw.line(screen, COLORS["grid"], (0, y), (WIDTH, y), 1)
 
         # Draw terrain
-        terrain_points = [(0, HEIGHT)] + terrain + [(WIDTH, HEIGHT)]
+        screen.set_clip(playfield)
+        terrain_points = [
+            camera.to_screen(x, y)
+            for x, y in [(0, world_height)] + terrain + [(world_width, world_height)]
+        ]
         pygame.draw.polygon(screen, COLORS["terrain"], terrain_points)
 
         # Draw terrain details
-        for i in range(0, len(terrain) - 1, 3):
-            x, y = terrain[i]
+        for i in range(1, len(terrain_points) - 2, 3):
+            x, y = terrain_points[i]
             pygame.draw.line(screen, (20, 90, 40), (x, y), (x, y - 10), 1)
+        screen.set_clip(None)
 
         # Draw main UI panels
-        left_panel_area = draw_enhanced_panel(
-            screen,
-            20,
-            20,
-            420,
-            HEIGHT - 40,
-            "SUCCEDRA DEFENSE SYSTEM",
-            "Advanced Algorithmic Missile Defense",
-        )
+        left_panel.draw(screen)
+        right_panel.draw(screen)
 
-        right_panel_area = draw_enhanced_panel(
+        # Draw radar in left panel
+        blips = snapshot.blips
+        radar.draw(
             screen,
-            WIDTH - 520,
-            20,
-            500,
-            HEIGHT - 40,
-            "COMPUTATIONAL PHYSICS ENGINE",
-            "Real-time Trajectory Analysis",
+            snapshot.sweep_angle,
+            (blips["threat"], blips["angle"], blips["distance"]),
         )
 
-        # Draw radar in left panel
-        radar.draw(screen)
-
         # Draw threat summary
-        threat_text = FONTS["header"].render("THREAT SUMMARY", True, COLORS["accent"])
-        screen.blit(threat_text, (left_panel_area[0], 250))
+        threat_summary.draw(screen, "THREAT SUMMARY", COLORS["accent"])
 
         # Draw threat type indicators
-        pygame.draw.rect(screen, COLORS["hostile"], (left_panel_area[0], 290, 15, 15))
-        missile_text = FONTS["small"].render(
-            f"Missiles: {sum(1 for m in missiles if m.threat_type=='missile')}",
-            True,
-            COLORS["text_primary"],
-        )
-        screen.blit(missile_text, (left_panel_area[0] + 25, 290))
-
-        pygame.draw.rect(screen, COLORS["drone"], (left_panel_area[0], 315, 15, 15))
-        drone_text = FONTS["small"].render(
-            f"Drones: {sum(1 for m in missiles if m.threat_type=='drone')}",
-            True,
-            COLORS["text_primary"],
-        )
-        screen.blit(drone_text, (left_panel_area[0] + 25, 315))
+        for i, (threat_type, label) in enumerate(
+            zip(THREAT_TYPES, ["Missiles", "Drones", "Aircraft"])
+        ):
+            color, _ = track_style(threat_type, True)
+            pygame.draw.rect(screen, color, (left_x, 290 + i * 25, 15, 15))
+            threat_counts[i].draw(
+                screen, f"{label}: {snapshot.count(HOSTILE, threat_type)}"
+            )
 
-        pygame.draw.rect(screen, COLORS["aircraft"], (left_panel_area[0], 340, 15, 15))
-        aircraft_text = FONTS["small"].render(
-            f"Aircraft: {sum(1 for m in missiles if m.threat_type=='aircraft')}",
-            True,
-            COLORS["text_primary"],
-        )
-        screen.blit(aircraft_text, (left_panel_area[0] + 25, 340))
+        # Draw the most imminent threats, soonest predicted impact first
+        queue_title.draw(screen, "TIME TO IMPACT", COLORS["accent"])
+        for row, (frames_left, threat_type, track_id) in zip(
+            queue_rows, snapshot.threats
+        ):
+            eta = f"{frames_left / 60:.1f}s" if frames_left != math.inf else "--"
+            row.draw(
+                screen,
+                f"{eta}  {threat_type.upper()} #{track_id}",
+                track_style(threat_type, True)[0],
+            )
 
         # Draw system metrics
-        metrics_start_y = 380
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y,
-            left_panel_area[2],
-            45,
-            "Active Targets",
-            len(missiles),
-            20,
-            "",
-            (5, 15),
-        )
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y + 55,
-            left_panel_area[2],
-            45,
-            "CPU Usage",
-            metrics.cpu_usage,
-            100,
-            "%",
-            (60, 80),
-        )
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y + 110,
-            left_panel_area[2],
-            45,
-            "GPU Processing",
-            metrics.gpu_usage,
-            100,
-            "%",
-            (60, 80),
-        )
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y + 165,
-            left_panel_area[2],
-            45,
-            "Equations Solved",
-            metrics.equations_solved,
-            1000,
-            "",
-            None,
-        )
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y + 220,
-            left_panel_area[2],
-            45,
-            "Processing Speed",
-            metrics.processing_speed,
-            100,
-            "%",
-            (40, 70),
-        )
+        targets_gauge.draw(screen, snapshot.hostile_count, 20)
+        cpu_gauge.draw(screen, metrics.cpu_usage, 100)
+        gpu_gauge.draw(screen, metrics.gpu_usage, 100)
+        solved_gauge.draw(screen, metrics.equations_solved, 1000)
+        speed_gauge.draw(screen, metrics.processing_speed, 100)
 
         # Draw defense stats
-        draw_metric_display(
-            screen,
-            left_panel_area[0],
-            metrics_start_y + 275,
-            left_panel_area[2] // 2 - 5,
-            45,
-            "Intercepted",
-            metrics.missiles_intercepted,
-            metrics.total_threats,
-            "",
-            None,
-        )
-
-        draw_metric_display(
-            screen,
-            left_panel_area[0] + left_panel_area[2] // 2 + 5,
-            metrics_start_y + 275,
-            left_panel_area[2] // 2 - 5,
-            45,
-            "Evaded",
-            metrics.missiles_evaded,
-            metrics.total_threats,
-            "",
-            (5, 10),
-        )
+        intercepted_gauge.draw(screen, snapshot.intercepted, snapshot.total_threats)
+        evaded_gauge.draw(screen, snapshot.evaded, snapshot.total_threats)
 
         # Draw control buttons
-        button_y = metrics_start_y + 330
-        button_width = left_panel_area[2] // 3 - 10
-
-        auto_button = draw_enhanced_button(
+        auto_button.draw(
             screen,
-            left_panel_area[0],
-            button_y,
-            button_width,
-            35,
-            "AUTO",
-            auto_mode,
-            "success" if auto_mode else "default",
-        )
-
-        threat_colors = ["success", "warning", "danger"]
-        threat_labels = ["LOW", "MED", "HIGH"]
-        for i in range(3):
-            button_x = left_panel_area[0] + (i + 1) * (button_width + 10)
-            if i < 2:  # Only show LOW and MED buttons if we have space
-                button_x = (
-                    left_panel_area[0] + button_width + 15 + i * (button_width + 10)
-                )
-                threat_button = draw_enhanced_button(
-                    screen,
-                    button_x,
-                    button_y,
-                    button_width,
-                    35,
-                    threat_labels[i],
-                    threat_level == i,
-                    threat_colors[i],
-                )
-
-        # Draw HIGH threat button on next row
-        high_button = draw_enhanced_button(
-            screen,
-            left_panel_area[0],
-            button_y + 45,
-            button_width,
-            35,
-            "HIGH",
-            threat_level == 2,
-            "danger",
+            snapshot.auto_mode,
+            "success" if snapshot.auto_mode else "default",
         )
+        for level, (button, color_scheme) in enumerate(
+            zip(threat_buttons, ["success", "warning", "danger"])
+        ):
+            button.draw(screen, snapshot.threat_level == level, color_scheme)
 
         # Draw status information
-        status_y = button_y + 90
         status_texts = [
-            f"Threat Level: {['LOW', 'MEDIUM', 'HIGH'][threat_level]}",
-            f"Active Missiles: {len([m for m in missiles if m.active and m.threat_type=='missile'])}",
-            f"Active Drones: {len([m for m in missiles if m.active and m.threat_type=='drone'])}",
-            f"Interceptors: {len([i for i in interceptors if i.active])}",
-            f"Defense Mode: {'AUTOMATIC' if auto_mode else 'MANUAL'}",
-            f"System Status: {'OPERATIONAL' if len(missiles) < 15 else 'OVERLOADED'}",
+            f"Threat Level: {['LOW', 'MEDIUM', 'HIGH'][snapshot.threat_level]}",
+            f"Active Missiles: {snapshot.count(HOSTILE, 'missile', True)}",
+            f"Active Drones: {snapshot.count(HOSTILE, 'drone', True)}",
+            f"Interceptors: {snapshot.count(FRIENDLY, active=True)}",
+            f"Defense Mode: {'AUTOMATIC' if snapshot.auto_mode else 'MANUAL'}",
+            f"System Status: {'OPERATIONAL' if snapshot.hostile_count < 15 else 'OVERLOADED'}",
         ]
 
-        for i, text in enumerate(status_texts):
+        for line, text in zip(status_lines, status_texts):
             color = COLORS["text_primary"]
             if "OVERLOADED" in text:
                 color = COLORS["danger"]
             elif "OPERATIONAL" in text:
                 color = COLORS["success"]
-
-            status_surf = FONTS["small"].render(text, True, color)
-            screen.blit(status_surf, (left_panel_area[0], status_y + i * 22))
+            line.draw(screen, text, color)
 
         # Draw physics equations in right panel
         for equation in equations:
-            equation.draw(screen)
-
-        # Draw game objects
-        base.draw(screen)
-
-        # Draw missiles and interceptors
-        for missile in missiles:
-            missile.draw(screen)
+            equation.draw(screen, snapshot.physics)
+        if snapshot.physics:
+            throughput_line.draw(
+                screen,
+                f"Batch throughput: {snapshot.physics.rate / 1e6:.2f} M solutions/s, "
+                f"{snapshot.physics.total} solved",
+                COLORS["text_secondary"],
+            )
 
-        for interceptor in interceptors:
-            interceptor.draw(screen)
+        # Draw game objects, clipped to the playfield the panels leave open
+        screen.set_clip(playfield)
+        culled_draws = 0
+        bases = snapshot.bases
+        shown = camera.inside(bases["x"], bases["y"], 60, playfield)
+        culled_draws += len(bases) - int(shown.sum())
+        for x, y, radius, radar_angle, magazine, capacity in bases[shown].tolist():
+            x, y = camera.to_screen(x, y)
+            draw_base(screen, x, y, radius, radar_angle, magazine, capacity)
+
+        # Draw exhaust, debris and base activity particles in view
+        particles = snapshot.particles
+        shown = camera.inside(particles["x"], particles["y"], 10, playfield)
+        culled_draws += len(particles) - int(shown.sum())
+        particles = particles[shown]
+        xs, ys = camera.to_screen(particles["x"], particles["y"])
+        for x, y, size, alpha, color in zip(
+            xs.tolist(),
+            ys.tolist(),
+            particles["size"].tolist(),
+            particles["alpha"].tolist(),
+            particles["color"].tolist(),
+        ):
+            draw_particle(screen, x, y, size, color, alpha)
+
+        # Only tracks in view are drawn
+        tracks = snapshot.tracks
+        shown = camera.inside(tracks["x"], tracks["y"], CULL_MARGIN, playfield)
+        culled_draws += len(tracks) - int(shown.sum())
+        visible_tracks = tracks[shown & tracks["active"]]
+        visible_trails = snapshot.trails[shown & tracks["active"]]
+        for track, trail in zip(visible_tracks, visible_trails):
+            color, size = track_style(THREAT_TYPES[track["threat"]], track["hostile"])
+            draw_trail(screen, trail[: track["trail_length"]].tolist(), color, camera)
+            x, y = camera.to_screen(float(track["x"]), float(track["y"]))
+            draw_track(
+                screen,
+                x,
+                y,
+                float(track["vx"]),
+                float(track["vy"]),
+                THREAT_TYPES[track["threat"]],
+                color,
+                size,
+                None if track["hostile"] else float(track["fuel"]),
+            )
 
         # Draw explosions
-        for explosion in explosions:
-            explosion.draw(screen)
+        blasts = snapshot.explosions
+        shown = camera.inside(blasts["x"], blasts["y"], 200, playfield)
+        culled_draws += len(blasts) - int(shown.sum())
+        for x, y, radius, max_radius in blasts[shown].tolist():
+            x, y = camera.to_screen(x, y)
+            draw_shockwave(screen, x, y, radius, max_radius)
 
         # Draw radar sweep lines from base to missiles
-        for missile in missiles:
-            if missile.active and missile.is_hostile:
-                # Draw tracking line
-                pygame.draw.line(
-                    screen,
-                    COLORS["accent"],
-                    (base.x, base.y),
-                    (missile.x, missile.y),
-                    1,
-                )
+        base_x, base_y = camera.to_screen(base.x, base.y)
+        for missile in visible_tracks[visible_tracks["hostile"]]:
+            x, y = camera.to_screen(float(missile["x"]), float(missile["y"]))
 
-                # Draw missile info
-                info_texts = [
-                    f"{missile.threat_type.upper()}",
-                    f"M:{missile.mass}kg",
-                    f"V:{missile.velocity}m/s",
-                    f"A:{missile.altitude}m",
-                ]
+            # Draw tracking line
+            pygame.draw.line(
+                screen,
+                COLORS["accent"],
+                (base_x, base_y),
+                (x, y),
+                1,
+            )
 
-                for i, info_text in enumerate(info_texts):
-                    info_surf = FONTS["tiny"].render(
-                        info_text, True, COLORS["text_secondary"]
-                    )
-                    screen.blit(info_surf, (missile.x + 15, missile.y - 30 + i * 12))
+            # Draw missile info
+            info_texts = [
+                f"{THREAT_TYPES[missile['threat']].upper()}",
+                f"M:{missile['mass']}kg",
+                f"V:{missile['velocity']}m/s",
+                f"A:{missile['altitude']}m",
+            ]
+
+            for i, info_text in enumerate(info_texts):
+                info_surf = FONTS["tiny"].render(
+                    info_text, True, COLORS["text_secondary"]
+                )
+                screen.blit(info_surf, (x + 15, y - 30 + i * 12))
+        screen.set_clip(None)
 
         # Draw performance info
         frame_count += 1
         if frame_count % 30 == 0:  # Update every 30 frames
             fps_display = int(clock.get_fps())
 
-        fps_text = FONTS["small"].render(
-            f"FPS: {fps_display}", True, COLORS["text_secondary"]
-        )
-        screen.blit(fps_text, (WIDTH - 100, HEIGHT - 30))
+        fps_line.draw(screen, f"FPS: {fps_display}", COLORS["text_secondary"])
+        culled_line.draw(screen, f"Culled: {culled_draws}", COLORS["text_secondary"])
 
         # Draw instructions
         instructions = [
@@ -520,18 +671,16 @@ def main():
             "A - Toggle Auto Mode",
             "1/2/3 - Threat Levels",
             "SPACE - Manual Launch",
+            "ARROWS/WHEEL - Pan/Zoom, HOME - Fit",
             "ESC - Exit",
         ]
 
-        instruction_y = HEIGHT - 140
-        for i, instruction in enumerate(instructions):
+        for i, (line, instruction) in enumerate(zip(instruction_lines, instructions)):
             color = COLORS["accent"] if i == 0 else COLORS["text_secondary"]
-            font = FONTS["small"] if i == 0 else FONTS["tiny"]
-            inst_surf = font.render(instruction, True, color)
-            screen.blit(inst_surf, (20, instruction_y + i * 16))
+            line.draw(screen, instruction, color)
 
         # Draw alert messages
-        if len(missiles) > 10:
+        if snapshot.hostile_count > 10:
             alert_text = "⚠ CRITICAL: Multiple Incoming Threats!"
             alert_surf = FONTS["header"].render(alert_text, True, COLORS["danger"])
             alert_rect = alert_surf.get_rect(center=(WIDTH // 2, 50))
@@ -550,7 +699,7 @@ def main():
             )
             screen.blit(alert_surf, alert_rect)
 
-        elif len(missiles) > 5:
+        elif snapshot.hostile_count > 5:
             warning_text = "⚡ WARNING: High Threat Activity"
             warning_surf = FONTS["main"].render(warning_text, True, COLORS["warning"])
             warning_rect = warning_surf.get_rect(center=(WIDTH // 2, 50))
@@ -568,10 +717,25 @@ def main():
         )
 
         # Update display
-        pygame.display.flip()
-        clock.tick(60)
+        if exporter:
+            exporter.submit(screen)
+            clock.tick()
+            running = running and exporter.frames < export_frames
+        else:
+            pygame.display.flip()
+            clock.tick(60)
 
     # Cleanup
+    simulation.stop()
+    if exporter:
+        exporter.close()
+        print(f"Exported {exporter.frames} frames to {args.export}")
+    if feed:
+        feed.stop()
+    if broadcast:
+        broadcast.stop()
+    if telemetry:
+        telemetry.close()
     pygame.quit()
     sys.exit()
 
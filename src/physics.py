@@ -1,170 +1,141 @@
-import random
+import time
+from collections import namedtuple
+
+import numpy as np
 import pygame
 
-from config import COLORS, COMPUTATION_STAGES, PHYSICS_EQUATIONS
+from config import COLORS, PHYSICS_EQUATIONS
+from fonts import FONTS
+from ui import StatusLine
 
-FONTS = {
-    "title": pygame.font.SysFont("Arial", 32, bold=True),
-    "header": pygame.font.SysFont("Arial", 22, bold=True),
-    "main": pygame.font.SysFont("Arial", 18),
-    "equation": pygame.font.SysFont("Consolas", 16),
-    "small": pygame.font.SysFont("Arial", 14),
-    "tiny": pygame.font.SysFont("Arial", 12),
-}
+GRAVITY = 9.81  # m/s²
+INTERCEPTOR_CLIMB_SPEED = 1200  # m/s, launch speed of a vertical intercept
 
+# Min, mean and max of one quantity over a batch, and the time it took in s
+QuantityStats = namedtuple("QuantityStats", "low mean high elapsed")
+# One step's results: tracks solved, stats by quantity name, solutions so far
+# and solutions per second
+PhysicsResults = namedtuple("PhysicsResults", "count stats total rate")
 
-class PhysicsEquation:
-    def __init__(self, x, y, width=380, height=120):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.equation_data = random.choice(PHYSICS_EQUATIONS)
-        self.stage = 0
-        self.progress = 0
-        self.solved = False
-        self.stage_timer = 0
-        self.stage_duration = random.randint(45, 90)
-        self.computation_speed = random.uniform(0.8, 1.5)
-        self.start_time = pygame.time.get_ticks()
-        self.solution_steps = []
-        self.current_step = 0
-        self.generate_solution_steps()
-
-    def generate_solution_steps(self):
-        # Generate simulated solution steps
-        self.solution_steps = [
-            f"Analyzing: {self.equation_data['eq']}",
-            f"Context: {self.equation_data['context']}",
-            "Processing variables...",
-        ]
-
-        for var, val in self.equation_data["vars"].items():
-            self.solution_steps.append(f"Substituting: {var} = {val}")
-
-        self.solution_steps.append("Applying kinematic equations...")
-        self.solution_steps.append("Solving differential equations...")
-        self.solution_steps.append("Verifying with numerical methods...")
-        self.solution_steps.append(f"Result: {self.equation_data['solution']}")
-
-    def update(self):
-        if self.solved:
-            return
-
-        self.stage_timer += 1
-        self.progress = min(100, self.progress + self.computation_speed)
-
-        # Progress through solution steps
-        if self.progress > (self.current_step + 1) * (100 / len(self.solution_steps)):
-            self.current_step = min(len(self.solution_steps) - 1, self.current_step + 1)
-
-        if self.progress >= 100:
-            self.solved = True
-
-    def draw(self, surface):
-        # Draw main panel
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        pygame.draw.rect(surface, COLORS["panel_bg"], panel_rect, border_radius=8)
-        pygame.draw.rect(
-            surface, COLORS["panel_border"], panel_rect, 2, border_radius=8
-        )
 
-        # Draw equation
-        eq_text = FONTS["equation"].render(
-            f"{self.equation_data['eq']}", True, COLORS["text_primary"]
-        )
-        surface.blit(eq_text, (self.x + 15, self.y + 10))
+def kinetic_energy(mass, velocity, altitude, angle):
+    return 0.5 * mass * velocity * velocity
 
-        # Draw context
-        context_text = FONTS["small"].render(
-            f"{self.equation_data['context']}", True, COLORS["text_secondary"]
-        )
-        surface.blit(context_text, (self.x + 15, self.y + 32))
 
-        # Draw solution steps
-        if self.current_step < len(self.solution_steps):
-            step_text = self.solution_steps[self.current_step]
-            step_surf = FONTS["tiny"].render(
-                step_text,
-                True,
-                COLORS["solved"] if self.solved else COLORS["processing"],
-            )
-            surface.blit(step_surf, (self.x + 15, self.y + 52))
+def momentum(mass, velocity, altitude, angle):
+    return mass * velocity
 
-        # Draw progress bar
-        bar_rect = pygame.Rect(
-            self.x + 15, self.y + self.height - 20, self.width - 30, 12
-        )
-        pygame.draw.rect(surface, (30, 40, 60), bar_rect, border_radius=6)
 
-        progress_width = (self.width - 30) * (self.progress / 100)
-        progress_rect = pygame.Rect(
-            self.x + 15, self.y + self.height - 20, progress_width, 12
-        )
-        progress_color = COLORS["solved"] if self.solved else COLORS["processing"]
-        pygame.draw.rect(surface, progress_color, progress_rect, border_radius=6)
-
-        # Draw status
-        status_text = FONTS["small"].render(
-            "SOLVED" if self.solved else f"Stage: {COMPUTATION_STAGES[self.stage]}",
-            True,
-            COLORS["solved"] if self.solved else COLORS["processing"],
-        )
-        surface.blit(
-            status_text,
-            (self.x + self.width - status_text.get_width() - 15, self.y + 10),
-        )
+def intercept_time(mass, velocity, altitude, angle):
+    """Time for an interceptor climbing at INTERCEPTOR_CLIMB_SPEED to reach
+    altitude under gravity; nan where it never does"""
+    u = INTERCEPTOR_CLIMB_SPEED
+    reach = u * u - 2 * GRAVITY * altitude
+    with np.errstate(invalid="ignore"):
+        return np.where(reach >= 0, (u - np.sqrt(reach)) / GRAVITY, np.nan)
+
+
+def ballistic_range(mass, velocity, altitude, angle):
+    return velocity * velocity * np.sin(2 * angle) / GRAVITY
+
+
+def max_height(mass, velocity, altitude, angle):
+    climb = velocity * np.sin(angle)
+    return climb * climb / (2 * GRAVITY)
+
+
+QUANTITIES = {
+    "energy": kinetic_energy,
+    "momentum": momentum,
+    "intercept_time": intercept_time,
+    "range": ballistic_range,
+    "max_height": max_height,
+}
+
+
+class PhysicsEngine:
+    """Solves the PHYSICS_EQUATIONS quantities for every live hostile
+
+    Each quantity is one NumPy expression over the whole batch of tracks,
+    read from a snapshot's track records, and is timed on its own so the
+    panel can show the throughput actually achieved.
+    """
+
+    def __init__(self, equations=PHYSICS_EQUATIONS):
+        self.quantities = [equation["quantity"] for equation in equations]
+        self.total = 0
+        self.rate = 0.0
+
+    def solve(self, tracks):
+        """Solve every quantity for the live hostiles among tracks"""
+        live = tracks[tracks["hostile"] & tracks["active"]]
+        mass = live["mass"].astype(np.float64)
+        velocity = live["velocity"].astype(np.float64)
+        altitude = live["altitude"].astype(np.float64)
+        # Flight path angle above the horizontal, whichever way it flies
+        angle = np.arctan2(np.abs(live["vy"]), np.abs(live["vx"])).astype(np.float64)
+
+        stats = {}
+        elapsed = 0.0
+        for name in self.quantities:
+            start = time.perf_counter()
+            values = QUANTITIES[name](mass, velocity, altitude, angle)
+            solved = values[~np.isnan(values)]
+            if len(solved):
+                low, mean, high = solved.min(), solved.mean(), solved.max()
+            else:
+                low = mean = high = np.nan
+            took = time.perf_counter() - start
+            stats[name] = QuantityStats(float(low), float(mean), float(high), took)
+            elapsed += took
+
+        solutions = len(live) * len(self.quantities)
+        self.total += solutions
+        if solutions and elapsed > 0:
+            # Smoothed, since single batches take microseconds
+            self.rate += 0.1 * (solutions / elapsed - self.rate)
+        return PhysicsResults(len(live), stats, self.total, self.rate)
+
+
+def format_si(value, unit):
+    """value with an SI prefix, e.g. 10.4 GJ; -- if it is nan"""
+    if value != value:
+        return "--"
+    for prefix, scale in (("T", 1e12), ("G", 1e9), ("M", 1e6), ("k", 1e3)):
+        if abs(value) >= scale:
+            return f"{value / scale:.1f} {prefix}{unit}"
+    return f"{value:.1f} {unit}"
+
+
+TEXT_CACHE = {}
+
+
+def render_text(font, text, color):
+    """Render text once and reuse it, for strings that never change"""
+    key = (font, text, color)
+    text_surf = TEXT_CACHE.get(key)
+    if text_surf is None:
+        text_surf = TEXT_CACHE[key] = FONTS[font].render(text, True, color)
+    return text_surf
 
 
 class PhysicsEquation:
-    def __init__(self, x, y, width=380, height=120):
+    """A panel showing one equation's latest results across all hostiles
+
+    Panels are fixed slots, one per PHYSICS_EQUATIONS entry, created once
+    and redrawn from each step's results; nothing is recycled or reset.
+    """
+
+    def __init__(self, x, y, equation_data, width=380, height=120):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.equation_data = random.choice(PHYSICS_EQUATIONS)
-        self.stage = 0
-        self.progress = 0
-        self.solved = False
-        self.stage_timer = 0
-        self.stage_duration = random.randint(45, 90)
-        self.computation_speed = random.uniform(0.8, 1.5)
-        self.start_time = pygame.time.get_ticks()
-        self.solution_steps = []
-        self.current_step = 0
-        self.generate_solution_steps()
-
-    def generate_solution_steps(self):
-        # Generate simulated solution steps
-        self.solution_steps = [
-            f"Analyzing: {self.equation_data['eq']}",
-            f"Context: {self.equation_data['context']}",
-            "Processing variables...",
-        ]
-
-        for var, val in self.equation_data["vars"].items():
-            self.solution_steps.append(f"Substituting: {var} = {val}")
-
-        self.solution_steps.append("Applying kinematic equations...")
-        self.solution_steps.append("Solving differential equations...")
-        self.solution_steps.append("Verifying with numerical methods...")
-        self.solution_steps.append(f"Result: {self.equation_data['solution']}")
-
-    def update(self):
-        if self.solved:
-            return
-
-        self.stage_timer += 1
-        self.progress = min(100, self.progress + self.computation_speed)
-
-        # Progress through solution steps
-        if self.progress > (self.current_step + 1) * (100 / len(self.solution_steps)):
-            self.current_step = min(len(self.solution_steps) - 1, self.current_step + 1)
-
-        if self.progress >= 100:
-            self.solved = True
-
-    def draw(self, surface):
+        self.equation_data = equation_data
+        self.result_line = StatusLine((x + 15, y + 52), "tiny")
+        self.status_line = StatusLine((x + width - 15, y + 10), anchor="topright")
+
+    def draw(self, surface, results=None):
         # Draw main panel
         panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
         pygame.draw.rect(surface, COLORS["panel_bg"], panel_rect, border_radius=8)
@@ -172,48 +143,44 @@ class PhysicsEquation:
             surface, COLORS["panel_border"], panel_rect, 2, border_radius=8
         )
 
-        # Draw equation
-        eq_text = FONTS["equation"].render(
-            f"{self.equation_data['eq']}", True, COLORS["text_primary"]
+        # Draw equation and context
+        eq_text = render_text(
+            "equation", self.equation_data["eq"], COLORS["text_primary"]
         )
         surface.blit(eq_text, (self.x + 15, self.y + 10))
-
-        # Draw context
-        context_text = FONTS["small"].render(
-            f"{self.equation_data['context']}", True, COLORS["text_secondary"]
+        context_text = render_text(
+            "small", self.equation_data["context"], COLORS["text_secondary"]
         )
         surface.blit(context_text, (self.x + 15, self.y + 32))
 
-        # Draw solution steps
-        if self.current_step < len(self.solution_steps):
-            step_text = self.solution_steps[self.current_step]
-            step_surf = FONTS["tiny"].render(
-                step_text,
-                True,
-                COLORS["solved"] if self.solved else COLORS["processing"],
+        # Draw the latest results, re-rendered only when they change
+        stats = results.stats[self.equation_data["quantity"]] if results else None
+        solved = stats is not None and stats.high == stats.high
+        unit = self.equation_data["unit"]
+        if solved:
+            self.result_line.draw(
+                surface,
+                f"min {format_si(stats.low, unit)}   mean "
+                f"{format_si(stats.mean, unit)}   max {format_si(stats.high, unit)}",
+                COLORS["solved"],
+            )
+            self.status_line.draw(
+                surface,
+                f"{results.count} tracks in {stats.elapsed * 1e6:.0f} µs",
+                COLORS["solved"],
             )
-            surface.blit(step_surf, (self.x + 15, self.y + 52))
+        else:
+            self.result_line.draw(surface, "Awaiting tracks...", COLORS["processing"])
+            self.status_line.draw(surface, "IDLE", COLORS["processing"])
 
-        # Draw progress bar
+        # Draw the largest result against the equation's full scale
         bar_rect = pygame.Rect(
             self.x + 15, self.y + self.height - 20, self.width - 30, 12
         )
         pygame.draw.rect(surface, (30, 40, 60), bar_rect, border_radius=6)
-
-        progress_width = (self.width - 30) * (self.progress / 100)
-        progress_rect = pygame.Rect(
-            self.x + 15, self.y + self.height - 20, progress_width, 12
-        )
-        progress_color = COLORS["solved"] if self.solved else COLORS["processing"]
-        pygame.draw.rect(surface, progress_color, progress_rect, border_radius=6)
-
-        # Draw status
-        status_text = FONTS["small"].render(
-            "SOLVED" if self.solved else f"Stage: {COMPUTATION_STAGES[self.stage]}",
-            True,
-            COLORS["solved"] if self.solved else COLORS["processing"],
-        )
-        surface.blit(
-            status_text,
-            (self.x + self.width - status_text.get_width() - 15, self.y + 10),
-        )
+        if solved:
+            fill = min(1.0, max(0.0, stats.high / self.equation_data["scale"]))
+            progress_rect = pygame.Rect(
+                self.x + 15, self.y + self.height - 20, (self.width - 30) * fill, 12
+            )
+            pygame.draw.rect(surface, COLORS["solved"], progress_rect, border_radius=6)
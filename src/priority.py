@@ -0,0 +1,121 @@
+import heapq
+import itertools
+
+
+class ThreatQueue:
+    """Tracks ordered by a key such as predicted impact time
+
+    An indexed binary min-heap: position maps each track id to its slot, so
+    a key can be lowered or raised in place with a single sift instead of
+    re-sorting the queue. Ties go to the older (lower) track id.
+    """
+
+    def __init__(self):
+        self.heap = []  # [key, track_id, item] entries
+        self.position = {}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, track_id):
+        return track_id in self.position
+
+    def key(self, track_id):
+        """Current key of a track, or None if it is not queued"""
+        index = self.position.get(track_id)
+        return None if index is None else self.heap[index][0]
+
+    def push(self, track_id, item, key):
+        if track_id in self.position:
+            self.update(track_id, key)
+            return
+        self.heap.append([key, track_id, item])
+        self.position[track_id] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def update(self, track_id, key):
+        """Decrease or increase a queued track's key"""
+        index = self.position[track_id]
+        entry = self.heap[index]
+        old_key = entry[0]
+        entry[0] = key
+        if key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, track_id):
+        """Drop a track if it is queued"""
+        index = self.position.pop(track_id, None)
+        if index is None:
+            return
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.position[last[1]] = index
+            self._sift_down(index)
+            self._sift_up(index)
+
+    def peek(self):
+        """(key, item) of the most urgent track, or None"""
+        if not self.heap:
+            return None
+        key, _, item = self.heap[0]
+        return key, item
+
+    def pop(self):
+        entry = self.heap[0]
+        self.remove(entry[1])
+        return entry[0], entry[2]
+
+    def ordered(self):
+        """Yield (key, item) pairs in key order, without disturbing the heap
+
+        Walks the heap best-first from the root, so taking the first k
+        entries compares only those entries and their children, O(k log k)
+        however long the queue is.
+        """
+        heap = self.heap
+        frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+        while frontier:
+            _, _, index = heapq.heappop(frontier)
+            yield heap[index][0], heap[index][2]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    key, track_id, _ = heap[child]
+                    heapq.heappush(frontier, (key, track_id, child))
+
+    def smallest(self, count=None):
+        """Up to count (key, item) pairs in key order, without disturbing the heap"""
+        return list(itertools.islice(self.ordered(), count))
+
+    def _less(self, i, j):
+        a = self.heap[i]
+        b = self.heap[j]
+        return (a[0], a[1]) < (b[0], b[1])
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][1]] = i
+        self.position[heap[j][1]] = j
+
+    def _sift_up(self, index):
+        while index > 0:
+            parent = (index - 1) // 2
+            if not self._less(index, parent):
+                break
+            self._swap(index, parent)
+            index = parent
+
+    def _sift_down(self, index):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._less(child, smallest):
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
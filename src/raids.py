@@ -0,0 +1,294 @@
+import csv
+import gzip
+import heapq
+import itertools
+import json
+import os
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from config import THREAT_TYPES, WORLD_HEIGHT, WORLD_WIDTH
+
+# A scheduled launch: simulation time in ms, start position and threat class
+RaidSpawn = namedtuple("RaidSpawn", ["time", "x", "y", "threat_type"])
+
+SCENARIO_FORMATS = ["jsonl", "csv", "binary"]
+SCENARIO_EXTENSIONS = {".jsonl": "jsonl", ".csv": "csv", ".bin": "binary"}
+
+# On-disk record layout of binary scenarios, after the magic and dtype lines
+SCENARIO_DTYPE = np.dtype(
+    [("time", "<f8"), ("x", "<f4"), ("y", "<f4"), ("threat", "u1")]
+)
+SCENARIO_MAGIC = b"SUCRAID1\n"
+
+
+class RaidScheduler:
+    """Spawns kept on a binary heap ordered by the time they fall due
+
+    Loading a plan heapifies it in O(n) and each launch pops in O(log n), so
+    a step only pays for the spawns that are due. Spawns due at the same
+    time come out in the order they were scheduled. A time-ordered stream of
+    chunks can also be attached, and is pulled onto the heap only as far as
+    lookahead ms past the current time, so long scenarios use flat memory.
+    """
+
+    def __init__(self):
+        self.heap = []  # (time, order, spawn) entries
+        self.order = itertools.count()
+        self.source = None
+        self.source_start = 0
+        self.lookahead = 0
+        self.staged = None  # next chunk of the stream, not yet on the heap
+
+    def __len__(self):
+        """Spawns on the heap; streamed spawns not yet pulled are not counted"""
+        return len(self.heap)
+
+    def schedule(self, spawn):
+        heapq.heappush(self.heap, (spawn.time, next(self.order), spawn))
+
+    def load(self, spawns, start=0):
+        """Schedule many spawns at once, their times offset by start"""
+        for spawn in spawns:
+            spawn = spawn._replace(time=start + spawn.time)
+            self.heap.append((spawn.time, next(self.order), spawn))
+        heapq.heapify(self.heap)
+
+    def stream(self, chunks, start=0, lookahead=2000):
+        """Attach time-ordered chunks of spawns, such as read_scenario yields"""
+        self.source = iter(chunks)
+        self.source_start = start
+        self.lookahead = lookahead
+        self.staged = None
+
+    def _pull(self, horizon):
+        # Move streamed chunks onto the heap until one starts past horizon
+        while self.source is not None:
+            if self.staged is None:
+                self.staged = next(self.source, None)
+                if self.staged is None:
+                    self.source = None
+                    break
+                if not self.staged:
+                    self.staged = None
+                    continue
+            if self.source_start + self.staged[0].time > horizon:
+                break
+            self.load(self.staged, self.source_start)
+            self.staged = None
+
+    def next_time(self):
+        """Time of the earliest pending spawn, or None if the plan is done"""
+        if not self.heap:
+            self._pull(-np.inf)
+            if self.staged:
+                return self.source_start + self.staged[0].time
+        return self.heap[0][0] if self.heap else None
+
+    def due(self, now):
+        """Pop every spawn due at or before now, earliest first"""
+        self._pull(now + self.lookahead)
+        heap = self.heap
+        spawns = []
+        while heap and heap[0][0] <= now:
+            spawns.append(heapq.heappop(heap)[2])
+        return spawns
+
+
+def expand_salvos(salvos, seed=None):
+    """Individual spawns for a list of salvo descriptions
+
+    Each salvo is a dict with time (ms from the start of the plan), origin
+    [x, y] and optionally count launches spaced spacing ms apart, scattered
+    up to spread px around the origin, repeated repeat times every ms, with
+    classes drawn from mix, a {threat_type: weight} dict.
+    """
+    rng = random.Random(seed)
+    spawns = []
+    for salvo in salvos:
+        try:
+            time = float(salvo["time"])
+            origin_x, origin_y = (float(value) for value in salvo["origin"])
+            count = int(salvo.get("count", 1))
+            spacing = float(salvo.get("spacing", 0))
+            spread = float(salvo.get("spread", 0))
+            repeat = int(salvo.get("repeat", 1))
+            every = float(salvo.get("every", 0))
+            mix = salvo.get("mix", {"missile": 1})
+            types = list(mix)
+            weights = [float(mix[threat_type]) for threat_type in types]
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Malformed salvo: {salvo!r}") from exc
+        unknown = set(types) - set(THREAT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown threat types in salvo: {sorted(unknown)}")
+
+        for wave in range(repeat):
+            for launch in range(count):
+                spawns.append(
+                    RaidSpawn(
+                        time + wave * every + launch * spacing,
+                        origin_x + rng.uniform(-spread, spread),
+                        origin_y + rng.uniform(-spread, spread),
+                        rng.choices(types, weights)[0],
+                    )
+                )
+    return spawns
+
+
+def load_raid_plan(path):
+    """Read a JSON raid plan: {"seed": ..., "salvos": [...]} or a bare list"""
+    with open(path) as f:
+        plan = json.load(f)
+    if isinstance(plan, list):
+        plan = {"salvos": plan}
+    return expand_salvos(plan.get("salvos", []), plan.get("seed"))
+
+
+def scenario_format(path):
+    """Scenario format implied by a file name, ignoring a .gz suffix"""
+    root = path[:-3] if path.endswith(".gz") else path
+    fmt = SCENARIO_EXTENSIONS.get(os.path.splitext(root)[1])
+    if fmt is None:
+        raise ValueError(f"Cannot tell the scenario format of {path}")
+    return fmt
+
+
+def _open_scenario(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def write_scenario(path, spawns, fmt=None):
+    """Write time-ordered spawns as a jsonl, csv or binary scenario file"""
+    fmt = fmt or scenario_format(path)
+    if fmt == "binary":
+        with _open_scenario(path, "wb") as f:
+            f.write(SCENARIO_MAGIC)
+            f.write(json.dumps(SCENARIO_DTYPE.descr).encode() + b"\n")
+            records = np.array(
+                [
+                    (time, x, y, THREAT_TYPES.index(threat_type))
+                    for time, x, y, threat_type in spawns
+                ],
+                dtype=SCENARIO_DTYPE,
+            )
+            f.write(records.tobytes())
+        return
+
+    with _open_scenario(path, "wt") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(RaidSpawn._fields)
+            writer.writerows(spawns)
+        else:
+            for spawn in spawns:
+                f.write(json.dumps(spawn._asdict()) + "\n")
+
+
+def read_scenario(
+    path, fmt=None, chunk_size=4096, world_size=(WORLD_WIDTH, WORLD_HEIGHT)
+):
+    """Lazily read a scenario file as chunks of RaidSpawns
+
+    Only one chunk is held at a time, whatever the file's length. Records
+    must be in time order, name one of THREAT_TYPES and start inside the
+    world_size battlespace; the first that does not raises ValueError.
+    """
+    fmt = fmt or scenario_format(path)
+    if fmt not in SCENARIO_FORMATS:
+        raise ValueError(f"Unknown scenario format: {fmt}")
+    if fmt == "binary":
+        yield from _read_binary_scenario(path, chunk_size, world_size)
+        return
+
+    with _open_scenario(path, "rt") as f:
+        if fmt == "csv":
+            rows = csv.reader(f)
+            header = next(rows, None)
+            if header != list(RaidSpawn._fields):
+                raise ValueError(f"{path}: expected columns {RaidSpawn._fields}")
+            records = enumerate(rows, 2)
+        else:
+            records = (
+                (number, line) for number, line in enumerate(f, 1) if line.strip()
+            )
+
+        last_time = -np.inf
+        chunk = []
+        for number, record in records:
+            try:
+                if fmt == "csv":
+                    time, x, y, threat_type = record
+                else:
+                    data = json.loads(record)
+                    time, x, y = data["time"], data["x"], data["y"]
+                    threat_type = data["threat_type"]
+                spawn = RaidSpawn(float(time), float(x), float(y), threat_type)
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"{path}:{number}: malformed spawn") from exc
+            _check_spawn(spawn, last_time, world_size, f"{path}:{number}")
+            last_time = spawn.time
+            chunk.append(spawn)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _check_spawn(spawn, last_time, world_size, where):
+    width, height = world_size
+    if spawn.threat_type not in THREAT_TYPES:
+        raise ValueError(f"{where}: unknown threat type {spawn.threat_type!r}")
+    if not (0 <= spawn.x <= width and 0 <= spawn.y <= height):
+        raise ValueError(f"{where}: spawn ({spawn.x}, {spawn.y}) is off the map")
+    if not spawn.time >= last_time:
+        raise ValueError(f"{where}: spawn at {spawn.time} is out of time order")
+
+
+def _read_binary_scenario(path, chunk_size, world_size):
+    width, height = world_size
+    with _open_scenario(path, "rb") as f:
+        if f.readline() != SCENARIO_MAGIC:
+            raise ValueError(f"{path} is not a binary scenario")
+        dtype = np.dtype([tuple(field) for field in json.loads(f.readline())])
+        last_time = -np.inf
+        first = 0
+        while True:
+            data = f.read(chunk_size * dtype.itemsize)
+            if not data:
+                break
+            if len(data) % dtype.itemsize:
+                raise ValueError(f"{path}: truncated record")
+            records = np.frombuffer(data, dtype=dtype)
+
+            # Validate the whole chunk at once; only a failure is located
+            times = records["time"]
+            xs = records["x"]
+            ys = records["y"]
+            codes = records["threat"]
+            bad = (
+                (codes >= len(THREAT_TYPES))
+                | ~((xs >= 0) & (xs <= width) & (ys >= 0) & (ys <= height))
+                | ~(np.diff(times, prepend=last_time) >= 0)
+            )
+            if bad.any():
+                index = int(bad.argmax())
+                time, x, y, code = records[index].item()
+                threat_type = THREAT_TYPES[code] if code < len(THREAT_TYPES) else code
+                previous = times[index - 1] if index else last_time
+                spawn = RaidSpawn(time, x, y, threat_type)
+                _check_spawn(
+                    spawn, previous, world_size, f"{path}: record {first + index}"
+                )
+            last_time = times[-1]
+            first += len(records)
+
+            threat_types = [THREAT_TYPES[code] for code in codes.tolist()]
+            yield list(
+                map(RaidSpawn, times.tolist(), xs.tolist(), ys.tolist(), threat_types)
+            )
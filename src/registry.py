@@ -0,0 +1,52 @@
+from itertools import product
+
+HOSTILE = "hostile"
+FRIENDLY = "friendly"
+
+
+class EntityRegistry:
+    """Live entity counts by (side, threat type, active state)
+
+    Counts are adjusted when an entity is spawned, changes active state or is
+    recycled, so HUD queries never have to walk the entity lists. Every change
+    also updates the wildcard totals, which keeps count() a single dict lookup.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def _adjust(self, side, threat_type, active, delta):
+        for key in product((side, None), (threat_type, None), (active, None)):
+            self.counts[key] = self.counts.get(key, 0) + delta
+
+    def register(self, entity):
+        """Start counting a freshly spawned entity"""
+        if entity.registered:
+            return
+        entity.registered = True
+        self._adjust(side_of(entity), entity.threat_type, entity.active, 1)
+
+    def unregister(self, entity):
+        """Stop counting an entity that is being recycled"""
+        if not entity.registered:
+            return
+        entity.registered = False
+        self._adjust(side_of(entity), entity.threat_type, entity.active, -1)
+
+    def set_active(self, entity, active):
+        """Move a registered entity between the active and inactive buckets"""
+        side = side_of(entity)
+        self._adjust(side, entity.threat_type, entity.active, -1)
+        self._adjust(side, entity.threat_type, active, 1)
+
+    def count(self, side=None, threat_type=None, active=None):
+        """Number of registered entities matching the given filters (None = any)"""
+        return self.counts.get((side, threat_type, active), 0)
+
+
+def side_of(entity):
+    return HOSTILE if entity.is_hostile else FRIENDLY
+
+
+# Process-wide registry shared by the missile pool and the HUD
+REGISTRY = EntityRegistry()
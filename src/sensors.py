@@ -0,0 +1,64 @@
+import math
+
+SWEEP_RATE = 4.0  # degrees the search beam turns per step
+SWEEP_SECTORS = 90  # angular buckets tracks are indexed by
+
+
+class SweepRadar:
+    """Rotating search radar that only sees tracks as its beam passes them
+
+    Tracks are bucketed by bearing into fixed angular sectors, so a step
+    inspects just the sectors the beam swept instead of every track. A track
+    whose bearing has drifted since it was filed is moved to its current
+    sector; if that sector was already swept it is seen on the next turn.
+    """
+
+    def __init__(self, base, rate=SWEEP_RATE, sectors=SWEEP_SECTORS):
+        self.base = base
+        self.rate = rate
+        self.sector_width = 360.0 / sectors
+        self.sectors = [{} for _ in range(sectors)]  # track id -> missile
+        self.angle = 0.0
+
+    def __len__(self):
+        return sum(len(sector) for sector in self.sectors)
+
+    def bearing(self, x, y):
+        """Bearing from the radar in degrees, clockwise on screen from east"""
+        return math.degrees(math.atan2(y - self.base.y, x - self.base.x)) % 360
+
+    def sector_of(self, bearing):
+        return int(bearing // self.sector_width) % len(self.sectors)
+
+    def add(self, missile):
+        sector = self.sectors[self.sector_of(self.bearing(missile.x, missile.y))]
+        sector[missile.track_id] = missile
+
+    def sweep(self):
+        """Turn the beam one step and return the live tracks it passed in range"""
+        start = self.angle
+        self.angle = (start + self.rate) % 360
+        first = int(start // self.sector_width)
+        last = int((start + self.rate) // self.sector_width)
+        base = self.base
+        reach = base.radar_range
+
+        detected = {}
+        for index in range(first, last + 1):
+            index %= len(self.sectors)
+            sector = self.sectors[index]
+            for track_id, missile in list(sector.items()):
+                # Pooled missiles are relaunched under a new track id
+                if not missile.active or missile.track_id != track_id:
+                    del sector[track_id]
+                    continue
+                bearing = self.bearing(missile.x, missile.y)
+                current = self.sector_of(bearing)
+                if current != index:
+                    del sector[track_id]
+                    self.sectors[current][track_id] = missile
+                if (bearing - start) % 360 < self.rate and math.hypot(
+                    missile.x - base.x, missile.y - base.y
+                ) <= reach:
+                    detected[track_id] = missile
+        return list(detected.values())
@@ -0,0 +1,26 @@
+import asyncio
+
+SHUTDOWN_TIMEOUT = 2.0  # s connection handlers get to finish before cancelling
+
+
+def shutdown_loop(loop, servers, writers):
+    """Close a stopped server loop's listeners and clients, then the loop
+
+    Closing each client's writer ends its handler's pending read with EOF,
+    so handlers return on their own and are awaited rather than cancelled
+    mid-read, which asyncio would report as an unhandled CancelledError.
+    Anything still running after SHUTDOWN_TIMEOUT is cancelled.
+    """
+    for server in servers:
+        server.close()
+    for writer in list(writers):
+        writer.close()
+    tasks = asyncio.all_tasks(loop)
+    if tasks:
+        _, pending = loop.run_until_complete(
+            asyncio.wait(tasks, timeout=SHUTDOWN_TIMEOUT)
+        )
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
@@ -0,0 +1,382 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from config import THREAT_TYPES
+from game_objects import TRAIL_LENGTH
+from registry import REGISTRY
+from timing import ticks
+
+STEP_MS = 1000 / 60  # simulation step period when running on its own thread
+MAX_CATCH_UP = 5  # steps a late simulation thread may run back to back
+
+TRACK_DTYPE = np.dtype(
+    [
+        ("track_id", "<u4"),
+        ("threat", "u1"),
+        ("hostile", "?"),
+        ("active", "?"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("vx", "<f4"),
+        ("vy", "<f4"),
+        ("fuel", "<f4"),
+        ("mass", "<u4"),
+        ("velocity", "<u4"),
+        ("altitude", "<u4"),
+        ("trail_length", "<u2"),
+    ]
+)
+PARTICLE_DTYPE = np.dtype(
+    [
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("size", "<f4"),
+        ("alpha", "u1"),
+        ("color", "u1", (3,)),
+    ]
+)
+EXPLOSION_DTYPE = np.dtype(
+    [("x", "<f4"), ("y", "<f4"), ("radius", "<f4"), ("max_radius", "<f4")]
+)
+BASE_DTYPE = np.dtype(
+    [
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("radius", "<f4"),
+        ("radar_angle", "<f4"),
+        ("magazine", "<u2"),
+        ("magazine_capacity", "<u2"),
+    ]
+)
+BLIP_DTYPE = np.dtype([("threat", "u1"), ("angle", "<f4"), ("distance", "<f4")])
+
+
+def _reserve(array, count):
+    """array, or a larger replacement with room for count records"""
+    if count <= len(array):
+        return array
+    return np.empty((max(count, 2 * len(array)),) + array.shape[1:], array.dtype)
+
+
+def _in_view(xs, ys, view):
+    if view is None:
+        return np.ones(len(xs), bool)
+    left, top, right, bottom = view
+    return (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+
+
+def _frozen(array, count):
+    view = array[:count]
+    view.flags.writeable = False
+    return view
+
+
+class WorldSnapshot:
+    """Copy of everything the renderer reads after one simulation step
+
+    Records are written into arrays allocated once and grown only when a
+    step outgrows them, so capturing a step allocates nothing in the steady
+    state. The arrays are handed out as read-only views.
+    """
+
+    def __init__(self, capacity=256):
+        self._tracks = np.empty(capacity, TRACK_DTYPE)
+        self._trails = np.empty((capacity, TRAIL_LENGTH, 2), np.float32)
+        self._particles = np.empty(8 * capacity, PARTICLE_DTYPE)
+        self._explosions = np.empty(16, EXPLOSION_DTYPE)
+        self._bases = np.empty(4, BASE_DTYPE)
+        self._blips = np.empty(64, BLIP_DTYPE)
+        self.counts = {}
+        self.track_count = 0
+        self.hostile_count = 0
+        self.particle_count = 0
+        self.explosion_count = 0
+        self.base_count = 0
+        self.blip_count = 0
+        self.step = 0
+        self.time = 0
+        self.auto_mode = False
+        self.threat_level = 0
+        self.sweep_angle = 0.0
+        self.threats = []  # (frames to impact, threat type, track id) soonest first
+        self.total_threats = 0
+        self.intercepted = 0
+        self.evaded = 0
+        self.physics = None  # PhysicsResults of the step, if solved
+
+    @property
+    def tracks(self):
+        """Hostiles followed by interceptors, in engine order"""
+        return _frozen(self._tracks, self.track_count)
+
+    @property
+    def trails(self):
+        """(tracks, TRAIL_LENGTH, 2) trail positions, oldest first"""
+        return _frozen(self._trails, self.track_count)
+
+    @property
+    def particles(self):
+        return _frozen(self._particles, self.particle_count)
+
+    @property
+    def explosions(self):
+        return _frozen(self._explosions, self.explosion_count)
+
+    @property
+    def bases(self):
+        return _frozen(self._bases, self.base_count)
+
+    @property
+    def blips(self):
+        return _frozen(self._blips, self.blip_count)
+
+    def count(self, side=None, threat_type=None, active=None):
+        """Registry count at the time of the step, as REGISTRY.count"""
+        return self.counts.get((side, threat_type, active), 0)
+
+    def capture(self, engine, radar=None, metrics=None, view=None):
+        """Copy the engine's state, and that of its scope and metrics, if given
+
+        Trails and particles, which dwarf the rest, are only copied inside
+        view, the world (left, top, right, bottom) the renderer shows.
+        """
+        self.step = engine.step_count
+        self.time = engine.events.time
+        self.auto_mode = engine.auto_mode
+        self.threat_level = engine.threat_level
+        self.counts = dict(REGISTRY.counts)
+        self.threats = [
+            (impact_step - engine.step_count, threat.threat_type, threat.track_id)
+            for impact_step, threat in engine.threat_queue.smallest(5)
+        ]
+        if metrics is not None:
+            self.total_threats = metrics.total_threats
+            self.intercepted = metrics.missiles_intercepted
+            self.evaded = metrics.missiles_evaded
+
+        tracks = engine.missiles + engine.interceptors
+        self.hostile_count = len(engine.missiles)
+        in_view = self._capture_tracks(tracks, view)
+
+        particles = [p for i in in_view for p in tracks[i].particles]
+        for base in engine.bases:
+            particles.extend(base.particles)
+        for explosion in engine.explosions:
+            particles.extend(explosion.particles)
+        self._capture_particles(particles, view)
+
+        explosions = engine.explosions
+        self._explosions = _reserve(self._explosions, len(explosions))
+        records = self._explosions[: len(explosions)]
+        records["x"] = [e.x for e in explosions]
+        records["y"] = [e.y for e in explosions]
+        records["radius"] = [e.radius for e in explosions]
+        records["max_radius"] = [e.max_radius for e in explosions]
+        self.explosion_count = len(explosions)
+
+        bases = engine.bases
+        self._bases = _reserve(self._bases, len(bases))
+        records = self._bases[: len(bases)]
+        records["x"] = [b.x for b in bases]
+        records["y"] = [b.y for b in bases]
+        records["radius"] = [b.radius for b in bases]
+        records["radar_angle"] = [b.radar_angle for b in bases]
+        records["magazine"] = [b.magazine for b in bases]
+        records["magazine_capacity"] = [b.magazine_capacity for b in bases]
+        self.base_count = len(bases)
+
+        if radar is not None:
+            self.sweep_angle = radar.radar_sweep_angle
+            types, angles, distances = radar.blips()
+            self._blips = _reserve(self._blips, len(types))
+            records = self._blips[: len(types)]
+            records["threat"] = types
+            records["angle"] = angles
+            records["distance"] = distances
+            self.blip_count = len(types)
+
+    def _capture_tracks(self, tracks, view):
+        # Returns the indices of the tracks in view
+        count = len(tracks)
+        self._tracks = _reserve(self._tracks, count)
+        self._trails = _reserve(self._trails, count)
+        records = self._tracks[:count]
+        records["track_id"] = [m.track_id for m in tracks]
+        records["threat"] = [THREAT_TYPES.index(m.threat_type) for m in tracks]
+        records["hostile"] = [m.is_hostile for m in tracks]
+        records["active"] = [m.active for m in tracks]
+        records["x"] = [m.x for m in tracks]
+        records["y"] = [m.y for m in tracks]
+        records["vx"] = [m.vx for m in tracks]
+        records["vy"] = [m.vy for m in tracks]
+        records["fuel"] = [m.fuel for m in tracks]
+        records["mass"] = [m.mass for m in tracks]
+        records["velocity"] = [m.velocity for m in tracks]
+        records["altitude"] = [m.altitude for m in tracks]
+        records["trail_length"] = 0
+        self.track_count = count
+
+        in_view = np.flatnonzero(_in_view(records["x"], records["y"], view)).tolist()
+        trails = self._trails
+        lengths = records["trail_length"]
+        for i in in_view:
+            trail = tracks[i].trail
+            if trail:
+                trails[i, : len(trail)] = trail
+                lengths[i] = len(trail)
+        return in_view
+
+    def _capture_particles(self, particles, view):
+        xs = np.fromiter((p.x for p in particles), np.float32, len(particles))
+        ys = np.fromiter((p.y for p in particles), np.float32, len(particles))
+        life = np.fromiter((p.life for p in particles), np.float32, len(particles))
+        size = np.fromiter((p.size for p in particles), np.float32, len(particles))
+        shown = np.flatnonzero((life > 0) & (size > 0) & _in_view(xs, ys, view))
+        particles = [particles[i] for i in shown.tolist()]
+
+        count = len(particles)
+        self._particles = _reserve(self._particles, count)
+        records = self._particles[:count]
+        records["x"] = xs[shown]
+        records["y"] = ys[shown]
+        records["size"] = size[shown]
+        max_life = np.fromiter((p.max_life for p in particles), np.float32, count)
+        records["alpha"] = np.minimum(255, 255 * life[shown] / max_life)
+
+        # Particles share a handful of colors, so copy each color once
+        palette = {}
+        codes = [palette.setdefault(p.color, len(palette)) for p in particles]
+        if count:
+            colors = np.array([color[:3] for color in palette], np.uint8)
+            records["color"] = colors[codes]
+        self.particle_count = count
+
+
+class SnapshotBuffer:
+    """Triple buffer passing the newest snapshot from simulation to renderer
+
+    The simulation fills back() and publishes it; the renderer takes the
+    newest published snapshot with read() and may draw it for as long as it
+    likes. With three snapshots there is always one that is neither the
+    newest nor being drawn, so neither side ever waits on the other.
+    """
+
+    def __init__(self, capacity=256):
+        self.snapshots = [WorldSnapshot(capacity) for _ in range(3)]
+        self.lock = threading.Lock()
+        self.newest = None  # index of the latest published snapshot
+        self.reading = None  # index of the snapshot the renderer holds
+
+    def back(self):
+        """A snapshot the renderer cannot be holding, free to overwrite"""
+        with self.lock:
+            for index, snapshot in enumerate(self.snapshots):
+                if index != self.newest and index != self.reading:
+                    return snapshot
+
+    def publish(self, snapshot):
+        with self.lock:
+            self.newest = self.snapshots.index(snapshot)
+
+    def read(self):
+        """The newest published snapshot, or None before the first step"""
+        with self.lock:
+            self.reading = self.newest
+            return None if self.newest is None else self.snapshots[self.newest]
+
+
+class Simulation:
+    """Steps the engine and publishes a snapshot of the world after each step
+
+    Call tick() to step in lockstep with the caller, or start() to step every
+    step_ms on a thread of its own. While threaded, only that thread touches
+    the engine: other threads hand it work through submit(). The NumPy
+    batches in tracking and targeting release the GIL, so a threaded
+    simulation overlaps with drawing on a multi-core machine.
+    """
+
+    def __init__(self, engine, radar=None, metrics=None, physics=None, step_ms=STEP_MS):
+        self.engine = engine
+        self.radar = radar
+        self.metrics = metrics
+        self.physics = physics  # solves the panel's equations from each snapshot
+        self.step_ms = step_ms
+        self.buffer = SnapshotBuffer()
+        self.commands = queue.SimpleQueue()
+        self.before_step = []  # callables run with the step time, in order
+        self.after_step = []
+        self.view = None  # world (left, top, right, bottom) the renderer shows
+        self.thread = None
+        self.running = False
+
+    def submit(self, command):
+        """Run command(engine) on the simulation thread before its next step"""
+        self.commands.put(command)
+
+    def tick(self, current_time=None):
+        """Run one step and publish its snapshot"""
+        if current_time is None:
+            current_time = ticks()
+        engine = self.engine
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            command(engine)
+        for hook in self.before_step:
+            hook(current_time)
+        engine.step(current_time)
+        if self.radar is not None:
+            self.radar.update(engine.radars[0].angle)
+        for hook in self.after_step:
+            hook(current_time)
+
+        snapshot = self.buffer.back()
+        snapshot.capture(engine, self.radar, self.metrics, self.view)
+        self.mark_on_screen(snapshot)
+        if self.physics is not None:
+            snapshot.physics = self.physics.solve(snapshot.tracks)
+        self.buffer.publish(snapshot)
+        return snapshot
+
+    def mark_on_screen(self, snapshot):
+        # Tracks outside the renderer's view skip their cosmetic exhaust
+        if self.view is None:
+            return
+        tracks = snapshot.tracks
+        inside = _in_view(tracks["x"], tracks["y"], self.view)
+        for track, on_screen in zip(
+            self.engine.missiles + self.engine.interceptors, inside.tolist()
+        ):
+            track.on_screen = on_screen
+
+    def latest(self):
+        return self.buffer.read()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        period = self.step_ms / 1000
+        next_step = time.perf_counter()
+        while self.running:
+            self.tick()
+            next_step += period
+            delay = next_step - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif -delay > MAX_CATCH_UP * period:
+                # Too far behind to catch up: drop the backlog
+                next_step = time.perf_counter()
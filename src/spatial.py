@@ -0,0 +1,74 @@
+import numpy as np
+
+
+class GridIndex:
+    """Uniform grid spatial index over objects with x/y attributes
+
+    Objects are bucketed by the cell containing their position when the index
+    is (re)built. Queries return candidates cell by cell, so callers apply
+    their own exact distance test.
+    """
+
+    def __init__(self, cell_size, items=()):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rebuild(items)
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def rebuild(self, items):
+        self.cells = {}
+        for item in items:
+            self.insert(item)
+
+    def insert(self, item):
+        self.cells.setdefault(self.cell_of(item.x, item.y), []).append(item)
+
+    def query_rect(self, left, top, right, bottom):
+        """Yield objects in cells overlapping the rectangle"""
+        min_cx, min_cy = self.cell_of(left, top)
+        max_cx, max_cy = self.cell_of(right, bottom)
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+
+def _cell_keys(left, top, right, bottom, cell_size):
+    # (owner index, cell key) for every grid cell each box overlaps
+    x0 = np.floor(left / cell_size).astype(np.int64)
+    y0 = np.floor(top / cell_size).astype(np.int64)
+    width = np.floor(right / cell_size).astype(np.int64) - x0 + 1
+    height = np.floor(bottom / cell_size).astype(np.int64) - y0 + 1
+    counts = width * height
+    owner = np.repeat(np.arange(len(left)), counts)
+    # Position of each entry within its box's run of cells
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = x0[owner] + offset % width[owner]
+    cy = y0[owner] + offset // width[owner]
+    return owner, (cx << 32) ^ (cy & 0xFFFFFFFF)
+
+
+def overlapping_pairs(boxes_a, boxes_b, cell_size):
+    """Index pairs (i, j) of boxes from two sets sharing at least one grid cell
+
+    Boxes are (left, top, right, bottom) arrays. Every box is entered into
+    each cell it overlaps, then the two sets' cell lists are joined by
+    sorting, all in NumPy. Boxes that overlap always share a cell, so the
+    pairs are a superset of the overlapping ones for an exact test to trim.
+    """
+    owner_a, keys_a = _cell_keys(*boxes_a, cell_size)
+    owner_b, keys_b = _cell_keys(*boxes_b, cell_size)
+    order = np.argsort(keys_b, kind="stable")
+    keys_b, owner_b = keys_b[order], owner_b[order]
+    first = np.searchsorted(keys_b, keys_a, "left")
+    matches = np.searchsorted(keys_b, keys_a, "right") - first
+    a = np.repeat(owner_a, matches)
+    offset = np.arange(matches.sum()) - np.repeat(np.cumsum(matches) - matches, matches)
+    b = owner_b[np.repeat(first, matches) + offset]
+    # Boxes sharing several cells would be paired once per cell
+    pairs = np.unique(a * len(boxes_b[0]) + b)
+    return pairs // len(boxes_b[0]), pairs % len(boxes_b[0])
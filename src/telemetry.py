@@ -0,0 +1,243 @@
+import csv
+import gzip
+import io
+import json
+import os
+import queue
+import sys
+import threading
+
+import numpy as np
+
+from config import THREAT_TYPES
+
+TELEMETRY_FORMATS = ["jsonl", "csv", "binary"]
+
+# One row per track per step; also the on-disk record layout of the binary format
+TELEMETRY_DTYPE = np.dtype(
+    [
+        ("step", "<u4"),
+        ("time", "<u4"),
+        ("track_id", "<u4"),
+        ("threat", "u1"),
+        ("hostile", "u1"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("vx", "<f4"),
+        ("vy", "<f4"),
+        ("fuel", "<f4"),
+    ]
+)
+BINARY_MAGIC = b"SUCTLM1\n"
+
+
+class TelemetrySink:
+    """Snapshot track states each step and write them on a background thread
+
+    Rows are copied into one of a small set of preallocated buffers. Full
+    buffers are queued to the writer thread, which hands them back once they
+    are on disk. If the buffers a step needs are still waiting to be written
+    the whole step is dropped rather than blocking the simulation, and
+    counted in dropped_frames; a step is never partly written.
+    """
+
+    def __init__(
+        self,
+        path,
+        fmt="jsonl",
+        buffer_rows=8192,
+        buffer_count=4,
+        rotate_bytes=64 * 1024 * 1024,
+        compress=False,
+    ):
+        if fmt not in TELEMETRY_FORMATS:
+            raise ValueError(f"Unknown telemetry format: {fmt}")
+
+        self.path = path
+        self.fmt = fmt
+        self.rotate_bytes = rotate_bytes
+        self.compress = compress
+        self.capacity = buffer_rows
+        self.dropped_frames = 0
+        self.frames_recorded = 0
+
+        self.free_buffers = queue.Queue()
+        for _ in range(buffer_count):
+            self.free_buffers.put(np.zeros(buffer_rows, dtype=TELEMETRY_DTYPE))
+        self.write_queue = queue.Queue()
+        self.buffer = self.free_buffers.get_nowait()
+        self.rows = 0
+
+        # Writer thread state
+        self.file = None
+        self.raw_file = None  # file on disk beneath any compression and text layers
+        self.csv_writer = None
+        self.file_index = 0
+        self.files_written = []
+        self.writer = threading.Thread(
+            target=self._run, name="telemetry-writer", daemon=True
+        )
+        self.writer.start()
+
+    def record(self, step, time, missiles):
+        """Copy the state of every missile into the current buffer"""
+        count = len(missiles)
+        if self.buffer is None or self.rows + count > self.capacity:
+            # The step starts a fresh buffer and spills into as many more as
+            # it fills. Only this thread takes free buffers, so those counted
+            # here are still free when it needs them
+            needed = max(1, -(-count // self.capacity))
+            spare = self.free_buffers.qsize()
+            if self.buffer is not None and not self.rows:
+                spare += 1
+            if spare < needed:
+                self.dropped_frames += 1
+                return
+            if self.buffer is None:
+                self._acquire_buffer()
+            elif self.rows:
+                self._hand_off()
+
+        # Frames larger than a whole buffer are split across buffers
+        start = 0
+        while start < count:
+            if self.rows == self.capacity:
+                self._hand_off()
+            end = min(count, start + self.capacity - self.rows)
+            self._fill(step, time, missiles[start:end])
+            start = end
+
+        self.frames_recorded += 1
+
+    def _fill(self, step, time, missiles):
+        rows = slice(self.rows, self.rows + len(missiles))
+        buffer = self.buffer
+        buffer["step"][rows] = step
+        buffer["time"][rows] = time
+        buffer["track_id"][rows] = [m.track_id for m in missiles]
+        buffer["threat"][rows] = [THREAT_TYPES.index(m.threat_type) for m in missiles]
+        buffer["hostile"][rows] = [m.is_hostile for m in missiles]
+        buffer["x"][rows] = [m.x for m in missiles]
+        buffer["y"][rows] = [m.y for m in missiles]
+        buffer["vx"][rows] = [m.vx for m in missiles]
+        buffer["vy"][rows] = [m.vy for m in missiles]
+        buffer["fuel"][rows] = [m.fuel for m in missiles]
+        self.rows += len(missiles)
+
+    def _acquire_buffer(self):
+        try:
+            self.buffer = self.free_buffers.get_nowait()
+        except queue.Empty:
+            return False
+        self.rows = 0
+        return True
+
+    def _hand_off(self):
+        if self.rows:
+            self.write_queue.put((self.buffer, self.rows))
+            self.buffer = None
+            self._acquire_buffer()
+
+    def close(self):
+        """Flush the partial buffer, stop the writer and report drops"""
+        if self.buffer is not None:
+            self._hand_off()
+        self.write_queue.put(None)
+        self.writer.join()
+        if self.dropped_frames:
+            print(
+                f"Telemetry: dropped {self.dropped_frames} of "
+                f"{self.dropped_frames + self.frames_recorded} frames "
+                "(writer fell behind)",
+                file=sys.stderr,
+            )
+
+    # Writer thread
+
+    def _run(self):
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                break
+            buffer, rows = item
+            if self.file is None:
+                self._open_next_file()
+            self._write(buffer[:rows])
+            self.free_buffers.put(buffer)
+
+            if self._file_size() >= self.rotate_bytes:
+                self._close_file()
+
+        self._close_file()
+
+    def _open_next_file(self):
+        root, ext = os.path.splitext(self.path)
+        if self.file_index:
+            path = f"{root}.{self.file_index:04d}{ext}"
+        else:
+            path = self.path
+        self.file_index += 1
+
+        if self.compress:
+            path += ".gz"
+        self.raw_file = open(path, "wb")
+        stream = self.raw_file
+        if self.compress:
+            stream = gzip.GzipFile(fileobj=self.raw_file, mode="wb")
+        if self.fmt == "binary":
+            self.file = stream
+        else:
+            self.file = io.TextIOWrapper(stream, newline="")
+        self.files_written.append(path)
+
+        if self.fmt == "binary":
+            self.file.write(BINARY_MAGIC)
+            self.file.write(json.dumps(TELEMETRY_DTYPE.descr).encode() + b"\n")
+        elif self.fmt == "csv":
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(TELEMETRY_DTYPE.names)
+
+    def _file_size(self):
+        # Compressed files are measured as written to disk; the compressor
+        # holds back at most one block it has not emitted yet
+        if self.compress:
+            return self.raw_file.tell()
+        return self.file.tell()
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.raw_file.close()  # GzipFile leaves a file it was given open
+            self.file = None
+            self.raw_file = None
+            self.csv_writer = None
+
+    def _write(self, records):
+        if self.fmt == "binary":
+            self.file.write(records.tobytes())
+            return
+
+        names = TELEMETRY_DTYPE.names
+        rows = records.tolist()
+        if self.fmt == "csv":
+            self.csv_writer.writerows(
+                row[:3] + (THREAT_TYPES[row[3]],) + row[4:] for row in rows
+            )
+        else:
+            lines = []
+            for row in rows:
+                record = dict(zip(names, row))
+                record["threat"] = THREAT_TYPES[record["threat"]]
+                record["hostile"] = bool(record["hostile"])
+                lines.append(json.dumps(record))
+            self.file.write("\n".join(lines) + "\n")
+
+
+def load_binary_telemetry(path):
+    """Read a binary telemetry file back into a structured NumPy array"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        if f.readline() != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a telemetry file")
+        dtype = np.dtype([tuple(field) for field in json.loads(f.readline())])
+        return np.frombuffer(f.read(), dtype=dtype)
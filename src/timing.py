@@ -0,0 +1,12 @@
+import time
+
+_START = time.perf_counter()
+
+
+def ticks():
+    """Milliseconds since startup, the clock the simulation and HUD run on
+
+    Stands in for pygame.time.get_ticks, which reads 0 until pygame.init()
+    has run, and pygame.init() would also start audio, which nothing uses.
+    """
+    return int((time.perf_counter() - _START) * 1000)
@@ -0,0 +1,116 @@
+from collections import namedtuple
+
+import numpy as np
+
+SENSOR_NOISE = 3.0  # px, standard deviation of simulated position measurements
+PROCESS_NOISE = 0.0005  # px²/frame⁵, white-jerk intensity of the motion model
+SETTLED_VELOCITY_SD = 0.5  # px/frame a track's speed must be known to
+
+# Constant-acceleration motion over one frame for [position, velocity, accel]
+TRANSITION = np.array([[1.0, 1.0, 0.5], [0.0, 1.0, 1.0], [0.0, 0.0, 1.0]])
+JERK_COVARIANCE = np.array(
+    [[1 / 20, 1 / 8, 1 / 6], [1 / 8, 1 / 3, 1 / 2], [1 / 6, 1 / 2, 1.0]]
+)
+
+# Filtered state handed to intercept prediction in place of the true track
+TrackEstimate = namedtuple("TrackEstimate", ["x", "y", "vx", "vy"])
+
+
+class TrackFilter:
+    """Constant-acceleration Kalman filter over all tracks at once
+
+    State is kept per track as a 3x2 array (position, velocity, acceleration
+    by x, y) in slots of preallocated arrays. Both axes share the same
+    measurement and process noise, so one 3x3 covariance per track serves
+    them both, and a step is a few batched matrix products over every slot.
+    """
+
+    def __init__(self, noise=SENSOR_NOISE, process_noise=PROCESS_NOISE, capacity=64):
+        self.noise = noise
+        self.process = process_noise * JERK_COVARIANCE
+        self.state = np.zeros((capacity, 3, 2))
+        self.covariance = np.zeros((capacity, 3, 3))
+        self.slots = {}  # track id -> slot
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, track_id):
+        return track_id in self.slots
+
+    def update(self, track_ids, xs, ys, vxs=None, vys=None):
+        """Advance every track one frame and correct the measured ones
+
+        track_ids, xs and ys hold this step's position measurements. Tracks
+        missing from the batch coast on their prediction until dropped; new
+        ids start at their measured position with the velocity guess in
+        vxs, vys (zero if not given).
+        """
+        live = np.fromiter(self.slots.values(), np.intp, len(self.slots))
+        self.state[live] = TRANSITION @ self.state[live]
+        self.covariance[live] = (
+            TRANSITION @ self.covariance[live] @ TRANSITION.T + self.process
+        )
+
+        measured = np.column_stack([xs, ys]) if len(track_ids) else np.empty((0, 2))
+        known = np.array([track_id in self.slots for track_id in track_ids], bool)
+        self._start([t for t, k in zip(track_ids, known.tolist()) if not k])
+        slots = np.array([self.slots[t] for t in track_ids], dtype=np.intp)
+
+        # Correct the predictions of tracks seen before
+        old = slots[known]
+        state = self.state[old]
+        covariance = self.covariance[old]
+        gain = covariance[:, :, 0] / (covariance[:, 0, 0] + self.noise**2)[:, None]
+        innovation = measured[known] - state[:, 0, :]
+        state += gain[:, :, None] * innovation[:, None, :]
+        covariance -= gain[:, :, None] * covariance[:, None, 0, :]
+        self.state[old] = state
+        self.covariance[old] = covariance
+
+        # New tracks start at the measurement, unsure of speed and acceleration
+        new = slots[~known]
+        self.state[new] = 0.0
+        self.state[new, 0] = measured[~known]
+        if vxs is not None:
+            self.state[new, 1, 0] = np.asarray(vxs)[~known]
+            self.state[new, 1, 1] = np.asarray(vys)[~known]
+        self.covariance[new] = np.diag([self.noise**2, 25.0, 1.0])
+
+    def drop(self, track_id):
+        """Stop tracking a track if it is tracked"""
+        slot = self.slots.pop(track_id, None)
+        if slot is not None:
+            self.free.append(slot)
+
+    def _start(self, track_ids):
+        """Claim slots for new tracks, growing the arrays when they run out"""
+        if len(track_ids) > len(self.free):
+            capacity = len(self.state)
+            grown = max(2 * capacity, len(self.slots) + len(track_ids))
+            self.state = np.resize(self.state, (grown, 3, 2))
+            self.covariance = np.resize(self.covariance, (grown, 3, 3))
+            self.free[:0] = range(grown - 1, capacity - 1, -1)
+        for track_id in track_ids:
+            self.slots[track_id] = self.free.pop()
+
+    def estimates(self, track_ids):
+        """Filtered position and velocity of tracks, and whether each has settled
+
+        Returns (N, 2) positions, (N, 2) velocities and a mask of the tracks
+        whose velocity is known to within SETTLED_VELOCITY_SD.
+        """
+        slots = np.array([self.slots[t] for t in track_ids], dtype=np.intp)
+        state = self.state[slots]
+        variance = self.covariance[slots, 1, 1]
+        return state[:, 0], state[:, 1], variance < SETTLED_VELOCITY_SD**2
+
+
+def measure(xs, ys, noise=SENSOR_NOISE, rng=np.random):
+    """Simulated sensor readings of true positions with Gaussian noise"""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if noise <= 0:
+        return xs, ys
+    return xs + rng.normal(0, noise, xs.shape), ys + rng.normal(0, noise, ys.shape)
@@ -4,15 +4,9 @@ import math
 import pygame
 
 from config import COLORS
-
-FONTS = {
-    "title": pygame.font.SysFont("Arial", 32, bold=True),
-    "header": pygame.font.SysFont("Arial", 22, bold=True),
-    "main": pygame.font.SysFont("Arial", 18),
-    "equation": pygame.font.SysFont("Consolas", 16),
-    "small": pygame.font.SysFont("Arial", 14),
-    "tiny": pygame.font.SysFont("Arial", 12),
-}
+from events import IMPACTED, INTERCEPTED, SPAWNED
+from fonts import FONTS
+from timing import ticks
 
 
 class SystemMetrics:
@@ -23,23 +17,66 @@ class SystemMetrics:
         self.gpu_usage = 0
         self.processing_speed = 0
         self.threat_level = 1
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = ticks()
         self.missiles_intercepted = 0
         self.missiles_evaded = 0
         self.total_threats = 0
 
+    def subscribe(self, events):
+        """Count defense outcomes from the engine's event bus"""
+        events.subscribe(SPAWNED, self.on_spawned)
+        events.subscribe(INTERCEPTED, self.on_intercepted)
+        events.subscribe(IMPACTED, self.on_impacted)
+
+    def on_spawned(self, events):
+        self.total_threats += sum(1 for event in events if event.is_hostile)
+
+    def on_intercepted(self, events):
+        self.missiles_intercepted += len(events)
+
+    def on_impacted(self, events):
+        self.missiles_evaded += sum(1 for event in events if event.is_hostile)
+
     def update(self, missiles_count, equations_count, solved_count):
-        current_time = pygame.time.get_ticks()
+        current_time = ticks()
+        self.equations_solved += solved_count
 
         if current_time - self.last_update > 500:
             self.targets_tracked = missiles_count
-            self.equations_solved += solved_count
             self.processing_speed = min(100, solved_count * 10 + random.randint(0, 20))
             self.cpu_usage = min(95, 25 + missiles_count * 8 + random.randint(-5, 10))
             self.gpu_usage = min(90, 30 + equations_count * 5 + random.randint(-5, 8))
             self.last_update = current_time
 
 
+def playfield_rect(screen_rect, panels):
+    """Widest full-height strip of the screen that no panel covers
+
+    Panels are treated as full-height columns. Computed once per layout, the
+    strip is where world entities are drawn: clipping to it keeps tracks off
+    the HUD and lets draw work behind the panels be skipped.
+    """
+    best = pygame.Rect(screen_rect.left, screen_rect.top, 0, screen_rect.height)
+    left = screen_rect.left
+    for panel in sorted(panels, key=lambda panel: panel.left) + [
+        pygame.Rect(screen_rect.right, screen_rect.top, 0, screen_rect.height)
+    ]:
+        if panel.left - left > best.width:
+            best = pygame.Rect(left, screen_rect.top, panel.left - left, best.height)
+        left = max(left, panel.right)
+    return best
+
+
+def panel_area(x, y, width, height, subtitle=""):
+    """Content area (x, y, width, height) inside a panel's title block"""
+    return (
+        x + 15,
+        y + (65 if subtitle else 50),
+        width - 30,
+        height - (80 if subtitle else 65),
+    )
+
+
 def draw_enhanced_panel(surface, x, y, width, height, title, subtitle=""):
     # Draw panel with gradient effect
     panel_rect = pygame.Rect(x, y, width, height)
@@ -55,12 +92,7 @@ def draw_enhanced_panel(surface, x, y, width, height, title, subtitle=""):
         subtitle_surf = FONTS["small"].render(subtitle, True, COLORS["text_secondary"])
         surface.blit(subtitle_surf, (x + 20, y + 40))
 
-    return (
-        x + 15,
-        y + (65 if subtitle else 50),
-        width - 30,
-        height - (80 if subtitle else 65),
-    )
+    return panel_area(x, y, width, height, subtitle)
 
 
 def draw_metric_display(
@@ -136,6 +168,139 @@ def draw_enhanced_button(
     return button_rect
 
 
+class Widget:
+    """A retained HUD element that re-renders only when its state changes
+
+    draw() compares the state it is given with the state it last rendered
+    and, only if they differ, renders it again onto a cached image; either
+    way it then just blits the image. The image's rect doubles as the hit
+    box for mouse input.
+    """
+
+    # Marks the transparent pixels of a widget's image, such as its corners
+    TRANSPARENT = (255, 0, 255)
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.state = None
+        self.image = None
+        self.renders = 0
+
+    def draw(self, surface, *state):
+        if self.image is None or state != self.state:
+            self.state = state
+            self.image = self.render(*state)
+            self.renders += 1
+        surface.blit(self.image, self.rect)
+        return self.rect
+
+    def hit(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def render(self, *state):
+        """Image of the widget in the given state; blank unless overridden"""
+        return self.canvas()
+
+    def canvas(self):
+        """Blank image the size of the widget, drawn on like the screen"""
+        image = pygame.Surface(self.rect.size)
+        image.fill(self.TRANSPARENT)
+        image.set_colorkey(self.TRANSPARENT, pygame.RLEACCEL)
+        return image
+
+
+class Panel(Widget):
+    """A titled panel; only its title block is kept as an image
+
+    The body is a flat fill, which is cheaper to redraw than to blit.
+    """
+
+    def __init__(self, rect, title, subtitle=""):
+        super().__init__(rect)
+        self.title = title
+        self.subtitle = subtitle
+        self.area = panel_area(*self.rect, subtitle)
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, COLORS["panel_bg"], self.rect, border_radius=12)
+        pygame.draw.rect(
+            surface, COLORS["panel_border"], self.rect, 2, border_radius=12
+        )
+        if self.image is None:
+            self.image = self.render()
+            self.renders += 1
+        surface.blit(self.image, (self.rect.x + 20, self.rect.y + 15))
+        return self.rect
+
+    def render(self):
+        height = 45 if self.subtitle else 30
+        image = pygame.Surface((self.rect.width - 40, height))
+        image.fill(COLORS["panel_bg"])
+        image.blit(FONTS["header"].render(self.title, True, COLORS["accent"]), (0, 0))
+        if self.subtitle:
+            subtitle = FONTS["small"].render(
+                self.subtitle, True, COLORS["text_secondary"]
+            )
+            image.blit(subtitle, (0, 25))
+        return image
+
+
+class MetricGauge(Widget):
+    def __init__(self, rect, title, unit="", color_threshold=None):
+        super().__init__(rect)
+        self.title = title
+        self.unit = unit
+        self.color_threshold = color_threshold
+
+    def render(self, value, max_value):
+        image = self.canvas()
+        draw_metric_display(
+            image,
+            0,
+            0,
+            *self.rect.size,
+            self.title,
+            value,
+            max_value,
+            self.unit,
+            self.color_threshold,
+        )
+        return image
+
+
+class Button(Widget):
+    def __init__(self, rect, text):
+        super().__init__(rect)
+        self.text = text
+
+    def render(self, active=False, color_scheme="default"):
+        image = self.canvas()
+        draw_enhanced_button(
+            image, 0, 0, *self.rect.size, self.text, active, color_scheme
+        )
+        return image
+
+
+class StatusLine(Widget):
+    """A line of text, sized to whatever it last rendered
+
+    anchor names the point of its rect held at pos, e.g. "topright" for
+    right-aligned text.
+    """
+
+    def __init__(self, pos, font="small", anchor="topleft"):
+        super().__init__((pos, (0, 0)))
+        self.pos = pos
+        self.font = font
+        self.anchor = anchor
+
+    def render(self, text, color=COLORS["text_primary"]):
+        image = FONTS[self.font].render(text, True, color)
+        self.rect.size = image.get_size()
+        setattr(self.rect, self.anchor, self.pos)
+        return image
+
+
 def draw_3d_globe(surface, center_x, center_y, radius):
     # Draw globe base
     pygame.draw.circle(surface, (15, 30, 60), (center_x, center_y), radius)
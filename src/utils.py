@@ -1,14 +1,50 @@
 import math
 
+import numpy as np
 
-def classify_threat(velocity, altitude):
+from config import THREAT_FALLBACK, THREAT_RULES, THREAT_TYPES
+
+
+def classify_threat(
+    velocity, altitude, rules=THREAT_RULES, fallback=THREAT_FALLBACK, **fields
+):
     """Determine threat type based on characteristics"""
-    if velocity > 2500:  # Hypersonic
-        return "missile"
-    elif altitude < 1000 and velocity < 300:
-        return "drone"
-    else:
-        return "aircraft"
+    fields["velocity"] = velocity
+    fields["altitude"] = altitude
+    for threat_type, bounds in rules:
+        for field, (above, below) in bounds.items():
+            value = fields[field]
+            if above is not None and not value > above:
+                break
+            if below is not None and not value < below:
+                break
+        else:
+            return threat_type
+    return fallback
+
+
+def classify_threats(
+    velocity, altitude, rules=THREAT_RULES, fallback=THREAT_FALLBACK, **fields
+):
+    """Type codes (indices into THREAT_TYPES) for arrays of track characteristics
+
+    Applies the same first-match rule table as classify_threat, one masked
+    comparison per bound. Extra keyword arrays can be named by custom rules.
+    """
+    fields.update(velocity=np.asarray(velocity), altitude=np.asarray(altitude))
+    shape = np.broadcast_shapes(*(np.shape(values) for values in fields.values()))
+    codes = np.full(shape, THREAT_TYPES.index(fallback), dtype=np.uint8)
+    undecided = np.ones(shape, dtype=bool)
+    for threat_type, bounds in rules:
+        match = undecided.copy()
+        for field, (above, below) in bounds.items():
+            if above is not None:
+                match &= fields[field] > above
+            if below is not None:
+                match &= fields[field] < below
+        codes[match] = THREAT_TYPES.index(threat_type)
+        undecided &= ~match
+    return codes
 
 
 def calculate_intercept_point(start_x, start_y, target, speed):
@@ -22,3 +58,91 @@ def calculate_intercept_point(start_x, start_y, target, speed):
     future_y = target.y + target.vy * time_to_intercept
 
     return future_x, future_y
+
+
+def intercept_times(dx, dy, vx, vy, speed):
+    """Earliest meeting times for interceptors launched at constant speed
+
+    Vectorized over arrays of target offsets (dx, dy) from the launch point
+    and target velocities (vx, vy). Solves |d + v*t| = speed*t assuming each
+    target keeps its current vector; uncatchable targets get inf.
+    """
+    a = vx * vx + vy * vy - speed * speed
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(b * b - 4 * a * c)
+        t1 = (-b - root) / (2 * a)
+        t2 = (-b + root) / (2 * a)
+        # Target exactly as fast as the interceptor: only a head-on approach
+        linear = np.where(b < 0, -c / b, np.inf)
+
+    t1 = np.where(t1 >= 0, t1, np.inf)
+    t2 = np.where(t2 >= 0, t2, np.inf)
+    times = np.fmin(t1, t2)
+    times = np.where(np.abs(a) < 1e-9, linear, times)
+    return np.where(np.isnan(times), np.inf, times)
+
+
+def time_of_impact(ax, ay, avx, avy, bx, by, bvx, bvy, radius):
+    """Fraction of a step at which pairs first come within radius, nan if never
+
+    Vectorized over pairs of tracks moving from (x, y) by (vx, vy) during
+    the step, as EnhancedMissile does. The pair's relative motion is tested
+    at its closest approach within the step, so tracks that cross between
+    two frames are caught; those that close in then get the earlier root of
+    |d + v*t| = radius, or 0 if they start within it.
+    """
+    dx = bx - ax
+    dy = by - ay
+    vx = bvx - avx
+    vy = bvy - avy
+    closing = dx * vx + dy * vy
+    speed2 = vx * vx + vy * vy
+    gap2 = dx * dx + dy * dy - radius * radius
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        closest = np.clip(np.where(speed2 > 0, -closing / speed2, 0.0), 0.0, 1.0)
+        miss_x = dx + vx * closest
+        miss_y = dy + vy * closest
+        root = np.sqrt(np.maximum(closing * closing - speed2 * gap2, 0.0))
+        entry = np.where(gap2 < 0, 0.0, (-closing - root) / speed2)
+    hit = miss_x * miss_x + miss_y * miss_y < radius * radius
+    return np.where(hit, np.clip(entry, 0.0, 1.0), np.nan)
+
+
+def impact_frames(dx, dy, vx, vy, gravity, acceleration, max_frames, reach=8.0):
+    """Frames until tracks close to within reach of their targets
+
+    Vectorized over arrays of target offsets (dx, dy) from each track, its
+    velocity, per-frame gravity and acceleration (which must be positive),
+    following the same update as EnhancedMissile. Progress is measured along
+    the current line of sight, so curving tracks are approximated. Tracks
+    that cannot get there within max_frames get inf.
+    """
+    dist = np.hypot(dx, dy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ux = np.where(dist > 0, dx / dist, 0.0)
+        uy = np.where(dist > 0, dy / dist, 0.0)
+    need = np.maximum(dist - reach, 0.0)
+    closing = ux * vx + uy * vy
+    pull = uy * gravity * (1 + acceleration) / acceleration
+
+    def progress(n):
+        # Velocity after m frames is r^m v0 + g*S(m) downward, where r is
+        # 1 + acceleration and S(m) = r (r^m - 1) / acceleration
+        r = 1 + acceleration
+        s = r * (r**n - 1) / acceleration
+        return closing * s + pull * (s - n)
+
+    # Bisection for the first frame with enough progress
+    lo = np.zeros_like(need)
+    hi = np.broadcast_to(np.asarray(max_frames, dtype=float), need.shape).copy()
+    reachable = progress(hi) >= need
+    for _ in range(24):
+        mid = (lo + hi) / 2
+        ahead = progress(mid) >= need
+        hi = np.where(ahead, mid, hi)
+        lo = np.where(ahead, lo, mid)
+    return np.where(reachable, np.ceil(hi), np.inf)
@@ -0,0 +1,223 @@
+import numpy as np
+
+from config import THREAT_VALUES
+
+KILL_TIME_SCALE = 240.0  # frames; kill probability falls off with flight time
+RESERVE_WEIGHT = 1.0  # cost of spending a base's remaining rounds
+MAX_SALVO = 8  # rounds a base may commit in one step
+
+
+def solve_assignment(cost):
+    """Minimum-cost assignment of every row to a distinct column
+
+    Shortest augmenting path (Jonker-Volgenant) on a rows <= cols matrix.
+    A greedy pass and augmenting row reduction assign most rows cheaply;
+    each remaining row is then added by a Dijkstra search vectorized over
+    the columns. Returns the column assigned to each row.
+
+    inf marks pairs that may not be assigned. They are solved as a finite
+    cost higher than any gap between assignments avoiding them, so one is
+    only used when nothing else fits; a ValueError is raised if every
+    assignment needs one.
+    """
+    rows, cols = cost.shape
+    if rows > cols:
+        raise ValueError(f"Cannot assign {rows} rows to {cols} columns")
+    allowed = np.isfinite(cost)
+    if not allowed.all():
+        finite = cost[allowed]
+        span = finite.max() - finite.min() if len(finite) else 0.0
+        sentinel = (finite.max() if len(finite) else 0.0) + rows * span + 1.0
+        cost = np.where(allowed, cost, sentinel)
+
+    v = np.zeros(cols)
+    col4row = np.full(rows, -1)
+    row4col = np.full(cols, -1)
+
+    # Greedy start: every row on its cheapest column if nobody has it yet
+    for row, col in enumerate(np.argmin(cost, axis=1).tolist()):
+        if row4col[col] == -1:
+            row4col[col] = row
+            col4row[row] = col
+    free = _reduce_rows(cost, v, col4row, row4col)
+
+    # Row duals at the minimum reduced cost keep every pair feasible
+    u = (cost - v).min(axis=1)
+    for row in free:
+        _augment(cost, u, v, col4row, row4col, row)
+
+    if not allowed.all() and not allowed[np.arange(rows), col4row].all():
+        raise ValueError(f"No finite-cost assignment of {rows} rows to {cols} columns")
+    return col4row
+
+
+def _reduce_rows(cost, v, col4row, row4col, passes=2):
+    """Jonker-Volgenant augmenting row reduction; returns the rows left free
+
+    Each free row takes its cheapest column, lowering that column's dual to
+    the row's second-best reduced cost and evicting the previous owner.
+    Duals stay feasible and assigned columns never become free again.
+    """
+    free = np.flatnonzero(col4row == -1).tolist()
+    for _ in range(passes):
+        pending, free = free, []
+        k = 0
+        budget = 4 * len(pending)
+        while k < len(pending):
+            budget -= 1
+            if budget < 0:
+                # Long eviction chains are left to the augmenting phase
+                free.extend(pending[k:])
+                break
+            row = pending[k]
+            k += 1
+            reduced = cost[row] - v
+            first = int(reduced.argmin())
+            first_val = reduced[first]
+            reduced[first] = np.inf
+            second = int(reduced.argmin())
+            second_val = reduced[second]
+
+            owner = row4col[first]
+            lowered = first_val < second_val < np.inf
+            if lowered:
+                v[first] -= second_val - first_val
+            elif owner != -1:
+                first = second
+                owner = row4col[second]
+            if owner != -1:
+                col4row[owner] = -1
+                if lowered:
+                    k -= 1
+                    pending[k] = owner
+                else:
+                    free.append(owner)
+            row4col[first] = row
+            col4row[row] = first
+    return free
+
+
+def _augment(cost, u, v, col4row, row4col, start_row):
+    cols = cost.shape[1]
+    shortest = np.full(cols, np.inf)
+    open_shortest = np.full(cols, np.inf)
+    # Scanned columns get a -inf dual here so they are never relaxed again
+    scan_v = v.copy()
+    reduced = np.empty(cols)
+    scanned_rows = []
+    offsets = []
+    scanned_at = {}
+    min_val = 0.0
+    row = start_row
+
+    while True:
+        scanned_rows.append(row)
+        offsets.append(min_val - u[row])
+        np.subtract(cost[row], scan_v, out=reduced)
+        reduced += offsets[-1]
+        np.minimum(open_shortest, reduced, out=open_shortest)
+
+        col = int(open_shortest.argmin())
+        min_val = open_shortest[col]
+        shortest[col] = min_val
+        open_shortest[col] = np.inf
+        scan_v[col] = -np.inf
+        scanned_at[col] = len(scanned_rows)
+        if row4col[col] == -1:
+            break
+        row = row4col[col]
+
+    # Update duals, keeping the pre-update values to trace the path
+    rows = np.array(scanned_rows, dtype=np.intp)
+    offsets = np.array(offsets)
+    old_v = v.copy()
+    u[start_row] += min_val
+    u[rows[1:]] += min_val - shortest[col4row[rows[1:]]]
+    scanned = scan_v == -np.inf
+    v[scanned] -= min_val - shortest[scanned]
+
+    # Augment along the alternating path; each column's predecessor is a
+    # row scanned before it that attains its shortest distance
+    while True:
+        count = scanned_at[col]
+        dist = cost[rows[:count], col] - old_v[col] + offsets[:count]
+        row = int(rows[dist.argmin()])
+        row4col[col] = row
+        col4row[row], col = col, col4row[row]
+        if row == start_row:
+            break
+
+
+def allocate_interceptors(times, threat_types, stock):
+    """Base index that should engage each threat this step, or -1 to hold fire
+
+    times is a (threats, bases) matrix of predicted intercept times with inf
+    where a base cannot engage; stock holds each base's remaining rounds.
+    Each base offers up to MAX_SALVO rounds. Pairing round k of a base with a
+    threat is worth the threat's value times a kill probability that decays
+    with time to intercept, minus a reserve cost that grows as the magazine
+    empties, and the assignment maximising the total is returned.
+    """
+    threats, bases = times.shape
+    assignment = np.full(threats, -1)
+    if threats == 0 or bases == 0:
+        return assignment
+
+    kill_value = _kill_values(times, threat_types)
+    stock = np.asarray(stock)
+
+    # A base never needs more rounds than threats worth its first one
+    salvo = np.minimum(stock, MAX_SALVO)
+    salvo = np.minimum(salvo, _worth_first_round(kill_value, stock).sum(axis=0))
+    slot_base = np.repeat(np.arange(bases), salvo)
+    if len(slot_base) == 0:
+        return assignment
+
+    # Round k of a base leaves stock - k - 1 rounds behind
+    slot_index = np.arange(len(slot_base)) - np.repeat(np.cumsum(salvo) - salvo, salvo)
+    reserve = RESERVE_WEIGHT / (stock[slot_base] - slot_index)
+    benefit = kill_value[:, slot_base].T - reserve[:, None]
+    benefit[~(benefit > 0)] = -np.inf
+
+    # Drop rounds and threats that have no worthwhile pairing
+    worthwhile = np.isfinite(benefit)
+    useful_slots = np.flatnonzero(worthwhile.any(axis=1))
+    useful_threats = np.flatnonzero(worthwhile.any(axis=0))
+    benefit = benefit[np.ix_(useful_slots, useful_threats)]
+
+    # Solve with the smaller side as rows; each row gets its own zero-cost
+    # "stay unmatched" column so rows never compete to hold fire
+    transpose = benefit.shape[0] > benefit.shape[1]
+    if transpose:
+        benefit = benefit.T
+    rows, cols = benefit.shape
+    cost = np.full((rows, cols + rows), np.inf)
+    cost[:, :cols] = -benefit
+    cost[np.arange(rows), cols + np.arange(rows)] = 0.0
+    col4row = solve_assignment(cost)
+
+    matched = np.flatnonzero(col4row < cols)
+    slots, targets = matched, col4row[matched]
+    if transpose:
+        slots, targets = targets, slots
+    assignment[useful_threats[targets]] = slot_base[useful_slots[slots]]
+    return assignment
+
+
+def engageable(times, threat_types, stock):
+    """(threats, bases) mask of the pairs allocate_interceptors could fire
+
+    A base with rounds left is worth firing at a threat if it would gain
+    more from the threat's kill value than its first round costs to spend.
+    """
+    stock = np.asarray(stock)
+    return _worth_first_round(_kill_values(times, threat_types), stock)
+
+
+def _kill_values(times, threat_types):
+    values = np.array([THREAT_VALUES[t] for t in threat_types], dtype=float)
+    return values.reshape(-1, 1) * np.exp(-times / KILL_TIME_SCALE)
+
+
+def _worth_first_round(kill_value, stock):
+    return (kill_value > RESERVE_WEIGHT / np.maximum(stock, 1)) & (stock > 0)
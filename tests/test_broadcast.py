@@ -0,0 +1,95 @@
+import logging
+import socket
+import time
+
+import numpy as np
+
+from broadcast import (
+    COUNT,
+    ENTITY_DTYPE,
+    EXPLOSION_DTYPE,
+    StateBroadcastServer,
+    WorldDecoder,
+    encode_delta,
+    encode_keyframe,
+)
+
+
+def world_steps(steps=60, seed=0):
+    """Entity arrays of a world whose tracks move, launch and end each step"""
+    rng = np.random.default_rng(seed)
+    entities = np.zeros(20, dtype=ENTITY_DTYPE)
+    entities["track_id"] = np.arange(20)
+    entities["x"] = rng.uniform(0, 1400, 20)
+    next_id = 20
+    for _ in range(steps):
+        entities = entities.copy()
+        moving = rng.random(len(entities)) < 0.7
+        entities["x"][moving] += rng.normal(0, 5, moving.sum())
+        entities["fuel"][rng.random(len(entities)) < 0.2] -= 0.1
+        entities = entities[rng.random(len(entities)) > 0.05]
+        added = np.zeros(rng.integers(0, 3), dtype=ENTITY_DTYPE)
+        added["track_id"] = np.arange(next_id, next_id + len(added))
+        added["y"] = rng.uniform(0, 900, len(added))
+        next_id += len(added)
+        entities = np.concatenate([entities, added])
+        explosions = np.zeros(rng.integers(0, 4), dtype=EXPLOSION_DTYPE)
+        explosions["radius"] = rng.uniform(0, 80, len(explosions))
+        yield entities, explosions
+
+
+def body(frame):
+    return frame[COUNT.size :]
+
+
+def test_decoder_tracks_keyframes_and_deltas():
+    decoder = WorldDecoder()
+    previous = None
+    for step, (entities, explosions) in enumerate(world_steps()):
+        header = (step, 100 + step, step // 2, step // 3)
+        if previous is None or step % 25 == 0:
+            decoder.apply(body(encode_keyframe(header, entities, explosions)))
+        else:
+            frame = encode_delta(header, previous, entities, explosions)
+            assert decoder.apply(body(frame))
+        previous = entities
+
+        np.testing.assert_array_equal(decoder.entities, entities)
+        np.testing.assert_array_equal(decoder.explosions, explosions)
+        assert decoder.step == step
+        assert decoder.metrics == header[1:]
+
+
+def test_delta_before_keyframe_is_ignored():
+    (first, explosions), (second, _) = list(world_steps(2))
+    decoder = WorldDecoder()
+    assert not decoder.apply(
+        body(encode_delta((1, 0, 0, 0), first, second, explosions))
+    )
+    assert decoder.entities is None
+
+
+def test_unchanged_tracks_are_not_resent():
+    entities, explosions = next(world_steps(1))
+    same = encode_delta((1, 0, 0, 0), entities, entities, explosions)
+    moved = entities.copy()
+    moved["x"] += 1
+    changed = encode_delta((1, 0, 0, 0), entities, moved, explosions)
+    assert len(changed) - len(same) == len(entities) * (4 + 1 + 4)
+
+
+def test_stop_with_connected_console_is_clean(caplog):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = StateBroadcastServer(port=port)
+    server.start()
+    with socket.create_connection((server.host, port)):
+        deadline = time.monotonic() + 2
+        while not server.clients and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.clients
+        with caplog.at_level(logging.ERROR, logger="asyncio"):
+            server.stop()
+    assert not caplog.records
+    assert server.loop.is_closed()
@@ -0,0 +1,64 @@
+import numpy as np
+
+from engine import KILL_RADIUS, swept_box
+from spatial import overlapping_pairs
+from utils import time_of_impact
+
+
+def sampled_time_of_impact(a, b, radius, samples=20001):
+    """First sampled fraction of the step at which a and b are within radius"""
+    t = np.linspace(0.0, 1.0, samples)
+    dx = b[0] - a[0] + (b[2] - a[2]) * t
+    dy = b[1] - a[1] + (b[3] - a[3]) * t
+    inside = np.flatnonzero(dx * dx + dy * dy < radius * radius)
+    return t[inside[0]] if len(inside) else np.nan
+
+
+def test_time_of_impact_matches_a_sampled_step():
+    rng = np.random.default_rng(0)
+    a = np.vstack([rng.uniform(0, 200, (2, 2000)), rng.normal(0, 60, (2, 2000))])
+    b = np.vstack([rng.uniform(0, 200, (2, 2000)), rng.normal(0, 60, (2, 2000))])
+    times = time_of_impact(*a, *b, KILL_RADIUS)
+
+    expected = np.array(
+        [sampled_time_of_impact(a[:, i], b[:, i], KILL_RADIUS) for i in range(2000)]
+    )
+    hits = ~np.isnan(expected)
+    assert 0 < hits.sum() < 2000
+    # Grazing pairs may fall between samples; everything else must agree
+    disagree = np.isnan(times) != np.isnan(expected)
+    assert disagree.sum() <= 2
+    both = hits & ~np.isnan(times)
+    np.testing.assert_allclose(times[both], expected[both], atol=1e-4)
+
+
+def pair_time_of_impact(a, b, radius):
+    return time_of_impact(*np.array(a)[:, None], *np.array(b)[:, None], radius)[0]
+
+
+def test_tracks_crossing_between_frames_are_hit():
+    # Head on at 100 px a step each: never within the radius at either end
+    time = pair_time_of_impact((0, 0, 100, 0), (100, 5, -100, 0), 10)
+    assert np.isclose(time, (100 - np.sqrt(10**2 - 5**2)) / 200)
+    assert np.isnan(pair_time_of_impact((0, 0, 100, 0), (100, 15, -100, 0), 10))
+
+
+def test_tracks_starting_in_range_hit_at_once():
+    assert pair_time_of_impact((0, 0, 5, 0), (3, 0, -5, 0), 10) == 0.0
+    assert pair_time_of_impact((0, 0, 0, 0), (3, 0, 0, 0), 10) == 0.0
+    assert np.isnan(pair_time_of_impact((0, 0, 4, 4), (30, 0, 4, 4), 10))
+
+
+def test_overlapping_pairs_finds_every_overlapping_box():
+    rng = np.random.default_rng(1)
+    a = swept_box(*rng.uniform(0, 1000, (2, 300)), *rng.normal(0, 40, (2, 300)))
+    b = swept_box(*rng.uniform(0, 1000, (2, 400)), *rng.normal(0, 40, (2, 400)))
+    overlap = (
+        (a[0][:, None] <= b[2])
+        & (b[0] <= a[2][:, None])
+        & (a[1][:, None] <= b[3])
+        & (b[1] <= a[3][:, None])
+    )
+    pairs = list(zip(*overlapping_pairs(a, b, 4 * KILL_RADIUS)))
+    assert len(pairs) == len(set(pairs))
+    assert set(zip(*np.nonzero(overlap))) <= set(pairs)
@@ -0,0 +1,30 @@
+from engine import DefenseEngine
+from game_objects import get_missile
+
+
+def test_every_base_fills_its_salvo_from_the_threats_it_reaches():
+    engine = DefenseEngine(
+        base_positions=[(1000, 1500), (8000, 1500)], world_size=(10000, 2000)
+    )
+    engine.auto_mode = False
+    near, far = engine.bases
+
+    # The most urgent threats are only in reach of the first base
+    threats = [(near, 1000 + 20 * i, 1000, i) for i in range(20)]
+    threats += [(far, 8000 + 20 * i, 1000, 100 + i) for i in range(5)]
+    for base, x, y, key in threats:
+        missile = get_missile(x, y, base.x, base.y, True, "missile")
+        engine.missiles.append(missile)
+        engine.threat_queue.push(missile.track_id, missile, key)
+    hostiles = engine.missiles
+    for _ in range(30):
+        engine.tracker.update(
+            [missile.track_id for missile in hostiles],
+            [missile.x for missile in hostiles],
+            [missile.y for missile in hostiles],
+        )
+
+    engine.launch_interceptors()
+    launched = [interceptor.start_x for interceptor in engine.interceptors]
+    assert launched.count(near.x) == 8
+    assert launched.count(far.x) == 5
@@ -0,0 +1,118 @@
+import random
+
+import numpy as np
+
+from events import (
+    ENGAGED,
+    FUEL_EXHAUSTED,
+    IMPACTED,
+    INTERCEPTED,
+    OUT_OF_BOUNDS,
+    SPAWNED,
+)
+import fastforward
+from fastforward import FastForward, flight_path
+from game_objects import EnhancedMissile
+from raids import RaidScheduler, expand_salvos
+from tracking import TrackFilter
+
+
+def test_flight_path_matches_stepped_flight():
+    random.seed(0)
+    for is_hostile, threat_type in [(False, "missile"), (True, "aircraft")]:
+        missile = EnhancedMissile(100, 50, 900, 700, is_hostile, threat_type)
+        path = flight_path(
+            missile.x,
+            missile.y,
+            missile.vx,
+            missile.vy,
+            missile.gravity,
+            missile.acceleration,
+            150,
+        )
+        stepped = [(missile.x, missile.y)]
+        for _ in range(150):
+            missile.update(10**6, 10**6, 0)
+            stepped.append((missile.x, missile.y))
+        np.testing.assert_allclose(path, stepped, atol=1e-6)
+
+
+def test_filter_gains_reproduce_the_track_filter():
+    kernel = FastForward()
+    rng = np.random.default_rng(0)
+    measurements = flight_path(100, 50, 2, 1, 0.05, 0.001, 80)
+    measurements += rng.normal(0, 3, measurements.shape)
+    tracker = TrackFilter(capacity=1)
+    state = np.zeros((3, 2))
+    for update, (x, y) in enumerate(measurements):
+        tracker.update([0], [x], [y])
+        transition, gain = kernel.filter_gain(update)
+        state = transition @ state + gain * (x, y)
+        np.testing.assert_allclose(state, tracker.state[0], atol=1e-9)
+    assert tracker.estimates([0])[2][0] == (len(measurements) >= kernel.settle_frames)
+
+
+def raid(salvos=6):
+    plan = [
+        {"time": 500 + i * 1500, "origin": [200 + i * 137, 80], "count": 6}
+        for i in range(salvos)
+    ]
+    return expand_salvos(plan, seed=1)
+
+
+def scheduled(spawns):
+    raids = RaidScheduler()
+    raids.load(spawns)
+    return raids
+
+
+def test_every_track_ends_once():
+    spawns = raid()
+    random.seed(1)
+    np.random.seed(1)
+    outcomes = FastForward().run(scheduled(spawns))
+    assert outcomes[SPAWNED] == len(spawns) + outcomes[ENGAGED]
+    assert outcomes[ENGAGED] and outcomes[INTERCEPTED]
+    ended = sum(outcomes[kind] for kind in (IMPACTED, FUEL_EXHAUSTED, OUT_OF_BOUNDS))
+    assert ended + 2 * outcomes[INTERCEPTED] == outcomes[SPAWNED]
+
+
+def test_interceptors_are_retired_at_the_end_of_their_path(monkeypatch):
+    spawns = raid()
+    random.seed(1)
+    np.random.seed(1)
+    engaged = FastForward().run(scheduled(spawns))[ENGAGED]
+
+    monkeypatch.setattr(fastforward, "MAX_FLIGHT_FRAMES", 5)
+    random.seed(1)
+    np.random.seed(1)
+    kernel = FastForward()
+    outcomes = kernel.run(scheduled(spawns))
+    assert not kernel.interceptors
+    # Retired interceptors free their targets to be engaged again
+    assert outcomes[ENGAGED] > engaged
+    ended = sum(outcomes[kind] for kind in (IMPACTED, FUEL_EXHAUSTED, OUT_OF_BOUNDS))
+    assert ended + 2 * outcomes[INTERCEPTED] == outcomes[SPAWNED]
+
+
+def test_streamed_spawns_are_pulled_as_they_fall_due():
+    spawns = raid(40)
+    pulled = []
+
+    def chunks():
+        for start in range(0, len(spawns), 6):
+            pulled.append(start)
+            yield spawns[start : start + 6]
+
+    random.seed(1)
+    np.random.seed(1)
+    loaded = FastForward().run(scheduled(spawns), until=20000)
+
+    raids = RaidScheduler()
+    raids.stream(chunks())
+    random.seed(1)
+    np.random.seed(1)
+    streamed = FastForward().run(raids, until=20000)
+    assert streamed == loaded
+    # Salvos 1.5 s apart: only those up to 20 s plus the lookahead are read
+    assert len(pulled) <= 16
@@ -0,0 +1,74 @@
+import logging
+import socket
+import time
+
+import pytest
+
+from engine import DefenseEngine
+from ingest import TrackFeedServer, TrackMessage, parse_track_message
+from simthread import STEP_MS
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_parse_track_message():
+    message = parse_track_message(
+        b'{"id": 7, "x": 1, "y": 2, "velocity": 900, "altitude": 3000}'
+    )
+    assert message.id == "7"
+    assert (message.x, message.y, message.vx, message.vy) == (1.0, 2.0, None, None)
+
+
+def test_tcp_messages_are_queued():
+    server = TrackFeedServer(port=free_port())
+    server.start()
+    try:
+        with socket.create_connection((server.host, server.port)) as client:
+            client.sendall(
+                b'{"id": 1, "x": 5, "y": 6, "velocity": 900, "altitude": 3000}\n'
+                b"not json\n"
+            )
+            assert wait_for(lambda: server.messages_malformed == 1)
+    finally:
+        server.stop()
+    assert [message.id for message in server.drain()] == ["1"]
+
+
+def test_stop_with_connected_client_is_clean(caplog):
+    server = TrackFeedServer(port=free_port())
+    server.start()
+    with socket.create_connection((server.host, server.port)) as client:
+        client.sendall(b'{"id": 1, "x": 0, "y": 0, "velocity": 1, "altitude": 1}\n')
+        assert wait_for(lambda: server.messages_received == 1)
+        with caplog.at_level(logging.ERROR, logger="asyncio"):
+            server.stop()
+    assert not caplog.records
+    assert server.loop.is_closed()
+
+
+def test_half_velocity_message_is_rejected():
+    with pytest.raises(ValueError):
+        parse_track_message(
+            b'{"id": 7, "x": 1, "y": 2, "vx": 3, "velocity": 900, "altitude": 3000}'
+        )
+
+
+def test_engine_keeps_velocity_without_both_components():
+    engine = DefenseEngine()
+    engine.auto_mode = False
+    engine.ingest([TrackMessage("7", 100.0, 50.0, 2.0, 1.0, 900.0, 3000.0)])
+    engine.ingest([TrackMessage("7", 102.0, 51.0, 5.0, None, 900.0, 3000.0)])
+    missile = engine.external_tracks["7"][0]
+    assert (missile.vx, missile.vy) == (2.0, 1.0)
+    engine.step(STEP_MS)
@@ -0,0 +1,62 @@
+import random
+
+from priority import ThreatQueue
+
+
+def check_heap(queue):
+    heap = queue.heap
+    for index, (key, track_id, _) in enumerate(heap):
+        assert queue.position[track_id] == index
+        if index:
+            parent = heap[(index - 1) // 2]
+            assert (parent[0], parent[1]) <= (key, track_id)
+    assert len(queue.position) == len(heap)
+
+
+def test_update_and_remove_keep_the_heap_ordered():
+    rng = random.Random(3)
+    queue = ThreatQueue()
+    keys = {}
+    for step in range(2000):
+        action = rng.random()
+        if action < 0.4 or not keys:
+            track_id = step
+            keys[track_id] = rng.uniform(0, 100)
+            queue.push(track_id, f"track {track_id}", keys[track_id])
+        elif action < 0.8:
+            track_id = rng.choice(list(keys))
+            keys[track_id] = rng.uniform(0, 100)
+            queue.update(track_id, keys[track_id])
+        else:
+            track_id = rng.choice(list(keys))
+            del keys[track_id]
+            queue.remove(track_id)
+        if step % 50 == 0:
+            check_heap(queue)
+    check_heap(queue)
+    assert {track_id: queue.key(track_id) for track_id in keys} == keys
+
+
+def test_ordered_walk_matches_sorting():
+    rng = random.Random(4)
+    queue = ThreatQueue()
+    for track_id in range(300):
+        queue.push(track_id, track_id, rng.randint(0, 50))
+    expected = sorted((queue.key(track_id), track_id) for track_id in range(300))
+    assert [(key, item) for key, item in queue.ordered()] == expected
+    assert queue.smallest(5) == expected[:5]
+    assert queue.smallest() == expected
+    check_heap(queue)
+
+
+def test_pop_and_missing_tracks():
+    queue = ThreatQueue()
+    queue.push(1, "a", 5.0)
+    queue.push(2, "b", 3.0)
+    queue.push(1, "a", 1.0)  # Pushing a queued track updates its key
+    queue.remove(99)
+    assert queue.peek() == (1.0, "a")
+    assert queue.pop() == (1.0, "a")
+    assert 1 not in queue and queue.key(1) is None
+    assert queue.pop() == (3.0, "b")
+    assert queue.peek() is None and len(queue) == 0
@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from config import THREAT_TYPES
+from raids import (
+    SCENARIO_FORMATS,
+    RaidScheduler,
+    RaidSpawn,
+    read_scenario,
+    write_scenario,
+)
+
+EXTENSIONS = {"jsonl": ".jsonl", "csv": ".csv", "binary": ".bin"}
+
+
+def spawns(count=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.integers(0, 50, count)).astype(float)
+    # Quarter-pixel positions survive the binary format's float32 exactly
+    xs = rng.integers(0, 4 * 1400, count) / 4
+    ys = rng.integers(0, 4 * 900, count) / 4
+    types = rng.choice(THREAT_TYPES, count)
+    return [RaidSpawn(*row) for row in zip(times, xs, ys, types.tolist())]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("fmt", SCENARIO_FORMATS)
+def test_scenarios_read_back_as_written(tmp_path, fmt, compress):
+    path = str(tmp_path / f"raid{EXTENSIONS[fmt]}") + (".gz" if compress else "")
+    written = spawns()
+    write_scenario(path, written)
+    chunks = list(read_scenario(path, chunk_size=128))
+    assert [len(chunk) for chunk in chunks] == [128] * 7 + [1000 - 7 * 128]
+    assert list(itertools.chain.from_iterable(chunks)) == written
+
+
+@pytest.mark.parametrize("fmt", SCENARIO_FORMATS)
+@pytest.mark.parametrize(
+    "bad, message",
+    [
+        (RaidSpawn(0.0, 10.0, 10.0, "missile"), "out of time order"),
+        (RaidSpawn(9e9, -1.0, 10.0, "missile"), "off the map"),
+    ],
+)
+def test_invalid_spawns_are_located(tmp_path, fmt, bad, message):
+    written = spawns(300)
+    written[200] = bad
+    path = str(tmp_path / f"raid{EXTENSIONS[fmt]}")
+    write_scenario(path, written)
+    chunks = read_scenario(path, chunk_size=64)
+    assert len(next(chunks)) == 64
+    with pytest.raises(ValueError, match=message):
+        list(chunks)
+
+
+def test_streamed_scenario_launches_like_a_loaded_one(tmp_path):
+    path = str(tmp_path / "raid.bin")
+    written = spawns()
+    write_scenario(path, written)
+    loaded, streamed = RaidScheduler(), RaidScheduler()
+    loaded.load(written, start=500)
+    streamed.stream(read_scenario(path, chunk_size=50), start=500, lookahead=200)
+
+    now = 0
+    while loaded.next_time() is not None:
+        assert streamed.next_time() == loaded.next_time()
+        now += 16
+        assert streamed.due(now) == loaded.due(now)
+        # Only spawns within the lookahead are pulled onto the heap
+        assert len(streamed) <= 50 + sum(
+            now < spawn.time + 500 <= now + 216 for spawn in written
+        )
+    assert streamed.next_time() is None
@@ -0,0 +1,65 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+from telemetry import TelemetrySink, load_binary_telemetry
+
+
+def tracks(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        SimpleNamespace(
+            track_id=i,
+            threat_type="missile",
+            is_hostile=True,
+            x=float(x),
+            y=float(y),
+            vx=1.0,
+            vy=2.0,
+            fuel=50.0,
+        )
+        for i, (x, y) in enumerate(rng.uniform(0, 1000, (count, 2)))
+    ]
+
+
+def test_steps_are_written_whole_or_dropped(tmp_path):
+    sink = TelemetrySink(
+        str(tmp_path / "telemetry.bin"), "binary", buffer_rows=4, buffer_count=3
+    )
+    # Hold the writer on its first buffer so the rest back up
+    release = threading.Event()
+    write = sink._write
+    sink._write = lambda records: (release.wait(), write(records))
+
+    steps = 8
+    for step in range(steps):
+        sink.record(step, step * 16, tracks(6, step))
+    release.set()
+    sink.close()
+
+    records = load_binary_telemetry(sink.files_written[0])
+    recorded, counts = np.unique(records["step"], return_counts=True)
+    assert sink.dropped_frames
+    assert len(recorded) == sink.frames_recorded == steps - sink.dropped_frames
+    assert (counts == 6).all()
+
+
+def test_compressed_files_rotate_at_their_size_on_disk(tmp_path):
+    rotate_bytes = 32 * 1024
+    sink = TelemetrySink(
+        str(tmp_path / "telemetry.jsonl"),
+        buffer_rows=256,
+        buffer_count=80,
+        rotate_bytes=rotate_bytes,
+        compress=True,
+    )
+    for step in range(400):
+        sink.record(step, step * 16, tracks(50, step))
+    sink.close()
+    assert not sink.dropped_frames
+
+    sizes = [os.path.getsize(path) for path in sink.files_written]
+    assert len(sizes) > 1
+    assert all(size >= rotate_bytes for size in sizes[:-1])
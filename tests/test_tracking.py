@@ -0,0 +1,72 @@
+import numpy as np
+
+from tracking import SETTLED_VELOCITY_SD, TrackFilter, measure
+
+
+def path(frames, x=100.0, y=50.0, vx=3.0, vy=-1.0, ax=0.02, ay=0.05):
+    t = np.arange(frames, dtype=float)
+    return x + vx * t + ax * t**2 / 2, y + vy * t + ay * t**2 / 2
+
+
+def test_converges_on_a_constant_acceleration_track():
+    xs, ys = path(200)
+    tracker = TrackFilter(noise=1e-3)
+    for x, y in zip(xs, ys):
+        tracker.update([7], [x], [y])
+    positions, velocities, settled = tracker.estimates([7])
+    np.testing.assert_allclose(positions[0], (xs[-1], ys[-1]), atol=1e-3)
+    np.testing.assert_allclose(velocities[0], (3.0 + 0.02 * 199, -1.0 + 0.05 * 199))
+    assert settled[0]
+
+
+def test_noisy_track_settles_near_its_true_velocity():
+    xs, ys = path(120)
+    rng = np.random.default_rng(0)
+    tracker = TrackFilter()
+    errors = []
+    for frame, (x, y) in enumerate(zip(*measure(xs, ys, rng=rng))):
+        tracker.update([1], [x], [y])
+        _, velocities, settled = tracker.estimates([1])
+        if settled[0]:
+            truth = (3.0 + 0.02 * frame, -1.0 + 0.05 * frame)
+            errors.append(velocities[0] - truth)
+    assert 0 < len(errors) < 120
+    assert np.sqrt(np.mean(np.square(errors))) < 2 * SETTLED_VELOCITY_SD
+
+
+def test_batched_tracks_match_tracks_filtered_alone():
+    rng = np.random.default_rng(1)
+    tracks = {track_id: path(60, *rng.uniform(-5, 5, 6)) for track_id in range(100)}
+    batched = TrackFilter(capacity=4)
+    alone = {track_id: TrackFilter(capacity=1) for track_id in tracks}
+    for frame in range(60):
+        # Tracks start at different frames and some miss measurements
+        seen = [
+            track_id
+            for track_id in tracks
+            if frame >= track_id % 7 and (frame + track_id) % 5
+        ]
+        xs = [tracks[t][0][frame] for t in seen]
+        ys = [tracks[t][1][frame] for t in seen]
+        batched.update(seen, xs, ys)
+        for track_id, filter_ in alone.items():
+            if track_id in seen:
+                filter_.update(
+                    [track_id],
+                    [tracks[track_id][0][frame]],
+                    [tracks[track_id][1][frame]],
+                )
+            elif track_id in filter_:
+                filter_.update([], [], [])
+        if frame == 30:
+            # A dropped track starts afresh when it is measured again
+            batched.drop(3)
+            alone[3].drop(3)
+
+    live = list(tracks)
+    positions, velocities, settled = batched.estimates(live)
+    for i, track_id in enumerate(live):
+        expected = alone[track_id].estimates([track_id])
+        np.testing.assert_allclose(positions[i], expected[0][0])
+        np.testing.assert_allclose(velocities[i], expected[1][0])
+        assert settled[i] == expected[2][0]
@@ -0,0 +1,14 @@
+import pygame
+
+from ui import Widget
+
+
+def test_widgets_render_again_only_when_their_state_changes():
+    surface = pygame.Surface((100, 100))
+    surface.fill((10, 20, 30))
+    widget = Widget((10, 10, 20, 20))
+    for state in (1, 1, 2, 2, 2, 1):
+        assert widget.draw(surface, state) == widget.rect
+    assert widget.renders == 3
+    # A plain widget's image is blank, so the screen beneath shows through
+    assert surface.get_at((15, 15))[:3] == (10, 20, 30)
@@ -0,0 +1,109 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from config import THREAT_TYPES, THREAT_VALUES
+from wta import (
+    KILL_TIME_SCALE,
+    MAX_SALVO,
+    RESERVE_WEIGHT,
+    allocate_interceptors,
+    engageable,
+    solve_assignment,
+)
+
+
+def brute_force(cost):
+    """Cheapest total over every way of giving each row its own column"""
+    rows, cols = cost.shape
+    return min(
+        cost[np.arange(rows), list(columns)].sum()
+        for columns in itertools.permutations(range(cols), rows)
+    )
+
+
+def check_assignment(cost, col4row):
+    assert len(set(col4row.tolist())) == len(col4row)
+    assert np.isclose(cost[np.arange(len(cost)), col4row].sum(), brute_force(cost))
+
+
+def test_solver_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        rows = rng.integers(1, 6)
+        cost = rng.uniform(-10, 10, (rows, rng.integers(rows, 7)))
+        if rng.random() < 0.3:
+            cost = np.round(cost)  # Ties
+        check_assignment(cost, solve_assignment(cost))
+
+
+def test_solver_avoids_infeasible_pairs():
+    rng = np.random.default_rng(2)
+    infeasible = 0
+    for _ in range(1000):
+        rows = rng.integers(1, 6)
+        cost = rng.uniform(-10, 10, (rows, rng.integers(rows, 7)))
+        cost[rng.random(cost.shape) < 0.5] = np.inf
+        if np.isfinite(brute_force(cost)):
+            check_assignment(cost, solve_assignment(cost))
+        else:
+            infeasible += 1
+            with pytest.raises(ValueError):
+                solve_assignment(cost)
+    assert 0 < infeasible < 1000
+
+
+def test_solver_rejects_more_rows_than_columns():
+    with pytest.raises(ValueError):
+        solve_assignment(np.zeros((3, 2)))
+
+
+def random_raid(rng, threats, bases):
+    times = rng.uniform(10, 1500, (threats, bases))
+    times[rng.random((threats, bases)) < 0.3] = np.inf
+    types = [THREAT_TYPES[i] for i in rng.integers(0, len(THREAT_TYPES), threats)]
+    stock = rng.integers(0, 6, bases)
+    return times, types, stock
+
+
+def test_only_engageable_threats_are_fired_at():
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        times, types, stock = random_raid(rng, rng.integers(1, 12), rng.integers(1, 5))
+        assignment = allocate_interceptors(times, types, stock)
+        fired = assignment >= 0
+        pairs = engageable(times, types, stock)
+        assert pairs[np.flatnonzero(fired), assignment[fired]].all()
+        # Nothing beyond a base's stock, and only where it can reach
+        assert (np.bincount(assignment[fired], minlength=len(stock)) <= stock).all()
+        assert np.isfinite(times[fired, assignment[fired]]).all()
+
+
+def allocation_value(times, threat_types, stock, assignment):
+    """Kill value of the engaged threats less the reserve cost of each round"""
+    total = 0.0
+    for threat, base in enumerate(assignment):
+        if base >= 0:
+            value = THREAT_VALUES[threat_types[threat]]
+            total += value * np.exp(-times[threat, base] / KILL_TIME_SCALE)
+    for base, rounds in enumerate(stock):
+        fired = int((np.asarray(assignment) == base).sum())
+        total -= sum(RESERVE_WEIGHT / (rounds - k) for k in range(fired))
+    return total
+
+
+def test_allocation_is_optimal():
+    rng = np.random.default_rng(6)
+    for _ in range(150):
+        times, types, stock = random_raid(rng, rng.integers(1, 6), rng.integers(1, 4))
+        best = max(
+            allocation_value(times, types, stock, choice)
+            for choice in itertools.product(range(-1, len(stock)), repeat=len(types))
+            if all(np.isfinite(times[t, b]) for t, b in enumerate(choice) if b >= 0)
+            and all(
+                choice.count(b) <= min(stock[b], MAX_SALVO) for b in range(len(stock))
+            )
+        )
+        assignment = allocate_interceptors(times, types, stock).tolist()
+        assert np.isclose(allocation_value(times, types, stock, assignment), best)